@@ -71,8 +71,9 @@ def custom_document_loader(url, options=None):
     }
 
 
-# Tell pyld to use our loader for everything (contexts, etc.)
-jsonld.set_document_loader(custom_document_loader)
+# Pass our loader to pyld per call (contexts, etc.) rather than installing it
+# globally with jsonld.set_document_loader.
+JSONLD_OPTIONS = {"documentLoader": custom_document_loader}
 
 
 # ---------------------------------------------------------------------
@@ -84,14 +85,14 @@ with open(CRATE_PATH, "r", encoding="utf-8") as f:
 # ---------------------------------------------------------------------
 # 4. Expand with pyld (fully qualified IRIs)
 # ---------------------------------------------------------------------
-expanded = jsonld.expand(crate)
+expanded = jsonld.expand(crate, options=JSONLD_OPTIONS)
 
 print(expanded)
 
 # ---------------------------------------------------------------------
 # 5. Convert to RDF (N-Quads)
 # ---------------------------------------------------------------------
-nquads = jsonld.to_rdf(expanded, options={"format": "application/n-quads"})
+nquads = jsonld.to_rdf(expanded, options={**JSONLD_OPTIONS, "format": "application/n-quads"})
 
 
 # ---------------------------------------------------------------------
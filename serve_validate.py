@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Local validation service for LivePublication crates (see tests/_validation_service.py).
+
+    ./serve_validate.py --port 8090 --base http://localhost:8000/interface-schemas
+    curl -s --data-binary @crate.json http://localhost:8090/validate
+    curl -s http://localhost:8090/stats
+
+License: CC BY 4.0
+"""
+import argparse, pathlib, sys
+
+ROOT = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from tests._validation_service import (SERVICE_MAX_BODY, SERVICE_QUEUE_SIZE, SERVICE_WORKERS, ValidationService,
+                                       make_server)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve POST /validate with warm contexts, shapes and policies.")
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8090)
+    ap.add_argument('--base', default='http://localhost:8000/interface-schemas',
+                    help='Where livepublication.org contexts are served from (e.g. `make serve`).')
+    ap.add_argument('--shapes-base', default=None,
+                    help='Fetch shapes from this base instead of the local interface-schemas/.')
+    ap.add_argument('--workers', type=int, default=SERVICE_WORKERS)
+    ap.add_argument('--queue-size', type=int, default=SERVICE_QUEUE_SIZE)
+    ap.add_argument('--max-body', type=int, default=SERVICE_MAX_BODY,
+                    help='Largest accepted request body in bytes; larger ones get 413.')
+    ap.add_argument('--warmup', nargs='*', default=sorted(map(str, (ROOT / 'tests' / 'crates' / 'valid').glob('*.json'))),
+                    help='Crates checked once at startup to load their contexts (default: tests/crates/valid).')
+    args = ap.parse_args()
+
+    service = ValidationService(args.base, args.shapes_base, workers=args.workers, queue_size=args.queue_size,
+                                max_body=args.max_body, warmup=args.warmup)
+    httpd = make_server(service, args.host, args.port)
+    print(f"Validating at http://{args.host}:{args.port}/validate "
+          f"({service.workers} workers, {service.capacity} requests in flight max)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down validation service.")
+    finally:
+        httpd.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""
+Asyncio pipeline for validating many (remote) crates against a BASE_URL.
+
+Contexts, shapes and crates are fetched concurrently, bounded by a semaphore,
+while JSON-LD expansion and SHACL validation run in an executor so they never
+block the event loop. The document loader is passed to pyld per call; nothing
+is installed globally with jsonld.set_document_loader.
+
+    results = asyncio.run(validate_crates_async(urls, BASE_URL))
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, List, NamedTuple, Optional
+
+from rdflib import Graph
+
+from tests._context_cache import http_get
+from tests._jsonld_utils import _context_urls, load_json_file, map_context_url, to_rdf_graph_from_jsonld
+from tests._shacl import SOURCE_PATHS, ShapesValidator
+
+# Maximum number of HTTP requests in flight per loader
+ASYNC_CONCURRENCY = int(os.getenv("LP_ASYNC_CONCURRENCY", "16"))
+
+
+class AsyncDocumentLoader:
+    """
+    Asyncio document loader with the URL mapping of make_requests_loader.
+
+    ``await loader.load(url)`` fetches with at most ``concurrency`` requests in
+    flight and each mapped URL fetched once per loader. Blocking HTTP runs on the
+    loader's own thread pool (requests' pooled session), so executor threads busy
+    with expansion cannot starve fetches.
+
+    The instance is also a synchronous pyld documentLoader for code running in an
+    executor: loaded documents are returned directly, anything else is fetched on
+    the event loop and waited for.
+    """
+
+    def __init__(self, base_override: str, concurrency: int = ASYNC_CONCURRENCY, session=None):
+        self.base_override = base_override
+        self.session = session
+        self.documents = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._io = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="lp-fetch")
+        self._inflight = {}
+        self._loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._io.shutdown(wait=False)
+
+    async def get(self, url: str, **kwargs):
+        """GET ``url`` (unmapped) under the semaphore; raises for HTTP errors."""
+        self._loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            r = await self._loop.run_in_executor(
+                self._io, partial(http_get, url, self.session, timeout=15, **kwargs))
+        r.raise_for_status()
+        return r
+
+    async def _fetch_json(self, mapped: str):
+        r = await self.get(mapped)
+        try:
+            doc = r.json()
+        except Exception as e:
+            raise RuntimeError(f"Non-JSON from {mapped}") from e
+        self.documents[mapped] = doc
+        return doc
+
+    async def load(self, url: str, options=None) -> dict:
+        self._loop = asyncio.get_running_loop()
+        mapped = map_context_url(url, self.base_override)
+        if mapped in self.documents:
+            doc = self.documents[mapped]
+        else:
+            task = self._inflight.get(mapped)
+            if task is None:
+                task = self._inflight[mapped] = asyncio.ensure_future(self._fetch_json(mapped))
+            try:
+                doc = await task
+            finally:
+                self._inflight.pop(mapped, None)
+        return {"contextUrl": None, "documentUrl": url, "document": doc}
+
+    def __call__(self, url: str, options=None) -> dict:
+        mapped = map_context_url(url, self.base_override)
+        if mapped in self.documents:
+            return {"contextUrl": None, "documentUrl": url, "document": self.documents[mapped]}
+        if self._loop is None or _on_loop_thread(self._loop):
+            raise RuntimeError(f"Context not prefetched and no event loop to fetch it: {url}")
+        return asyncio.run_coroutine_threadsafe(self.load(url), self._loop).result()
+
+    async def prefetch(self, ctx) -> List[str]:
+        """
+        Load every remote URL in a @context value, and the @context URLs those
+        documents reference, concurrently. Returns the URLs seen; blocked or
+        failing URLs are left for expansion to report.
+        """
+        seen = set()
+        pending = _context_urls(ctx)
+        while pending:
+            batch = [u for u in dict.fromkeys(pending) if u not in seen]
+            seen.update(batch)
+            pending = []
+            for remote in await asyncio.gather(*(self.load(u) for u in batch), return_exceptions=True):
+                if isinstance(remote, dict) and isinstance(remote["document"], dict):
+                    pending.extend(_context_urls(remote["document"].get("@context")))
+        return sorted(seen)
+
+
+def _on_loop_thread(loop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+class AsyncValidation(NamedTuple):
+    """Outcome of validating one crate: report text, or error when it could not be validated."""
+    source: str
+    conforms: bool
+    report: Optional[str]
+    error: Optional[str]
+
+
+async def load_shapes_async(loader: AsyncDocumentLoader, base_url: str, executor=None) -> ShapesValidator:
+    """Fetch dpc/ and dsc/ shapes and terms concurrently and compile them into one ShapesValidator."""
+    loop = asyncio.get_running_loop()
+    responses = await asyncio.gather(*(loader.get(f"{base_url}/{p}") for p in SOURCE_PATHS))
+    sources = {p: r.content for p, r in zip(SOURCE_PATHS, responses)}
+    return await loop.run_in_executor(executor, ShapesValidator.from_sources, sources)
+
+
+async def load_crate_async(loader: AsyncDocumentLoader, source: str, executor=None):
+    """Read a crate from an http(s) URL or a local path."""
+    if source.startswith(("http://", "https://")):
+        r = await loader.get(source, headers={"Accept": "application/ld+json, application/json;q=0.9"})
+        return r.json()
+    return await asyncio.get_running_loop().run_in_executor(executor, load_json_file, source)
+
+
+async def to_rdf_graph_async(doc: dict, base_override: str, loader: AsyncDocumentLoader,
+                             executor=None) -> Graph:
+    """Async to_rdf_graph_from_jsonld: prefetch the crate's contexts, then convert in ``executor``."""
+    await loader.prefetch(doc.get("@context"))
+    convert = partial(to_rdf_graph_from_jsonld, doc, base_override, loader=loader)
+    return await asyncio.get_running_loop().run_in_executor(executor, convert)
+
+
+async def validate_crate_async(source: str, base_url: str, loader: AsyncDocumentLoader,
+                               shapes, executor=None) -> AsyncValidation:
+    """Fetch, convert and SHACL-validate one crate. ``shapes`` is a ShapesValidator or a future of one."""
+    loop = asyncio.get_running_loop()
+    try:
+        doc = await load_crate_async(loader, source, executor)
+        data_graph = await to_rdf_graph_async(doc, base_url, loader, executor)
+        validator = await shapes if asyncio.isfuture(shapes) else shapes
+        conforms, _, report = await loop.run_in_executor(
+            executor, validator.validate, data_graph)
+    except Exception as e:
+        return AsyncValidation(source, False, None, f"{type(e).__name__}: {e}")
+    return AsyncValidation(source, bool(conforms), report, None)
+
+
+async def validate_crates_async(sources: Iterable[str], base_url: str,
+                                concurrency: int = ASYNC_CONCURRENCY,
+                                executor=None) -> List[AsyncValidation]:
+    """
+    Validate many crates (URLs or paths) against the shapes published under ``base_url``.
+
+    Shapes, contexts and crates are all fetched concurrently; results come back
+    in input order, with per-crate errors reported instead of raised.
+    """
+    sources = [str(s) for s in sources]
+    async with AsyncDocumentLoader(base_url, concurrency) as loader:
+        shapes = asyncio.ensure_future(load_shapes_async(loader, base_url, executor))
+        try:
+            return list(await asyncio.gather(
+                *(validate_crate_async(s, base_url, loader, shapes, executor) for s in sources)))
+        finally:
+            if not shapes.done():
+                shapes.cancel()
@@ -0,0 +1,137 @@
+"""
+URDNA2015 canonicalization and content hashing of pipeline output.
+
+canonical_nquads(g) returns the URDNA2015 canonical N-Quads of an rdflib Graph,
+byte-identical to pyld's URDNA2015 implementation, and graph_hash(g) its
+sha256. Two crates that differ only in key order or blank node labels get the
+same hash, so the hash can dedupe crates and key downstream caches.
+
+Profile-aware shortcut: crate blank nodes are almost all leaves such as the
+PropertyValues under ``additionalProperty``. A leaf is a blank node whose
+quads mention no other blank node. Leaves are labelled straight from their
+first-degree hashes. A group of leaves sharing one hash hangs off the same
+parent with the same content, so its members are interchangeable and any
+labelling order yields the same output. Only collisions that involve
+non-leaf blank nodes need pyld's N-degree algorithm.
+"""
+import hashlib
+import json
+import os
+
+from pyld import jsonld
+from pyld.jsonld import RDF_LANGSTRING, XSD_STRING
+from rdflib import BNode, Literal, URIRef
+
+from tests._context_cache import ContextStore
+from tests._jsonld_utils import load_json_file, to_rdf_graph_from_jsonld
+
+CANONICAL_PREFIX = "_:c14n"
+
+# Memoized crate hashes, keyed by crate bytes + conversion settings
+CANONICAL_HASH_MAX_ENTRIES = int(os.getenv("LP_CANONICAL_HASH_MAX_ENTRIES", "4096"))
+CRATE_HASHES = ContextStore(maxsize=CANONICAL_HASH_MAX_ENTRIES)
+
+
+def _term(node) -> dict:
+    """rdflib term -> pyld RDF term dict."""
+    if isinstance(node, BNode):
+        return {"type": "blank node", "value": f"_:{node}"}
+    if isinstance(node, Literal):
+        if node.language:
+            return {"type": "literal", "value": str(node), "datatype": RDF_LANGSTRING,
+                    "language": node.language}
+        return {"type": "literal", "value": str(node),
+                "datatype": str(node.datatype) if node.datatype else XSD_STRING}
+    if isinstance(node, URIRef):
+        return {"type": "IRI", "value": str(node)}
+    raise TypeError(f"Unsupported RDF term {node!r}")
+
+
+def to_pyld_quads(g) -> list:
+    """The triples of rdflib Graph ``g`` as pyld quads (default graph)."""
+    return [{"subject": _term(s), "predicate": _term(p), "object": _term(o)} for s, p, o in g]
+
+
+def _first_degree_hash(label: str, quads: list) -> str:
+    lines = []
+    for quad in quads:
+        masked = dict(quad)
+        for key in ("subject", "object"):
+            term = quad[key]
+            if term["type"] == "blank node":
+                masked[key] = {"type": "blank node", "value": "_:a" if term["value"] == label else "_:z"}
+        lines.append(jsonld.JsonLdProcessor.to_nquad(masked))
+    lines.sort()
+    return hashlib.sha256("".join(lines).encode("utf-8")).hexdigest()
+
+
+def _is_leaf(label: str, quads: list) -> bool:
+    return all(
+        quad[key]["type"] != "blank node" or quad[key]["value"] == label
+        for quad in quads for key in ("subject", "object")
+    )
+
+
+def canonical_nquads(g) -> str:
+    """URDNA2015 canonical N-Quads of ``g`` (same output as pyld's URDNA2015)."""
+    quads = to_pyld_quads(g)
+    info = {}
+    for quad in quads:
+        for key in ("subject", "object"):
+            term = quad[key]
+            if term["type"] == "blank node":
+                # a quad is listed once per blank node position, as in pyld
+                info.setdefault(term["value"], []).append(quad)
+
+    by_hash = {}
+    for label, refs in info.items():
+        by_hash.setdefault(_first_degree_hash(label, refs), []).append(label)
+
+    unique, shared = [], []
+    for h in sorted(by_hash):
+        labels = by_hash[h]
+        if len(labels) == 1:
+            unique.append(labels[0])
+        elif all(_is_leaf(label, info[label]) for label in labels):
+            shared.extend(sorted(labels))  # interchangeable: any order gives the same output
+        else:
+            # non-trivial symmetry: run the full algorithm (N-degree hashing)
+            return jsonld.URDNA2015().main({"@default": to_pyld_quads(g)},
+                                           {"format": "application/n-quads"})
+
+    canonical = {label: f"{CANONICAL_PREFIX}{i}" for i, label in enumerate(unique + shared)}
+    lines = []
+    for quad in quads:
+        out = dict(quad)
+        for key in ("subject", "object"):
+            term = quad[key]
+            if term["type"] == "blank node":
+                out[key] = {"type": "blank node", "value": canonical[term["value"]]}
+        lines.append(jsonld.JsonLdProcessor.to_nquad(out))
+    lines.sort()
+    return "".join(lines)
+
+
+def graph_hash(g) -> str:
+    """sha256 (hex) of the canonical N-Quads of ``g``."""
+    return hashlib.sha256(canonical_nquads(g).encode("utf-8")).hexdigest()
+
+
+def crate_hash(crate, base_override: str) -> str:
+    """
+    Content hash of a crate (path or parsed document), memoized per crate bytes.
+
+    Crates that are byte-different but produce the same RDF (reordered keys,
+    renamed blank nodes) get the same hash.
+    """
+    from tests._jsonld_utils import ROCRATE_ONLINE  # read at call time (tests reload the module)
+
+    if isinstance(crate, dict):
+        raw = json.dumps(crate, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        load = lambda: crate
+    else:
+        with open(crate, "rb") as f:
+            raw = f.read()
+        load = lambda: load_json_file(crate)
+    key = json.dumps([hashlib.sha256(raw).hexdigest(), base_override, ROCRATE_ONLINE])
+    return CRATE_HASHES.get(key, lambda _key: graph_hash(to_rdf_graph_from_jsonld(load(), base_override)))
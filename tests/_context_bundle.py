@@ -0,0 +1,123 @@
+"""
+Offline context bundle: every allowlisted JSON-LD context packed into one file.
+
+Built by ``tools/build_context_bundle.py`` (``make build-bundle``). A loader
+given a bundle (or run with LP_CONTEXT_BUNDLE set) serves these contexts
+straight from a memory-mapped file, so offline validation needs neither the
+dev server nor the network.
+
+Layout::
+
+    MAGIC | uint32 header length | header (JSON) | documents (compact JSON)...
+
+The header records the format, the bundle version (sha256 over all entries),
+each entry's offset/length/sha256 and the URL aliases that resolve to it.
+Documents are stored as compact UTF-8 JSON and decoded only when requested;
+each is checked against its sha256 before it is parsed.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+MAGIC = b"LPCTXBUNDLE\n"
+FORMAT = 2
+_LEN = struct.Struct(">I")
+
+# Bundle configured for make_requests_loader (path to a built bundle file)
+CONTEXT_BUNDLE = os.getenv("LP_CONTEXT_BUNDLE")
+
+
+def build_bundle(schemas_root, contexts: Dict[str, Iterable[str]]) -> bytes:
+    """
+    Return the bundle bytes for ``contexts``: path under ``schemas_root`` ->
+    URLs that resolve to that document.
+    """
+    schemas_root = Path(schemas_root)
+    entries, aliases, blobs = {}, {}, []
+    offset = 0
+    version = hashlib.sha256()
+    for rel in sorted(contexts):
+        doc = json.loads((schemas_root / rel).read_text(encoding="utf-8"))
+        blob = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(blob).hexdigest()
+        entries[rel] = [offset, len(blob), digest]
+        for url in contexts[rel]:
+            aliases[url] = rel
+        version.update(rel.encode("utf-8") + b"\0" + digest.encode("ascii"))
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({
+        "format": FORMAT,
+        "version": version.hexdigest()[:16],
+        "entries": entries,
+        "aliases": dict(sorted(aliases.items())),
+    }, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return MAGIC + _LEN.pack(len(header)) + header + b"".join(blobs)
+
+
+class ContextBundle:
+    """Read-only, memory-mapped view of a bundle file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a context bundle: {self.path}")
+        start = len(MAGIC) + _LEN.size
+        (size,) = _LEN.unpack(self._mm[len(MAGIC):start])
+        header = json.loads(self._mm[start:start + size])
+        if header.get("format") != FORMAT:
+            raise ValueError(f"Unsupported context bundle format {header.get('format')!r}: {self.path}")
+        self.version = header["version"]
+        self.entries = header["entries"]
+        self.aliases = header["aliases"]
+        self._data_start = start + size
+
+    def close(self):
+        self._mm.close()
+
+    def __contains__(self, url) -> bool:
+        return url in self.aliases or url in self.entries
+
+    def urls(self):
+        return sorted(self.aliases)
+
+    def document(self, rel: str):
+        """Decode the entry stored under ``rel`` (its path under interface-schemas/)."""
+        offset, length, digest = self.entries[rel]
+        start = self._data_start + offset
+        blob = self._mm[start:start + length]
+        if hashlib.sha256(blob).hexdigest() != digest:
+            raise ValueError(f"Corrupt context bundle entry {rel!r} in {self.path}")
+        return json.loads(blob)
+
+    def lookup(self, url: str, base_override: str = "") -> Optional[dict]:
+        """
+        Return the document for ``url`` or None. Accepts any alias, or a URL
+        under ``base_override`` (the loader's mapped URLs).
+        """
+        rel = self.aliases.get(url)
+        if rel is None and base_override and url.startswith(base_override.rstrip("/") + "/"):
+            rel = url[len(base_override.rstrip("/")) + 1:]
+        if rel is None or rel not in self.entries:
+            return None
+        return self.document(rel)
+
+
+_DEFAULT_BUNDLE = None
+
+
+def default_bundle() -> Optional[ContextBundle]:
+    """Return the bundle configured via LP_CONTEXT_BUNDLE (mapped once per process), or None."""
+    global _DEFAULT_BUNDLE
+    if not CONTEXT_BUNDLE:
+        return None
+    if _DEFAULT_BUNDLE is None:
+        _DEFAULT_BUNDLE = ContextBundle(CONTEXT_BUNDLE)
+    return _DEFAULT_BUNDLE
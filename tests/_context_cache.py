@@ -0,0 +1,393 @@
+"""
+JSON-LD context caches shared by every document loader.
+
+Fetches share one pooled keep-alive ``requests.Session`` (``HTTP_SESSION``)
+with retries; it is recreated in forked children so processes never share
+sockets.
+
+Two cache tiers:
+
+- ``ContextStore``: a thread-safe, process-wide in-memory LRU with
+  single-flight fetching (concurrent misses for one URL share one fetch).
+- ``DiskContextCache``: a persistent cache shared across processes and runs.
+
+Disk layout under the cache root:
+
+    objects/<sha256>      raw response bodies (content-addressed)
+    entries/<sha256>.json one entry per fetched URL (keyed by the URL hash)
+
+Each entry records the URL, the final URL after redirects, the body hash,
+the caching headers and timestamps. Entries are fresh while their
+``Cache-Control: max-age`` has not elapsed (versioned contexts served with
+``immutable`` stay fresh for a year); stale entries are revalidated with
+``If-None-Match`` / ``If-Modified-Since``. Writes go through a temp file and
+``os.replace`` so concurrent processes never observe partial files.
+"""
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Opt-in: set LP_CONTEXT_CACHE_DIR to share fetched contexts across runs.
+CONTEXT_CACHE_DIR = os.getenv("LP_CONTEXT_CACHE_DIR", "")
+CONTEXT_CACHE_MAX_BYTES = int(os.getenv("LP_CONTEXT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CONTEXT_STORE_MAX_ENTRIES = int(os.getenv("LP_CONTEXT_STORE_MAX_ENTRIES", "64"))
+HTTP_POOL_SIZE = int(os.getenv("LP_HTTP_POOL_SIZE", "10"))
+HTTP_RETRIES = int(os.getenv("LP_HTTP_RETRIES", "3"))
+
+
+def make_session(pool_size: int = HTTP_POOL_SIZE, retries: int = HTTP_RETRIES) -> requests.Session:
+    """Keep-alive session with a bounded connection pool and retries on transient errors."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.2,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+HTTP_SESSION = make_session()
+
+
+def _reset_http_session() -> None:
+    global HTTP_SESSION
+    HTTP_SESSION = make_session()
+
+
+if hasattr(os, "register_at_fork"):
+    # pooled sockets must not be shared between parent and forked children
+    os.register_at_fork(after_in_child=_reset_http_session)
+
+
+def http_get(url: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+    """GET through ``session`` (default: the process-wide HTTP_SESSION); follows redirects."""
+    return (session or HTTP_SESSION).get(url, **kwargs)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def parse_cache_control(value: str) -> Dict[str, Any]:
+    """Parse a Cache-Control header into {directive: value-or-True}."""
+    directives: Dict[str, Any] = {}
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        name = name.strip().lower()
+        arg = arg.strip().strip('"')
+        if name == "max-age":
+            try:
+                directives[name] = int(arg)
+            except ValueError:
+                continue
+        else:
+            directives[name] = arg or True
+    return directives
+
+
+def _atomic_write(path: pathlib.Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class DiskContextCache:
+    """
+    On-disk, content-addressed cache of JSON-LD context documents.
+
+    ``fetch(url)`` returns ``(document, final_url)`` and only touches the
+    network when the entry is missing, stale, or fails its integrity check.
+    """
+
+    def __init__(self, root, max_bytes: int = CONTEXT_CACHE_MAX_BYTES, timeout: float = 15,
+                 session: Optional[requests.Session] = None):
+        self.root = pathlib.Path(root)
+        self.session = session
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.objects_dir = self.root / "objects"
+        self.entries_dir = self.root / "entries"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+
+    # --- entry bookkeeping ---
+
+    def _entry_path(self, url: str) -> pathlib.Path:
+        return self.entries_dir / f"{_sha256(url.encode('utf-8'))}.json"
+
+    def _read_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(url)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _write_entry(self, entry: Dict[str, Any]) -> None:
+        data = json.dumps(entry, sort_keys=True).encode("utf-8")
+        _atomic_write(self._entry_path(entry["url"]), data)
+
+    def _read_body(self, entry: Dict[str, Any]) -> Optional[bytes]:
+        """Read an entry's body, returning None if missing or corrupt."""
+        try:
+            body = (self.objects_dir / entry["sha256"]).read_bytes()
+        except (OSError, KeyError):
+            return None
+        if _sha256(body) != entry["sha256"]:
+            return None
+        return body
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+        cc = entry.get("cache_control", {})
+        if "no-cache" in cc:
+            return False
+        max_age = cc.get("max-age")
+        if max_age is None:
+            return False
+        now = time.time() if now is None else now
+        return now - entry["validated_at"] < max_age
+
+    # --- public API ---
+
+    def fetch(self, url: str):
+        """Return ``(document, final_url)`` for ``url``, consulting the cache first."""
+        entry = self._read_entry(url)
+        body = self._read_body(entry) if entry else None
+        if entry is not None and body is None:
+            entry = None  # integrity failure: refetch unconditionally
+
+        if entry is not None and self.is_fresh(entry):
+            self._touch(entry)
+            return self._decode(body, url), entry["final_url"]
+
+        headers = {"Accept": "application/ld+json, application/json;q=0.9"}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        r = http_get(url, self.session, headers=headers, timeout=self.timeout)  # follows w3id 302s
+        if r.status_code == 304 and entry is not None:
+            self._store_headers(entry, r)
+            self._write_entry(entry)
+            return self._decode(body, url), entry["final_url"]
+
+        r.raise_for_status()
+        body = r.content
+        doc = self._decode(body, url)
+        self.put(url, body, r)
+        return doc, r.url
+
+    def put(self, url: str, body: bytes, response=None) -> Dict[str, Any]:
+        """Store ``body`` for ``url`` (headers taken from ``response``) and evict if over budget."""
+        digest = _sha256(body)
+        entry = {
+            "url": url,
+            "final_url": getattr(response, "url", None) or url,
+            "sha256": digest,
+            "size": len(body),
+        }
+        self._store_headers(entry, response)
+        if "no-store" in entry["cache_control"]:
+            return entry
+        obj_path = self.objects_dir / digest
+        if self._read_body(entry) is None:  # missing, or corrupt bytes left by an earlier write
+            _atomic_write(obj_path, body)
+        self._write_entry(entry)
+        self.evict()
+        return entry
+
+    def _store_headers(self, entry: Dict[str, Any], response) -> None:
+        hdrs = getattr(response, "headers", None) or {}
+        # A 304 only updates the validators/freshness it actually carries.
+        revalidated = getattr(response, "status_code", None) == 304
+        for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+            if header in hdrs or not revalidated:
+                entry[key] = hdrs.get(header)
+        if "Cache-Control" in hdrs or not revalidated:
+            entry["cache_control"] = parse_cache_control(hdrs.get("Cache-Control", ""))
+        now = time.time()
+        entry["validated_at"] = now
+        entry["last_used"] = now
+
+    def _touch(self, entry: Dict[str, Any]) -> None:
+        entry["last_used"] = time.time()
+        try:
+            self._write_entry(entry)
+        except OSError:
+            pass  # read-only cache dirs still serve hits
+
+    @staticmethod
+    def _decode(body: bytes, url: str):
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise RuntimeError(f"Non-JSON from {url}") from e
+
+    def evict(self) -> int:
+        """
+        Delete objects no entry refers to, then drop least-recently-used entries
+        until the rest fit ``max_bytes``; return the number of entries removed.
+        """
+        entries = []
+        for path in self.entries_dir.glob("*.json"):
+            try:
+                entries.append((path, json.loads(path.read_text(encoding="utf-8"))))
+            except (OSError, ValueError):
+                continue
+        live = {e.get("sha256") for _, e in entries}
+        sizes = {}
+        for obj in self.objects_dir.iterdir():
+            if obj.name.startswith(".tmp-"):
+                continue
+            if obj.name not in live:  # orphaned: no entry refers to it
+                obj.unlink(missing_ok=True)
+                continue
+            sizes[obj.name] = obj.stat().st_size
+        total = sum(sizes.values())
+        removed = 0
+        entries.sort(key=lambda pe: pe[1].get("last_used", 0))
+        while total > self.max_bytes and entries:
+            path, entry = entries.pop(0)
+            path.unlink(missing_ok=True)
+            removed += 1
+            digest = entry.get("sha256")
+            if digest in sizes and not any(e.get("sha256") == digest for _, e in entries):
+                (self.objects_dir / digest).unlink(missing_ok=True)
+                total -= sizes.pop(digest)
+        return removed
+
+
+def default_disk_cache() -> Optional[DiskContextCache]:
+    """Return the cache configured via LP_CONTEXT_CACHE_DIR, or None if unset."""
+    if not CONTEXT_CACHE_DIR:
+        return None
+    return DiskContextCache(CONTEXT_CACHE_DIR)
+
+
+class _Flight:
+    """One in-progress fetch that concurrent callers wait on."""
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ContextStore:
+    """
+    Thread-safe in-memory LRU keyed by (mapped) URL or any other string key.
+
+    ``get(url, fetch)`` returns the cached document or calls ``fetch(url)``.
+    Only one thread fetches a given URL at a time; others block on that
+    fetch and receive its result (or its exception).
+    """
+
+    def __init__(self, maxsize: int = CONTEXT_STORE_MAX_ENTRIES):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._inflight: Dict[str, _Flight] = {}
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, url: str, fetch: Callable[[str], Any]):
+        with self._lock:
+            if url in self._entries:
+                self._entries.move_to_end(url)
+                self.hits += 1
+                return self._entries[url]
+            self.misses += 1
+            flight = self._inflight.get(url)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[url] = _Flight()
+                self.fetches += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = fetch(url)
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            flight.value = value
+            with self._lock:
+                self._entries[url] = value
+                self._entries.move_to_end(url)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+            flight.event.set()
+        return value
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "fetches": self.fetches,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters (in-flight fetches still complete)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.fetches = self.coalesced = self.evictions = 0
+
+
+# Process-wide store used by make_requests_loader unless one is passed explicitly.
+CONTEXT_STORE = ContextStore()
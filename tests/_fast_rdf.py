@@ -0,0 +1,213 @@
+"""
+Profile-native JSON-LD → RDF emitter for crates in compact form.
+
+Crates written against the standard contexts (RO-Crate 1.1, workflow-run,
+lp-dscdpc) use a small subset of JSON-LD: plain terms, ``@id``/``@type``,
+``@type: @id`` and datatype coercion, inline node objects and node references.
+ProfileTable precompiles every term definition of a processed active context
+into a lookup table (predicate IRI + coercion) and walks the compact JSON
+directly, emitting the same triples jsonld.to_rdf would without building the
+expanded form or the node map.
+
+Anything outside that subset (value objects, @list, language maps, scoped
+contexts, keyword aliases, relative IRIs, ...) raises FastPathUnsupported so the
+caller can fall back to pyld. Term and IRI expansion itself is delegated to
+pyld's _expand_iri, so the table cannot drift from the pyld path.
+"""
+from numbers import Integral, Real
+import re
+
+from pyld import jsonld
+from pyld.jsonld import _is_absolute_iri
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import RDF
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+XSD_BOOLEAN = XSD + "boolean"
+XSD_DOUBLE = XSD + "double"
+XSD_INTEGER = XSD + "integer"
+XSD_STRING = XSD + "string"
+
+# pyld term-definition keys that the fast path understands
+_SIMPLE_MAPPING_KEYS = {"@id", "@type", "reverse", "protected", "_prefix", "_term_has_colon"}
+
+_UNSUPPORTED = object()
+_DROP = object()  # pyld silently drops keys that do not expand to an absolute IRI
+
+
+class FastPathUnsupported(Exception):
+    """The document uses JSON-LD features the profile-native emitter does not handle."""
+
+
+def _literal(lexical: str, datatype) -> Literal:
+    # xsd:string literals are plain, as in the N-Quads round-trip
+    if datatype is None or str(datatype) == XSD_STRING:
+        return Literal(lexical)
+    return Literal(lexical, datatype=datatype)
+
+
+def _canonical_double(value) -> str:
+    # same lexical form as pyld's _object_to_rdf
+    return re.sub(r"(\d)0*E\+?0*(\d)", r"\1E\2", "%1.15E" % value)
+
+
+class ProfileTable:
+    """
+    Compiled term table for one active context and base IRI.
+
+    Safe to share between threads: lookups only add entries to memo dicts.
+    """
+
+    def __init__(self, active_ctx: dict, base: str):
+        self.active_ctx = active_ctx
+        self.base = base
+        self._processor = jsonld.JsonLdProcessor()
+        # default language/direction would turn plain strings into language strings
+        self.supported = "@language" not in active_ctx and "@direction" not in active_ctx
+        self.uris = {}
+        self.properties = {}
+        self.types = {}
+        self.ids = {}
+        for term in active_ctx.get("mappings", {}):
+            self.properties[term] = self._compile_property(term)
+
+    # --- compilation ----------------------------------------------------------
+
+    def _uri(self, iri: str) -> URIRef:
+        node = self.uris.get(iri)
+        if node is None:
+            node = self.uris[iri] = URIRef(iri)
+        return node
+
+    def _compile_property(self, key: str):
+        """(predicate, coercion) for a property key, _DROP or _UNSUPPORTED."""
+        if key.startswith("@"):
+            return _UNSUPPORTED
+        mapping = self.active_ctx.get("mappings", {}).get(key)
+        if mapping is not None and (set(mapping) - _SIMPLE_MAPPING_KEYS or mapping.get("reverse")):
+            return _UNSUPPORTED  # containers, scoped contexts, @language, @reverse, @nest, ...
+        iri = self._processor._expand_iri(self.active_ctx, key, vocab=True)
+        if iri is None or not (iri.startswith("@") or _is_absolute_iri(iri)):
+            return _DROP  # null-mapped terms, IRIs with spaces, relative IRIs without @vocab
+        if iri.startswith(("@", "_:")):
+            return _UNSUPPORTED  # keyword aliases, blank node predicates
+        coercion = mapping.get("@type") if mapping else None
+        if coercion == "@none":
+            coercion = None
+        elif coercion not in (None, "@id", "@vocab"):
+            if coercion.startswith("@") or not _is_absolute_iri(coercion):
+                return _UNSUPPORTED  # @json and friends
+            coercion = self._uri(coercion)
+        return self._uri(iri), coercion
+
+    def _property(self, key: str):
+        compiled = self.properties.get(key)
+        if compiled is None:
+            compiled = self.properties[key] = self._compile_property(key)
+        if compiled is _UNSUPPORTED:
+            raise FastPathUnsupported(f"property {key!r}")
+        return compiled
+
+    def _expand_ref(self, value: str, vocab: bool) -> str:
+        memo = self.types if vocab else self.ids
+        iri = memo.get(value)
+        if iri is None:
+            if vocab:
+                mapping = self.active_ctx.get("mappings", {}).get(value)
+                if mapping is not None and "@context" in mapping:
+                    raise FastPathUnsupported(f"type-scoped context on {value!r}")
+            iri = self._processor._expand_iri(self.active_ctx, value, vocab=vocab, base=self.base)
+            if not iri or iri.startswith("@") or not (iri.startswith("_:") or _is_absolute_iri(iri)):
+                raise FastPathUnsupported(f"IRI {value!r}")
+            memo[value] = iri
+        return iri
+
+    # --- emission -------------------------------------------------------------
+
+    def to_graph(self, doc: dict, g):
+        """
+        Add the triples of compact JSON-LD ``doc`` to rdflib Graph ``g``.
+
+        Raises FastPathUnsupported (leaving ``g`` untouched) when the document
+        needs the general algorithm.
+        """
+        if not self.supported:
+            raise FastPathUnsupported("default @language/@direction")
+        if "@graph" in doc:
+            if set(doc) - {"@context", "@graph"}:
+                raise FastPathUnsupported("top-level node with @graph")
+            nodes = doc["@graph"]
+            nodes = nodes if isinstance(nodes, list) else [nodes]
+        else:
+            nodes = [{k: v for k, v in doc.items() if k != "@context"}]
+
+        emitter = _Emitter(self)
+        for node in nodes:
+            emitter.node(node)
+        g.addN((s, p, o, g) for s, p, o in emitter.triples)
+        return g
+
+
+class _Emitter:
+    """Triples and blank node labels of one conversion."""
+
+    def __init__(self, table: ProfileTable):
+        self.table = table
+        self.triples = []
+        self.bnodes = {}
+
+    def ref(self, value, vocab: bool = False):
+        if not isinstance(value, str):
+            raise FastPathUnsupported(f"non-string IRI {value!r}")
+        iri = self.table._expand_ref(value, vocab)
+        if iri.startswith("_:"):
+            node = self.bnodes.get(iri)
+            if node is None:
+                node = self.bnodes[iri] = BNode()
+            return node
+        return self.table._uri(iri)
+
+    def node(self, node):
+        """Emit a node object's triples and return its subject."""
+        if not isinstance(node, dict):
+            raise FastPathUnsupported(f"non-object node {node!r}")
+        subject = self.ref(node["@id"]) if "@id" in node else BNode()
+        append = self.triples.append
+        for key, value in node.items():
+            if key == "@id":
+                continue
+            if key == "@type":
+                for t in value if isinstance(value, list) else [value]:
+                    append((subject, RDF.type, self.ref(t, vocab=True)))
+                continue
+            compiled = self.table._property(key)
+            if compiled is _DROP:
+                continue
+            predicate, coercion = compiled
+            for v in value if isinstance(value, list) else [value]:
+                obj = self.value(v, coercion)
+                if obj is not None:
+                    append((subject, predicate, obj))
+        return subject
+
+    def value(self, v, coercion):
+        if v is None:
+            return None
+        if isinstance(v, dict):
+            return self.node(v)
+        if isinstance(v, str):
+            if coercion == "@id":
+                return self.ref(v)
+            if coercion == "@vocab":
+                return self.ref(v, vocab=True)
+            return _literal(v, coercion)
+
+        # native types: @id/@vocab coercion does not apply (pyld keeps a plain value)
+        datatype = coercion if isinstance(coercion, URIRef) else None
+        if isinstance(v, bool):
+            return _literal("true" if v else "false", datatype or self.table._uri(XSD_BOOLEAN))
+        if isinstance(v, Real) and (not isinstance(v, Integral) or str(datatype) == XSD_DOUBLE):
+            return _literal(_canonical_double(v), datatype or self.table._uri(XSD_DOUBLE))
+        if isinstance(v, Integral):
+            return _literal(str(v), datatype or self.table._uri(XSD_INTEGER))
+        raise FastPathUnsupported(f"value {v!r}")
@@ -0,0 +1,149 @@
+"""
+Incremental reader for crates with very large @graph arrays.
+
+Parses the top-level object of a JSON file with a rolling buffer and
+``json.JSONDecoder.raw_decode``, so only one top-level value (or one @graph
+entity) is held in memory at a time.
+"""
+import json
+from typing import Any, Iterator, Optional, Tuple
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonStream:
+    """Minimal pull parser over a text file object."""
+
+    def __init__(self, fh, chunk_size: int = CHUNK_SIZE):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Append up to ``size`` more characters; return False at end of file."""
+        if self.eof:
+            return False
+        if self.pos > self.chunk_size:
+            # drop consumed prefix so the buffer tracks the current value only
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        data = self.fh.read(size or self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf += data
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Expected {ch!r} at offset {self.pos}, got {got!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        want = self.chunk_size
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(want):
+                    raise
+                want *= 2  # grow reads geometrically for large values
+                continue
+            # a number may continue past the buffer end
+            if end == len(self.buf) and not self.eof and self._fill(want):
+                continue
+            self.pos = end
+            return obj
+
+    def items(self) -> Iterator[Tuple[str, "JsonStream"]]:
+        """
+        Iterate over the keys of the top-level object. For each key the caller
+        must consume the value (``value()``, ``array()`` or ``skip()``) before
+        advancing the iterator.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected object key at offset {self.pos}")
+            self.expect(":")
+            yield key, self
+            nxt = self.peek()
+            self.pos += 1
+            if nxt == "}":
+                return
+            if nxt != ",":
+                raise ValueError(f"Expected ',' or '}}' at offset {self.pos - 1}, got {nxt!r}")
+
+    def array(self) -> Iterator[Any]:
+        """Yield the elements of the array at the current position one at a time."""
+        if self.peek() != "[":
+            yield self.value()  # a single object stands for a one-element array
+            return
+        self.pos += 1
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            nxt = self.peek()
+            self.pos += 1
+            if nxt == "]":
+                return
+            if nxt != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {self.pos - 1}, got {nxt!r}")
+
+    def skip(self) -> None:
+        """Consume the current value without keeping it."""
+        for _ in self.array():
+            pass
+
+
+def read_context(path, chunk_size: int = CHUNK_SIZE):
+    """Return the top-level @context of a crate file without loading its @graph."""
+    with open(path, "r", encoding="utf-8") as fh:
+        stream = JsonStream(fh, chunk_size)
+        for key, value in stream.items():
+            if key == "@context":
+                return value.value()
+            value.skip()
+    return None
+
+
+def iter_graph(path, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the @graph entities of a crate file one at a time.
+
+    Raises ValueError if the top level has keys other than @context and @graph
+    (such a document is a single node and cannot be streamed entity-wise).
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        stream = JsonStream(fh, chunk_size)
+        for key, value in stream.items():
+            if key == "@graph":
+                yield from value.array()
+            elif key == "@context":
+                value.skip()
+            else:
+                raise ValueError(f"Top-level key {key!r} prevents streaming {path}")
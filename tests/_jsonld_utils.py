@@ -1,7 +1,20 @@
-import json, os, requests
+import hashlib, json, os
+import itertools
+import multiprocessing
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, NamedTuple, Optional
 from pyld import jsonld
-from rdflib import Dataset, Graph
+from pyld.context_resolver import ContextResolver
+from pyld.jsonld import IdentifierIssuer, _is_absolute_iri, _resolved_context_cache
+from rdflib import BNode, Dataset, Graph, Literal, URIRef
 from urllib.parse import urlparse
+from tests._context_bundle import default_bundle
+from tests._context_cache import CONTEXT_STORE, ContextStore, default_disk_cache, http_get
+from tests._fast_rdf import FastPathUnsupported, ProfileTable
+from tests._json_stream import CHUNK_SIZE, iter_graph, read_context
+from tests._output_cache import default_output_cache
 
 LIVE_BASE = "https://livepublication.org/interface-schemas"
 W3ID_BASE = "https://w3id.org/livepublication/interface-schemas"
@@ -16,7 +29,50 @@ ROCRATE_ALLOWED = {
 }
 
 
-def make_requests_loader(base_override: str):
+def is_allowed_under_base(url: str, base: str) -> bool:
+    if not base:
+        return False
+    u = urlparse(url)
+    b = urlparse(base)
+    if u.scheme not in ("http", "https"):
+        return False
+    # exact scheme/host/port match; path prefix under base
+    return (u.scheme == b.scheme and u.netloc == b.netloc and u.path.startswith(b.path))
+
+
+def map_context_url(url: str, base_override: str) -> str:
+    """
+    Map a context URL to the URL actually fetched (see make_requests_loader).
+    Raises RuntimeError for URLs outside the allowlist.
+    """
+    # 1) Rewrite your contexts to the local/remote base
+    #    Handle both LIVE_BASE and W3ID_BASE patterns
+    if url.startswith(LIVE_BASE):
+        return url.replace(LIVE_BASE, base_override, 1)
+    if url.startswith(W3ID_BASE):
+        # Rewrite w3id URLs to the canonical livepublication.org base, then to override
+        canonical = url.replace(W3ID_BASE, LIVE_BASE, 1)
+        return canonical.replace(LIVE_BASE, base_override, 1)
+
+    # 2) RO-Crate contexts
+    if url in ROCRATE_ALLOWED:
+        if ROCRATE_ONLINE:
+            return url
+        # Local vendor fallbacks (used only when ROCRATE_ONLINE=0)
+        return {
+            "https://w3id.org/ro/crate/1.1/context": f"{base_override}/vendor/ro-crate/1.1/context.jsonld",
+            "https://w3id.org/ro/terms/workflow-run/context": f"{base_override}/vendor/ro-terms/workflow-run/context.jsonld",
+        }[url]
+
+    # 2b) Allow direct fetches under the override base (localhost server or remote BASE_URL)
+    if is_allowed_under_base(url, base_override):
+        return url
+
+    # 3) Block anything else
+    raise RuntimeError(f"Blocked external context fetch: {url}")
+
+
+def make_requests_loader(base_override: str, disk_cache=None, store=None, session=None, bundle=None):
     """
     Custom documentLoader:
     - Rewrites LIVE_BASE to base_override (local server or BASE_URL).
@@ -24,58 +80,39 @@ def make_requests_loader(base_override: str):
         * If ROCRATE_ONLINE=1 (default): fetch directly from the internet (allowlist).
         * If ROCRATE_ONLINE=0: rewrite to local vendor copies.
     - Blocks any other external URLs to keep tests deterministic.
+    - Documents are shared through store (default: the process-wide
+      CONTEXT_STORE), so every loader and thread fetches a URL at most once.
+    - Fetches go through disk_cache (a DiskContextCache) when given, or the
+      cache configured via LP_CONTEXT_CACHE_DIR, so contexts persist across runs.
+    - HTTP uses session (default: the pooled keep-alive HTTP_SESSION).
+    - Contexts in bundle (a ContextBundle, or the one named by LP_CONTEXT_BUNDLE)
+      are served from it without any HTTP at all.
     """
+    if disk_cache is None:
+        disk_cache = default_disk_cache()
+    if bundle is None:
+        bundle = default_bundle()
+    if store is None:
+        store = CONTEXT_STORE
 
-    # Local vendor fallbacks (used only when ROCRATE_ONLINE=0)
-    VENDOR_MAP = {
-        "https://w3id.org/ro/crate/1.1/context": f"{base_override}/vendor/ro-crate/1.1/context.jsonld",
-        "https://w3id.org/ro/terms/workflow-run/context": f"{base_override}/vendor/ro-terms/workflow-run/context.jsonld",
-    }
-
-    cache = {}
-
-    def is_allowed_under_base(url: str, base: str) -> bool:
-        if not base:
-            return False
-        u = urlparse(url)
-        b = urlparse(base)
-        if u.scheme not in ("http", "https"):
-            return False
-        # exact scheme/host/port match; path prefix under base
-        return (u.scheme == b.scheme and u.netloc == b.netloc and u.path.startswith(b.path))
+    def fetch(mapped: str):
+        if bundle is not None:
+            doc = bundle.lookup(mapped, base_override)
+            if doc is not None:
+                return doc
+        if disk_cache is not None:
+            doc, _final_url = disk_cache.fetch(mapped)
+            return doc
+        r = http_get(mapped, session, timeout=15)  # requests follows redirects (w3id does 302s)
+        r.raise_for_status()
+        try:
+            return r.json()
+        except Exception as e:
+            raise RuntimeError(f"Non-JSON from {mapped}") from e
 
     def loader(url, options=None):
-        # 1) Rewrite your contexts to the local/remote base
-        #    Handle both LIVE_BASE and W3ID_BASE patterns
-        if url.startswith(LIVE_BASE):
-            mapped = url.replace(LIVE_BASE, base_override, 1)
-        elif url.startswith(W3ID_BASE):
-            # Rewrite w3id URLs to the canonical livepublication.org base, then to override
-            canonical = url.replace(W3ID_BASE, LIVE_BASE, 1)
-            mapped = canonical.replace(LIVE_BASE, base_override, 1)
-
-        # 2) RO-Crate contexts
-        elif url in ROCRATE_ALLOWED:
-            mapped = url if ROCRATE_ONLINE else VENDOR_MAP[url]
-
-        # 2b) Allow direct fetches under the override base (localhost server or remote BASE_URL)
-        elif is_allowed_under_base(url, base_override):
-            mapped = url
-
-        # 3) Block anything else
-        else:
-            raise RuntimeError(f"Blocked external context fetch: {url}")
-
-        if mapped in cache:
-            doc = cache[mapped]
-        else:
-            r = requests.get(mapped, timeout=15)  # requests follows redirects (w3id does 302s)
-            r.raise_for_status()
-            try:
-                doc = r.json()
-            except Exception as e:
-                raise RuntimeError(f"Non-JSON from {mapped}") from e
-            cache[mapped] = doc
+        mapped = map_context_url(url, base_override)
+        doc = store.get(mapped, fetch)
 
         return {
             "contextUrl": None,
@@ -91,54 +128,474 @@ def load_json_file(path: str):
         return json.load(f)
 
 
-def expand_with_override(doc: dict, base_override: str):
-    loader = make_requests_loader(base_override)
-    return jsonld.expand(doc, options={"documentLoader": loader})
+def rewrite_context_url(item, base_override: str):
+    """Rewrite one @context entry (LIVE_BASE/W3ID_BASE/ROCRATE_ONLINE) the way the loader maps it."""
+    if isinstance(item, str):
+        if item.startswith(LIVE_BASE):
+            return item.replace(LIVE_BASE, base_override, 1)
+        if item.startswith(W3ID_BASE):
+            # Rewrite w3id URLs to canonical, then to override
+            canonical = item.replace(W3ID_BASE, LIVE_BASE, 1)
+            return canonical.replace(LIVE_BASE, base_override, 1)
+        if not ROCRATE_ONLINE:
+            if item == "https://w3id.org/ro/crate/1.1/context":
+                return f"{base_override}/vendor/ro-crate/1.1/context.jsonld"
+            if item == "https://w3id.org/ro/terms/workflow-run/context":
+                return f"{base_override}/vendor/ro-terms/workflow-run/context.jsonld"
+    return item
+
+
+def rewrite_context(ctx, base_override: str):
+    """Rewrite a whole @context value (string, list or inline object)."""
+    if isinstance(ctx, list):
+        return [rewrite_context_url(c, base_override) for c in ctx]
+    return rewrite_context_url(ctx, base_override)
+
+
+# The @context every example crate uses (see README "Requirements for valid crates").
+CRATE_CONTEXT = [
+    "https://w3id.org/ro/crate/1.1/context",
+    "https://w3id.org/ro/terms/workflow-run/context",
+    f"{LIVE_BASE}/contexts/lp-dscdpc/v1.jsonld",
+]
+
+# Processed (active) contexts keyed by the rewritten @context, base and document
+# loader (see _context_key). Context processing of the RO-Crate context dominates
+# per-crate cost, so every expansion that shares a context list and loader reuses
+# the same active context.
+ACTIVE_CONTEXT_MAX_ENTRIES = int(os.getenv("LP_ACTIVE_CONTEXT_MAX_ENTRIES", "32"))
+ACTIVE_CONTEXTS = ContextStore(maxsize=ACTIVE_CONTEXT_MAX_ENTRIES)
+
+# Compiled ProfileTables (tests/_fast_rdf.py), keyed like ACTIVE_CONTEXTS.
+# Set LP_FAST_RDF=0 to always convert through pyld.
+FAST_RDF = os.getenv("LP_FAST_RDF", "1") != "0"
+PROFILE_TABLES = ContextStore(maxsize=ACTIVE_CONTEXT_MAX_ENTRIES)
+
+
+def _expand_options(loader, base: str) -> dict:
+    """Options matching the defaults JsonLdProcessor.expand would fill in."""
+    return {
+        "base": base,
+        "documentLoader": loader,
+        "contextResolver": ContextResolver(_resolved_context_cache, loader),
+        "isFrame": False,
+        "keepFreeFloatingNodes": False,
+        "extractAllScripts": False,
+        "processingMode": "json-ld-1.1",
+    }
+
+
+def get_active_context(ctx, base_override: str, base: str = "", loader=None):
+    """
+    Return the pyld active context for a crate's @context, processing it at most
+    once per (rewritten context, base, loader) per process. ``loader`` defaults
+    to make_requests_loader(base_override); a caller's own loader gets its own
+    entries, so it never sees contexts built from another loader's documents.
+    """
+    rewritten = rewrite_context(ctx, base_override)
+
+    def process(_key):
+        # fetch every @context URL (and their redirect chains) concurrently first
+        load = loader or make_requests_loader(base_override)
+        prefetch_contexts(rewritten, base_override, loader=load)
+        options = _expand_options(load, base)
+        processor = jsonld.JsonLdProcessor()
+        active_ctx = processor._get_initial_context(options)
+        if rewritten is not None:
+            active_ctx = processor.process_context(active_ctx, rewritten, options)
+        return active_ctx
+
+    return _memo(ACTIVE_CONTEXTS, _context_key(rewritten, base, loader), process)
+
+
+# loader -> number unique for the process lifetime (ids of dead loaders can be reused; these cannot)
+_LOADER_TOKENS = weakref.WeakKeyDictionary()
+_LOADER_TOKENS_LOCK = threading.Lock()
+_NEXT_LOADER_TOKEN = itertools.count(1)
+
+
+def _context_key(rewritten, base: str, loader=None) -> Optional[str]:
+    """
+    Cache key for per-context memos: None (do not cache) for a loader that
+    cannot be weakly referenced, since nothing else identifies it safely.
+    """
+    token = 0
+    if loader is not None:
+        with _LOADER_TOKENS_LOCK:
+            try:
+                token = _LOADER_TOKENS.get(loader)
+                if token is None:
+                    token = _LOADER_TOKENS[loader] = next(_NEXT_LOADER_TOKEN)
+            except TypeError:
+                return None
+    return json.dumps([rewritten, base, token], sort_keys=True, separators=(",", ":"))
+
+
+def _memo(store: ContextStore, key: Optional[str], compute):
+    return compute(key) if key is None else store.get(key, compute)
+
+
+def get_profile_table(ctx, base_override: str, base: str = "", loader=None) -> ProfileTable:
+    """Return the compiled fast-path term table for a crate's @context (built once per process and loader)."""
+    key = _context_key(rewrite_context(ctx, base_override), base, loader)
+    return _memo(PROFILE_TABLES, key,
+                 lambda _key: ProfileTable(get_active_context(ctx, base_override, base, loader), base))
+
+
+def fast_to_rdf_graph(doc: dict, base_override: str, rdflib_graph=None, loader=None):
+    """
+    Convert with the profile-native emitter only. Raises FastPathUnsupported for
+    documents outside its JSON-LD subset (see tests/_fast_rdf.py).
+    """
+    g = Graph() if rdflib_graph is None else rdflib_graph
+    table = get_profile_table(doc.get("@context"), base_override, base_override, loader)
+    return table.to_graph(doc, g)
+
+
+def _context_urls(ctx):
+    """String entries (remote context URLs) of a @context value."""
+    if isinstance(ctx, dict) and "@context" in ctx:
+        ctx = ctx["@context"]
+    return [c for c in (ctx if isinstance(ctx, list) else [ctx]) if isinstance(c, str)]
+
+
+def prefetch_contexts(ctx, base_override: str, max_workers: int = 8, loader=None):
+    """
+    Load every remote URL in a @context value concurrently, then any @context
+    URLs those documents reference, so expansion finds them in CONTEXT_STORE.
+    Returns the URLs fetched. Blocked or failing URLs are left for expansion to report.
+    """
+    loader = loader or make_requests_loader(base_override)
+
+    def load(url):
+        try:
+            return loader(url)["document"]
+        except Exception:
+            return None
+
+    seen = set()
+    pending = _context_urls(ctx)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending:
+            batch = [u for u in dict.fromkeys(pending) if u not in seen]
+            seen.update(batch)
+            pending = []
+            for doc in pool.map(load, batch):
+                if isinstance(doc, dict):
+                    pending.extend(_context_urls(doc.get("@context")))
+    return sorted(seen)
+
+
+def warm_active_contexts(base_override: str, contexts=(CRATE_CONTEXT,), bases=None):
+    """Precompute active contexts at startup (default: the standard crate context)."""
+    if bases is None:
+        bases = ("", base_override)
+    for ctx in contexts:
+        for base in bases:
+            get_active_context(ctx, base_override, base)
+
+
+def _expand_cached(doc, base_override: str, base: str = "", loader=None):
+    """
+    jsonld.expand() equivalent that takes the top-level @context from ACTIVE_CONTEXTS.
+
+    Falls back to jsonld.expand for anything other than a single top-level node object.
+    """
+    active_ctx = None
+    if isinstance(doc, dict):  # the caller's loader (None: default) scopes the cached context
+        active_ctx = get_active_context(doc.get("@context"), base_override, base, loader)
+    loader = loader or make_requests_loader(base_override)
+    if not isinstance(doc, dict):
+        return jsonld.expand(doc, options={"documentLoader": loader, "base": base})
+
+    # shallow overlay: pyld's _expand reads but never writes its input, so unlike
+    # jsonld.expand no defensive deepcopy of the document is needed
+    body = {k: v for k, v in doc.items() if k != "@context"}
+    processor = jsonld.JsonLdProcessor()
+    expanded = processor._expand(active_ctx, None, body, _expand_options(loader, base),
+                                 inside_list=False)
+
+    # same post-processing as JsonLdProcessor.expand
+    if isinstance(expanded, dict) and "@graph" in expanded and len(expanded) == 1:
+        expanded = expanded["@graph"]
+    elif expanded is None:
+        expanded = []
+    return jsonld.JsonLdProcessor.arrayify(expanded)
+
 
+def expand_with_override(doc: dict, base_override: str, loader=None):
+    return _expand_cached(doc, base_override, loader=loader)
 
-def to_rdf_graph_from_jsonld(doc: dict, base_override: str, rdflib_graph=None):
+
+def to_rdf_graph_from_jsonld(doc: dict, base_override: str, rdflib_graph=None, loader=None,
+                             fast: Optional[bool] = None):
     """
-    Parse JSON-LD into an rdflib Dataset (avoids ConjunctiveGraph deprecation),
-    then merge all quads into a plain Graph for SHACL validation.
+    Convert JSON-LD into a plain rdflib Graph for SHACL validation (avoids
+    rdflib's JSON-LD parser and its ConjunctiveGraph deprecation). Triples are
+    added to rdflib_graph when given. ``loader`` is the pyld documentLoader used
+    for this call (default: make_requests_loader(base_override)).
+
+    Crates within the profile's JSON-LD subset go through the profile-native
+    emitter (fast_to_rdf_graph); anything else, or ``fast=False`` / LP_FAST_RDF=0,
+    uses pyld expansion. Both produce isomorphic graphs.
 
     NOTE: This flattens named-graph boundaries. If we later need NG-aware logic,
     we'll keep the Dataset and adapt validation accordingly. Current shapes
     do not rely on named graphs, so this is safe.
     """
-    # --- keep the existing @context rewrite logic (LIVE_BASE/ROCRATE_ONLINE) ---
-    ctx = doc.get("@context")
-
-    def rewrite_ctx_item(item):
-        if isinstance(item, str):
-            if item.startswith(LIVE_BASE):
-                return item.replace(LIVE_BASE, base_override, 1)
-            if item.startswith(W3ID_BASE):
-                # Rewrite w3id URLs to canonical, then to override
-                canonical = item.replace(W3ID_BASE, LIVE_BASE, 1)
-                return canonical.replace(LIVE_BASE, base_override, 1)
-            if not ROCRATE_ONLINE:
-                if item == "https://w3id.org/ro/crate/1.1/context":
-                    return f"{base_override}/vendor/ro-crate/1.1/context.jsonld"
-                if item == "https://w3id.org/ro/terms/workflow-run/context":
-                    return f"{base_override}/vendor/ro-terms/workflow-run/context.jsonld"
-        return item
+    # @context URLs are rewritten (LIVE_BASE/ROCRATE_ONLINE) when the active context
+    # is looked up, and the body is expanded from a shallow overlay without @context,
+    # so ``doc`` is never mutated or copied and can be shared across threads.
 
-    if isinstance(ctx, list):
-        doc["@context"] = [rewrite_ctx_item(c) for c in ctx]
-    elif isinstance(ctx, str):
-        doc["@context"] = rewrite_ctx_item(ctx)
+    if (FAST_RDF if fast is None else fast) and isinstance(doc, dict):
+        try:
+            return fast_to_rdf_graph(doc, base_override, rdflib_graph, loader)
+        except FastPathUnsupported:
+            pass
 
     # Prefer avoiding rdflib's JSON-LD parser to eliminate ConjunctiveGraph warnings.
-    # Use pyld to produce N-Quads, then load via rdflib's nquads parser.
-    loader = make_requests_loader(base_override)
-    expanded = jsonld.expand(doc, options={"documentLoader": loader, "base": base_override})
-    nquads = jsonld.to_rdf(expanded, options={
-        "format": "application/n-quads",
-        "useNativeTypes": True,
-        "produceGeneralizedRdf": False,
-        "base": base_override
-    })
+    # Expand once (reusing the cached active context for this @context list), then
+    # feed pyld's RDF triples straight into the rdflib Graph.
+    expanded = _expand_cached(doc, base_override, base_override, loader)
+    return expanded_to_graph(expanded, base_override, rdflib_graph)
 
-    g = Graph()
-    g.parse(data=nquads, format="nquads")
+
+RDF_LANGSTRING = "http://www.w3.org/1999/02/22-rdf-syntax-ns#langString"
+XSD_STRING = "http://www.w3.org/2001/XMLSchema#string"
+
+
+class _TermFactory:
+    """Turns pyld RDF term dicts into rdflib terms (one BNode per label per conversion)."""
+
+    def __init__(self):
+        self.iris = {}
+        self.bnodes = {}
+
+    def __call__(self, term):
+        kind = term["type"]
+        value = term["value"]
+        if kind == "IRI":
+            node = self.iris.get(value)
+            if node is None:
+                node = self.iris[value] = URIRef(value)
+            return node
+        if kind == "blank node":
+            node = self.bnodes.get(value)
+            if node is None:
+                node = self.bnodes[value] = BNode()
+            return node
+        # literal: same mapping N-Quads serialization + parsing would apply
+        datatype = term.get("datatype")
+        if datatype == RDF_LANGSTRING:
+            return Literal(value, lang=term.get("language") or None)
+        if datatype == XSD_STRING or not datatype:
+            return Literal(value)
+        return Literal(value, datatype=self.iris.get(datatype) or URIRef(datatype))
+
+
+def expanded_to_graph(expanded, base: str, rdflib_graph=None, terms=None, issuer=None):
+    """
+    Convert expanded JSON-LD to RDF and add it to an rdflib Graph via addN.
+
+    Equivalent to jsonld.to_rdf(..., format=application/n-quads,
+    produceGeneralizedRdf=False) followed by Graph().parse(format="nquads"),
+    but without the second expansion and the N-Quads text round-trip. Quads from
+    named graphs are merged into the graph, as the N-Quads path did.
+    Pass the same ``terms``/``issuer`` across calls to convert one document in
+    pieces (blank node labels then stay consistent between the pieces).
+    NOTE: pyld consumes @list arrays in ``expanded`` while converting.
+    """
+    g = Graph() if rdflib_graph is None else rdflib_graph
+    terms = _TermFactory() if terms is None else terms
+    issuer = IdentifierIssuer("_:b") if issuer is None else issuer
+
+    processor = jsonld.JsonLdProcessor()
+    node_map = {"@default": {}}
+    processor._create_node_map(expanded, node_map, "@default", issuer)
+    options = {"base": base, "produceGeneralizedRdf": False}
+
+    for graph_name, graph in sorted(node_map.items()):
+        # skip relative IRIs
+        if graph_name != "@default" and not _is_absolute_iri(graph_name):
+            continue
+        triples = processor._graph_to_rdf(graph, issuer, options)
+        g.addN(
+            (terms(t["subject"]), terms(t["predicate"]), terms(t["object"]), g)
+            for t in triples
+        )
+    return g
+
+
+def stream_to_rdf_graph(path, base_override: str, rdflib_graph=None, chunk_size: int = CHUNK_SIZE):
+    """
+    Streaming variant of to_rdf_graph_from_jsonld for crate files with large @graph arrays.
+
+    Reads the top-level @context first, then parses, expands (against the cached
+    active context) and converts one @graph entity at a time, so peak memory is
+    bounded by the largest single entity rather than the whole crate. Produces
+    the same graph as to_rdf_graph_from_jsonld(load_json_file(path), ...).
+    Crates must have only @context and @graph at the top level.
+    """
+    g = Graph() if rdflib_graph is None else rdflib_graph
+    active_ctx = get_active_context(read_context(path, chunk_size), base_override, base_override)
+    options = _expand_options(make_requests_loader(base_override), base_override)
+    processor = jsonld.JsonLdProcessor()
+    terms = _TermFactory()
+    issuer = IdentifierIssuer("_:b")
+
+    for entity in iter_graph(path, chunk_size):
+        expanded = processor._expand(active_ctx, "@graph", entity, options, inside_list=False)
+        if expanded is None:
+            continue
+        expanded_to_graph(jsonld.JsonLdProcessor.arrayify(expanded), base_override, g,
+                          terms=terms, issuer=issuer)
+    return g
+
+
+# Per-process memo of context fingerprints (see context_fingerprint)
+FINGERPRINTS = ContextStore(maxsize=ACTIVE_CONTEXT_MAX_ENTRIES)
+OUTPUT_CACHE_FORMAT = 2
+
+
+def context_fingerprint(ctx, base_override: str, loader=None) -> str:
+    """
+    Hash of everything besides the crate bytes that conversion output depends
+    on: every context document reached from ``ctx`` (by content), inline
+    context objects, ROCRATE_ONLINE and the base override. Any context change
+    gives a new fingerprint.
+    """
+    rewritten = rewrite_context(ctx, base_override)
+
+    def compute(_key):
+        load = loader or make_requests_loader(base_override)
+        documents = {}
+        for url in prefetch_contexts(rewritten, base_override, loader=load):
+            try:
+                doc = load(url)["document"]
+            except Exception as e:
+                documents[url] = f"error: {type(e).__name__}"
+                continue
+            documents[url] = hashlib.sha256(
+                json.dumps(doc, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+        material = {
+            "format": OUTPUT_CACHE_FORMAT,
+            "context": rewritten,
+            "documents": documents,
+            "online": ROCRATE_ONLINE,
+            "base": base_override,
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+    return _memo(FINGERPRINTS, _context_key(rewritten, base_override, loader), compute)
+
+
+def _cached_output(path, base_override: str, kind: str, compute, cache=None):
+    """Look ``kind`` output for crate file ``path`` up in the output cache, computing on a miss."""
+    cache = default_output_cache() if cache is None else cache
+    if cache is None:
+        return compute(load_json_file(path))
+    with open(path, "rb") as f:
+        raw = f.read()
+    # a hit costs hashing the bytes and reading the top-level @context only
+    try:
+        ctx = read_context(path)
+    except ValueError:
+        return compute(json.loads(raw))  # not a single top-level object
+    fingerprint = context_fingerprint(ctx, base_override)
+    return cache.get_or_compute(fingerprint, hashlib.sha256(raw).hexdigest(), kind,
+                                lambda: compute(json.loads(raw)))
+
+
+def cached_expand(path, base_override: str, cache=None):
+    """expand_with_override for a crate file, through the output cache (LP_OUTPUT_CACHE_DIR)."""
+    return _cached_output(path, base_override, "expanded",
+                          lambda doc: expand_with_override(doc, base_override), cache)
+
+
+def cached_crate_graph(path, base_override: str, cache=None, rdflib_graph=None) -> Graph:
+    """
+    to_rdf_graph_from_jsonld for a crate file, through the output cache
+    (LP_OUTPUT_CACHE_DIR). Every call adds fresh blank nodes, so loading the
+    same crate twice into ``rdflib_graph`` keeps the two copies apart.
+    """
+    triples = _cached_output(path, base_override, "triples",
+                             lambda doc: list(to_rdf_graph_from_jsonld(doc, base_override)), cache)
+    g = Graph() if rdflib_graph is None else rdflib_graph
+    g.addN((s, p, o, g) for s, p, o in triples)
     return g
+
+
+def cached_nquads(path, base_override: str, cache=None) -> str:
+    """Canonical (URDNA2015) N-Quads of a crate file, through the output cache."""
+    from tests._canonical import canonical_nquads  # imports this module
+
+    return _cached_output(path, base_override, "nquads",
+                          lambda doc: canonical_nquads(to_rdf_graph_from_jsonld(doc, base_override)),
+                          cache)
+
+
+class CrateResult(NamedTuple):
+    """Outcome of converting one crate in a batch: graph or error (never both)."""
+    path: str
+    graph: Optional[Graph]
+    error: Optional[str]
+
+
+def _warm_worker(base_override: str):
+    """Pool initializer; a no-op when the parent's warm caches were inherited via fork."""
+    warm_active_contexts(base_override)
+
+
+def _convert_path(path, base_override: str):
+    """Worker: convert one crate file, returning picklable triples or the error text."""
+    try:
+        g = cached_crate_graph(path, base_override)
+    except Exception as e:
+        return str(path), None, f"{type(e).__name__}: {e}"
+    return str(path), list(g), None
+
+
+def _to_result(path, triples, error) -> CrateResult:
+    if error is not None:
+        return CrateResult(path, None, error)
+    g = Graph()
+    g.addN((s, p, o, g) for s, p, o in triples)
+    return CrateResult(path, g, None)
+
+
+def to_rdf_graphs(paths: Iterable, base_override: str, workers: Optional[int] = None,
+                  ordered: bool = True, chunksize: int = 16) -> Iterator[CrateResult]:
+    """
+    Convert many crate files to graphs across a process pool.
+
+    Yields one CrateResult per path, in input order (``ordered=True``) or as
+    conversions complete. A failing crate yields its error text instead of
+    aborting the batch. Contexts are warmed in this process before the pool
+    forks, so workers start with the active-context cache populated.
+    ``workers`` defaults to os.cpu_count(); ``workers=1`` converts inline.
+    """
+    paths = [str(p) for p in paths]
+    if not paths:
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(paths)))
+
+    if workers == 1:
+        for path in paths:
+            yield _to_result(*_convert_path(path, base_override))
+        return
+
+    warm_active_contexts(base_override)
+    methods = multiprocessing.get_all_start_methods()
+    mp_context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=_warm_worker, initargs=(base_override,)) as pool:
+        if ordered:
+            bases = [base_override] * len(paths)
+            for out in pool.map(_convert_path, paths, bases, chunksize=chunksize):
+                yield _to_result(*out)
+        else:
+            futures = [pool.submit(_convert_path, path, base_override) for path in paths]
+            for fut in as_completed(futures):
+                yield _to_result(*fut.result())
@@ -0,0 +1,301 @@
+"""
+Native evaluation of simple SPARQL ASK policies.
+
+Our policies (tests/policy/queries/*.rq) are a basic graph pattern, or a UNION
+of them, with FILTERs over ``DATATYPE``, ``STRSTARTS(STR(..))`` and ``[NOT]
+EXISTS { triples }``. compile_ask() turns the prepared algebra of such a query
+into a plan of triple-pattern lookups on the graph's own indexes
+(``graph.triples`` with every bound term filled in) and plain Python filter
+checks, each placed right after the pattern that binds its variables. No
+SPARQL binding contexts or expression interpreter run per solution.
+
+    plan = compile_ask(prepareQuery(text))   # UnsupportedQuery outside the subset
+    violated = plan.ask(graph)
+
+Answers are those of ``bool(graph.query(query))``. As in SPARQL, a filter
+that raises an error (``DATATYPE`` of an IRI, an unbound variable) is false.
+Anything else (OPTIONAL, MINUS, property paths, BIND, ``!``, ...) raises
+UnsupportedQuery, and PolicySet keeps evaluating that query with rdflib.
+"""
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from rdflib import BNode, Literal, URIRef, Variable
+from rdflib.namespace import RDF, XSD
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib.plugins.sparql.sparql import Query
+from rdflib.plugins.stores.memory import Memory
+
+
+class UnsupportedQuery(Exception):
+    """The query uses SPARQL features outside the natively compiled subset."""
+
+
+class _Error(Exception):
+    """A SPARQL expression error; the enclosing filter is false."""
+
+
+_STRING_TESTS = {
+    "Builtin_STRSTARTS": str.startswith,
+    "Builtin_STRENDS": str.endswith,
+    "Builtin_CONTAINS": str.__contains__,
+}
+_KIND_TESTS = {
+    "Builtin_isIRI": URIRef, "Builtin_isURI": URIRef, "Builtin_isBLANK": BNode, "Builtin_isLITERAL": Literal,
+}
+
+
+def _is_var(term) -> bool:
+    return isinstance(term, (Variable, BNode))  # blank nodes in a pattern act as variables
+
+
+def _name(node) -> Optional[str]:
+    return node.name if isinstance(node, CompValue) else None
+
+
+# -- graph patterns --------------------------------------------------------------
+
+def _branches(node) -> List[Tuple[list, list]]:
+    """``node`` as a union of ``(triples, filter expressions)`` branches."""
+    name = _name(node)
+    if name == "BGP":
+        return [(_triples(node.triples), [])]
+    if name == "Filter":
+        return [(triples, filters + [node.expr]) for triples, filters in _branches(node.p)]
+    if name == "Union":
+        return _branches(node.p1) + _branches(node.p2)
+    if name == "Join":
+        # only plain BGPs merge without changing where a filter applies
+        left, right = _branches(node.p1), _branches(node.p2)
+        if len(left) == len(right) == 1 and not left[0][1] and not right[0][1]:
+            return [(left[0][0] + right[0][0], [])]
+    raise UnsupportedQuery(f"graph pattern {name or type(node).__name__}")
+
+
+def _triples(triples) -> list:
+    out = []
+    for triple in triples:
+        if not all(isinstance(t, (Variable, BNode, URIRef, Literal)) for t in triple):
+            raise UnsupportedQuery(f"pattern {triple}")  # property paths
+        out.append(tuple(triple))
+    return out
+
+
+def _pattern_vars(triples) -> set:
+    return {t for triple in triples for t in triple if _is_var(t)}
+
+
+class _Plan:
+    """
+    One branch: triple patterns in lookup order, each with the filters that
+    become evaluable once it has bound its variables.
+    """
+
+    def __init__(self, triples: list, filters: list, bound: frozenset = frozenset()):
+        variables = _pattern_vars(triples)
+        pending = [(_expr_vars(e) & variables - bound, _filter(e, variables | bound)) for e in filters]
+        known, remaining, steps = set(bound), list(triples), []
+        self.head = [test for needs, test in pending if not needs]
+        pending = [(needs, test) for needs, test in pending if needs]
+        while remaining:
+            # most bound positions first: type and predicate lookups before full scans
+            best = max(remaining, key=lambda t: sum(not _is_var(x) or x in known for x in t))
+            remaining.remove(best)
+            predicate = best[1]
+            p_tests = None
+            if _is_var(predicate) and predicate not in known:
+                # tests on the predicate alone run once per distinct predicate, before its triples
+                p_known = known | {predicate}
+                p_tests = [test for needs, test in pending if needs <= p_known]
+                pending = [(needs, test) for needs, test in pending if not needs <= p_known]
+            known |= _pattern_vars([best])
+            steps.append((best, p_tests, [test for needs, test in pending if needs <= known]))
+            pending = [(needs, test) for needs, test in pending if not needs <= known]
+        if pending:  # filters on variables no pattern binds: always an error, so false
+            self.head.append(lambda graph, b: False)
+        self.steps = steps
+
+    def solutions(self, graph, bindings: Dict) -> Iterator[Dict]:
+        b = dict(bindings)
+        if all(test(graph, b) for test in self.head):
+            yield from _solve(graph, self.steps, 0, b)
+
+
+def _predicates(graph) -> list:
+    """
+    The distinct predicates of ``graph``: the keys of rdflib's Memory store
+    predicate index (a private attribute, checked for) when the graph uses
+    that store, else one pass over its triples.
+    """
+    if type(graph.store) is Memory:
+        pos = getattr(graph.store, "_Memory__pos", None)
+        if isinstance(pos, dict):
+            return list(pos)  # may include other graphs' predicates in a shared store; scans then find nothing
+    return list(graph.predicates(unique=True))
+
+
+def _solve(graph, steps: list, i: int, b: Dict) -> Iterator[Dict]:
+    """Solutions extending ``b``; bindings are made in place and undone on the way back."""
+    if i == len(steps):
+        yield dict(b)
+        return
+    pattern, p_tests, tests = steps[i]
+    lookup = [b.get(t) if _is_var(t) else t for t in pattern]
+    free = [(n, t) for n, t in enumerate(pattern) if lookup[n] is None]
+    if not free:
+        if tuple(lookup) in graph and all(test(graph, b) for test in tests):
+            yield from _solve(graph, steps, i + 1, b)
+        return
+    if p_tests is None:
+        yield from _scan(graph, steps, i, b, tuple(lookup), free, tests)
+        return
+    var = pattern[1]
+    free = [(n, t) for n, t in free if n != 1]
+    for predicate in _predicates(graph):
+        b[var] = predicate
+        if all(test(graph, b) for test in p_tests):
+            lookup[1] = predicate
+            yield from _scan(graph, steps, i, b, tuple(lookup), free, tests)
+    b.pop(var, None)
+
+
+def _scan(graph, steps: list, i: int, b: Dict, lookup: tuple, free: list, tests: list) -> Iterator[Dict]:
+    for triple in graph.triples(lookup):
+        added = []
+        for n, var in free:
+            value = triple[n]
+            if var not in b:
+                b[var] = value
+                added.append(var)
+            elif b[var] != value:
+                break  # the same variable twice in one pattern
+        else:
+            for test in tests:
+                if not test(graph, b):
+                    break
+            else:
+                yield from _solve(graph, steps, i + 1, b)
+        for var in added:
+            del b[var]
+
+
+# -- filter expressions ----------------------------------------------------------
+
+def _expr_vars(e) -> set:
+    """Variables of ``e`` that must be bound before it can be evaluated (EXISTS: those it shares)."""
+    if _is_var(e):
+        return {e}
+    name = _name(e)
+    if name in ("Builtin_EXISTS", "Builtin_NOTEXISTS"):
+        return set(e.get("_vars") or ())
+    if name is None:
+        return set()
+    out = set()
+    for key, value in e.items():
+        if key != "_vars":
+            for v in value if isinstance(value, list) else [value]:
+                out |= _expr_vars(v)
+    return out
+
+
+def _filter(e, variables: set) -> Callable:
+    test = _test(e, variables)
+
+    def run(graph, b):
+        try:
+            return test(graph, b)
+        except _Error:
+            return False
+    return run
+
+
+def _test(e, variables: set) -> Callable:
+    name = _name(e)
+    if name in ("ConditionalAndExpression", "ConditionalOrExpression"):
+        # with no ``!`` in the subset, an error inside && and || acts as false
+        parts = [_filter(x, variables) for x in [e.expr] + list(e.other or [])]
+        if name == "ConditionalAndExpression":
+            return lambda graph, b: all(p(graph, b) for p in parts)
+        return lambda graph, b: any(p(graph, b) for p in parts)
+    if name in ("Builtin_EXISTS", "Builtin_NOTEXISTS"):
+        (triples, filters), *rest = _branches(e.graph)
+        if rest:
+            raise UnsupportedQuery("UNION inside EXISTS")
+        plan = _Plan(triples, filters, frozenset(_pattern_vars(triples) & variables))
+        found = lambda graph, b: next(plan.solutions(graph, b), None) is not None  # noqa: E731
+        if name == "Builtin_EXISTS":
+            return found
+        return lambda graph, b: not found(graph, b)
+    if name in _STRING_TESTS:
+        arg, prefix, op = e.arg1, e.arg2, _STRING_TESTS[name]
+        if _name(arg) != "Builtin_STR" or not _is_var(arg.arg) or not _plain(prefix):
+            raise UnsupportedQuery(f"{name} arguments")
+        var, text = arg.arg, str(prefix)
+        return lambda graph, b: op(str(_value(b, var)), text)
+    if name in _KIND_TESTS:
+        if not _is_var(e.arg):
+            raise UnsupportedQuery(f"{name} argument")
+        var, kind = e.arg, _KIND_TESTS[name]
+        return lambda graph, b: isinstance(_value(b, var), kind)
+    if name == "RelationalExpression" and e.op in ("=", "!="):
+        left, right = _iri(e.expr), _iri(e.other)
+        if e.op == "=":
+            return lambda graph, b: left(b) == right(b)
+        return lambda graph, b: left(b) != right(b)
+    raise UnsupportedQuery(f"filter {name or e!r}")
+
+
+def _plain(term) -> bool:
+    return isinstance(term, Literal) and term.language is None and term.datatype in (None, XSD.string)
+
+
+def _value(b: Dict, var):
+    value = b.get(var)
+    if value is None:
+        raise _Error(f"unbound {var}")
+    return value
+
+
+def _iri(e) -> Callable:
+    """An IRI-valued operand of = / !=: a constant IRI or ``DATATYPE(?var)``."""
+    if isinstance(e, URIRef):
+        return lambda b: e
+    if _name(e) == "Builtin_DATATYPE" and _is_var(e.arg):
+        var = e.arg
+
+        def datatype(b):
+            value = _value(b, var)
+            if not isinstance(value, Literal):
+                raise _Error(f"DATATYPE of {value!r}")
+            if value.language:
+                return RDF.langString
+            return value.datatype or XSD.string
+        return datatype
+    raise UnsupportedQuery(f"comparison operand {e!r}")
+
+
+# -- queries ---------------------------------------------------------------------
+
+class CompiledAsk:
+    """An ASK query compiled to index lookups; see compile_ask()."""
+
+    def __init__(self, branches: List[Tuple[list, list]]):
+        self.plans = [_Plan(triples, filters) for triples, filters in branches]
+
+    def solutions(self, graph) -> Iterator[Dict]:
+        """Bindings of every solution of the query's pattern, branch by branch, lazily."""
+        for plan in self.plans:
+            yield from plan.solutions(graph, {})
+
+    def ask(self, graph) -> bool:
+        return next(self.solutions(graph), None) is not None
+
+
+def compile_ask(query: Query) -> CompiledAsk:
+    """Compile a prepared ASK query, or raise UnsupportedQuery."""
+    algebra = query.algebra
+    if algebra.name != "AskQuery" or algebra.get("datasetClause"):
+        raise UnsupportedQuery(f"{algebra.name} with dataset clause" if algebra.name == "AskQuery" else algebra.name)
+    pattern = algebra.p
+    if _name(pattern) == "Project":
+        pattern = pattern.p
+    return CompiledAsk(_branches(pattern))
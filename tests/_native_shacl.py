@@ -0,0 +1,413 @@
+"""
+Native validator for the constraint subset used by the DPC and DSC shapes.
+
+The shapes only use ``sh:targetClass``, ``sh:minCount``, ``sh:class``,
+``sh:datatype``, ``sh:nodeKind``, ``sh:or`` and ``sh:node`` on simple IRI
+paths. NativeShapes compiles exactly that subset from the merged shapes graph
+and checks a crate with dict lookups over a subject -> predicate -> objects
+index of the data graph, instead of pyshacl's general engine.
+
+    native = native_shapes(server_base)
+    conforms, results = native.validate(data_graph)   # closure=True, like ShapesValidator
+
+Results carry the focus node, path, value, source shape, constraint component,
+severity and message of the matching pyshacl ``sh:result``; messages use
+pyshacl's own wording and node formatting. Like ``inference='rdfs'`` on crates,
+class membership (targets and ``sh:class``) follows ``rdfs:subClassOf`` in the
+data graph. Shapes using anything else raise UnsupportedShape at compile time.
+
+Parity mode (``parity=True`` or LP_SHACL_PARITY=1) also runs pyshacl with the
+same shapes and raises ShaclParityError when the results differ.
+
+For gates and dashboards, ``stream()`` yields results one by one as they are
+found (``fail_fast``, ``max_results``) and write_jsonl() emits them as JSON
+lines, without a report graph or report text:
+
+    write_jsonl(native.stream(data_graph, fail_fast=True), sys.stdout, crate=path)
+"""
+import json
+import os
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from pyshacl.rdfutil import stringify_node
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import RDF, RDFS, SH, XSD
+
+from tests._context_cache import ContextStore
+from tests._shacl import ShapesValidator, shapes_validator
+
+# Run pyshacl alongside every native validation and compare
+SHACL_PARITY = os.getenv("LP_SHACL_PARITY", "0") == "1"
+
+_MIN_COUNT, _CLASS, _DATATYPE, _NODE_KIND, _OR, _NODE = (
+    SH.minCount, SH["class"], SH.datatype, SH.nodeKind, SH["or"], SH.node)
+
+# shape predicates the compiler understands; anything else is UnsupportedShape
+_CONSTRAINTS = {_MIN_COUNT, _CLASS, _DATATYPE, _NODE_KIND, _OR, _NODE}
+_ANNOTATIONS = {RDF.type, SH.targetClass, SH.path, SH.property, SH.message, SH.severity,
+                SH.name, SH.description, RDFS.label, RDFS.comment}
+
+_COMPONENTS = {
+    _MIN_COUNT: SH.MinCountConstraintComponent,
+    _CLASS: SH.ClassConstraintComponent,
+    _DATATYPE: SH.DatatypeConstraintComponent,
+    _NODE_KIND: SH.NodeKindConstraintComponent,
+    _OR: SH.OrConstraintComponent,
+    _NODE: SH.NodeConstraintComponent,
+}
+
+_NODE_KINDS = {
+    SH.IRI: (URIRef,), SH.BlankNode: (BNode,), SH.Literal: (Literal,),
+    SH.BlankNodeOrIRI: (BNode, URIRef), SH.BlankNodeOrLiteral: (BNode, Literal),
+    SH.IRIOrLiteral: (URIRef, Literal),
+}
+
+
+_RDF_TYPE, _RDFS_SUBCLASSOF = RDF.type, RDFS.subClassOf
+_RDFS_LITERAL, _RDFS_DATATYPE, _XSD_STRING, _RDF_LANGSTRING = RDFS.Literal, RDFS.Datatype, XSD.string, RDF.langString
+
+# python types pyshacl expects behind well-formed literals; unlisted datatypes pass
+_PYTHON_TYPES = {
+    XSD.string: (str, bytes), RDF.langString: (str, bytes), XSD.integer: int, XSD.float: float,
+    XSD.decimal: Decimal, XSD.boolean: bool, XSD.date: date, XSD.time: time, XSD.dateTime: datetime,
+}
+
+
+class UnsupportedShape(Exception):
+    """The shapes graph uses SHACL features outside the native subset."""
+
+
+class ShaclParityError(RuntimeError):
+    """Native and pyshacl results differ (parity mode)."""
+
+
+class ShapeResult(NamedTuple):
+    """One ``sh:ValidationResult``."""
+    focus: object
+    path: Optional[URIRef]
+    value: object
+    source_shape: object
+    component: URIRef
+    severity: URIRef
+    message: str
+
+
+class _Shape:
+    __slots__ = ("node", "path", "targets", "messages", "severity", "constraints", "min_count",
+                 "checks", "properties")
+
+    def __init__(self, node):
+        self.node = node
+        self.path = None
+        self.targets = []
+        self.messages = []
+        self.severity = SH.Violation
+        self.constraints = []  # (predicate, parameter) in a fixed order
+        self.min_count = None
+        self.checks = []  # (predicate, test(value, index) -> bool), compiled from constraints
+        self.properties = []
+
+
+class TripleIndex:
+    """Subject -> predicate -> objects table of a data graph, with class membership."""
+
+    def __init__(self, graph):
+        out: Dict[object, Dict[object, list]] = {}
+        for s, p, o in graph:
+            out.setdefault(s, {}).setdefault(p, []).append(o)
+        self.out = out
+        self.instances: Dict[object, list] = {}
+        supers: Dict[object, list] = {}
+        for s, props in out.items():
+            for t in props.get(_RDF_TYPE, ()):
+                self.instances.setdefault(t, []).append(s)
+            for c in props.get(_RDFS_SUBCLASSOF, ()):
+                supers.setdefault(s, []).append(c)
+        self._supers = supers
+        self._closure: Dict[object, frozenset] = {}
+
+    def objects(self, s, p):
+        return self.out.get(s, {}).get(p, ())
+
+    def superclasses(self, cls) -> frozenset:
+        """``cls`` and everything it reaches via rdfs:subClassOf."""
+        found = self._closure.get(cls)
+        if found is None:
+            seen, stack = {cls}, [cls]
+            while stack:
+                for sup in self._supers.get(stack.pop(), ()):
+                    if sup not in seen:
+                        seen.add(sup)
+                        stack.append(sup)
+            found = self._closure[cls] = frozenset(seen)
+        return found
+
+    def has_class(self, node, cls) -> bool:
+        return any(cls in self.superclasses(t) for t in self.objects(node, _RDF_TYPE))
+
+    def instances_of(self, cls) -> list:
+        if not self._supers:
+            return self.instances.get(cls, [])
+        found = {}
+        for t, members in self.instances.items():
+            if cls in self.superclasses(t):
+                found.update(dict.fromkeys(members))
+        return list(found)
+
+
+def _datatype_ok(value, datatype) -> bool:
+    """pyshacl's DatatypeConstraintComponent test for one value node."""
+    if not isinstance(value, Literal):
+        return False
+    if value.datatype == datatype:
+        if getattr(value, "ill_typed", None) is True:
+            return False
+    elif datatype == _RDFS_LITERAL or (datatype == _RDFS_DATATYPE and value.datatype):
+        return True
+    elif not ((value.datatype is None and value.language is None and datatype == _XSD_STRING)
+              or (datatype == _RDF_LANGSTRING and value.language)):
+        return False
+    expected = _PYTHON_TYPES.get(datatype)
+    return expected is None or isinstance(value.value, expected)
+
+
+class NativeShapes:
+    """The shapes of one ShapesValidator, compiled for the native engine."""
+
+    def __init__(self, validator: ShapesValidator):
+        self.validator = validator
+        self.sg = validator.graph
+        self._shapes: Dict[object, _Shape] = {}
+        targeted = set(self.sg.subjects(SH.targetClass, None))
+        self.targeted = [self._compile(node) for node in sorted(targeted, key=str)]
+
+    # --- compilation ----------------------------------------------------------
+
+    def _compile(self, node) -> _Shape:
+        shape = self._shapes.get(node)
+        if shape is not None:
+            return shape
+        shape = self._shapes[node] = _Shape(node)
+        for p, o in sorted(self.sg.predicate_objects(node), key=lambda po: (str(po[0]), str(po[1]))):
+            if p == SH.path:
+                if not isinstance(o, URIRef):
+                    raise UnsupportedShape(f"non-IRI sh:path on {node}")
+                shape.path = o
+            elif p == SH.targetClass:
+                shape.targets.append(o)
+            elif p == SH.message:
+                shape.messages.append(str(o))
+            elif p == SH.severity:
+                shape.severity = o
+            elif p == SH.property:
+                shape.properties.append(self._compile(o))
+            elif p in _CONSTRAINTS:
+                if any(c == p for c, _ in shape.constraints):
+                    raise UnsupportedShape(f"repeated {p} on {node}")
+                if p == _MIN_COUNT:
+                    o = int(o)
+                elif p == _OR:
+                    o = [self._compile(item) for item in self.sg.items(o)]
+                elif p == _NODE:
+                    o = self._compile(o)
+                elif p == _NODE_KIND and o not in _NODE_KINDS:
+                    raise UnsupportedShape(f"sh:nodeKind {o} on {node}")
+                shape.constraints.append((p, o))
+            elif p not in _ANNOTATIONS:
+                raise UnsupportedShape(f"{p} on {node}")
+        for p, param in shape.constraints:
+            if p == _MIN_COUNT:
+                shape.min_count = param
+            else:
+                shape.checks.append((p, self._value_test(p, param)))
+        return shape
+
+    def _value_test(self, p, param):
+        if p == _CLASS:
+            return lambda v, index: not isinstance(v, Literal) and index.has_class(v, param)
+        if p == _DATATYPE:
+            return lambda v, index: _datatype_ok(v, param)
+        if p == _NODE_KIND:
+            kinds = _NODE_KINDS[param]
+            return lambda v, index: isinstance(v, kinds)
+        if p == _OR:
+            return lambda v, index: any(self._conforms(alt, v, index) for alt in param)
+        return lambda v, index: self._conforms(param, v, index)  # sh:node
+
+    # --- evaluation -----------------------------------------------------------
+
+    def _check(self, shape: _Shape, focus, index: TripleIndex, out: list, limit=None) -> None:
+        """Append raw results (shape, predicate, focus, value) for ``focus`` to ``out``."""
+        values = index.objects(focus, shape.path) if shape.path is not None else (focus,)
+        if shape.min_count is not None and len(values) < shape.min_count:
+            out.append((shape, _MIN_COUNT, focus, None))
+        for p, test in shape.checks:
+            for v in values:
+                if not test(v, index):
+                    out.append((shape, p, focus, v))
+            if limit is not None and len(out) >= limit:
+                return
+        for prop in shape.properties:
+            self._check(prop, focus, index, out, limit)
+            if limit is not None and len(out) >= limit:
+                return
+
+    def _conforms(self, shape: _Shape, focus, index: TripleIndex) -> bool:
+        found = []
+        self._check(shape, focus, index, found, limit=1)
+        return not found
+
+    def _message(self, shape: _Shape, p, focus, value, data_graph) -> str:
+        if shape.messages:
+            return "\n".join(sorted(shape.messages))
+        sg = self.sg
+        if p == _MIN_COUNT:
+            minimum = next(sg.objects(shape.node, _MIN_COUNT))
+            where = stringify_node(data_graph, focus)
+            if shape.path is not None:
+                where += "->" + stringify_node(sg, shape.path)
+            return f"Less than {minimum} values on {where}"
+        param = next(sg.objects(shape.node, p))
+        if p == _CLASS:
+            return f"Value does not have class {stringify_node(sg, param)}"
+        if p == _DATATYPE:
+            return f"Value is not Literal with datatype {stringify_node(sg, param)}"
+        if p == _NODE_KIND:
+            return f"Value is not of Node Kind {stringify_node(sg, param)}"
+        if p == _NODE:
+            return f"Value does not conform to Shape {stringify_node(sg, param)}. See details for more information."
+        alternatives = " , ".join(stringify_node(sg, alt) for alt in sg.items(param))
+        return f"Node {stringify_node(data_graph, value)} must conform to one or more shapes in {alternatives}"
+
+    def iter_results(self, data_graph, index: Optional[TripleIndex] = None) -> Iterator[ShapeResult]:
+        """Validation results for ``data_graph``, yielded focus node by focus node as they are found."""
+        index = index or TripleIndex(data_graph)
+        raw = []
+        for shape in self.targeted:
+            focus_nodes = {}
+            for cls in shape.targets:
+                focus_nodes.update(dict.fromkeys(index.instances_of(cls)))
+            for focus in focus_nodes:
+                self._check(shape, focus, index, raw)
+                for found, p, _, value in raw:
+                    yield ShapeResult(focus, found.path, value, found.node, _COMPONENTS[p], found.severity,
+                                      self._message(found, p, focus, value, data_graph))
+                raw.clear()
+
+    def results(self, data_graph, index: Optional[TripleIndex] = None) -> List[ShapeResult]:
+        """Every validation result for ``data_graph``."""
+        return list(self.iter_results(data_graph, index))
+
+    def stream(self, data_graph, fail_fast: bool = False, max_results: Optional[int] = None,
+               closure: bool = True) -> Iterator[ShapeResult]:
+        """
+        Results for ``data_graph`` as they are found, without building a report:
+        stops after the first with ``fail_fast``, or after ``max_results``. With
+        ``closure`` (the default, like ShapesValidator.validate) the ClassClosure
+        types are added first.
+        """
+        if closure:
+            data_graph = self.validator.with_closure(data_graph)
+        limit = 1 if fail_fast else max_results
+        if limit is not None and limit <= 0:
+            return
+        for n, result in enumerate(self.iter_results(data_graph), 1):
+            yield result
+            if n == limit:
+                return
+
+    def validate(self, data_graph, parity: Optional[bool] = None,
+                 closure: bool = True) -> Tuple[bool, List[ShapeResult]]:
+        """
+        ``(conforms, results)``; with parity, cross-check against pyshacl. Like
+        stream(), ``closure`` (the default) adds the ClassClosure types first.
+        """
+        if closure:
+            data_graph = self.validator.with_closure(data_graph)
+        results = self.results(data_graph)
+        if SHACL_PARITY if parity is None else parity:
+            missing, extra = self.parity_diff(data_graph, results)
+            if missing or extra:
+                raise ShaclParityError(
+                    "native SHACL results differ from pyshacl:\n"
+                    + "".join(f"  only pyshacl: {r}\n" for r in missing)
+                    + "".join(f"  only native:  {r}\n" for r in extra))
+        return not results, results
+
+    def parity_diff(self, data_graph, results: Optional[List[ShapeResult]] = None, inference: str = "none"):
+        """
+        ``(only in pyshacl, only native)`` result lists for ``data_graph``.
+
+        With ``inference='rdfs'`` pyshacl also prints inferred triples (``rdf:type
+        rdfs:Resource``) when it formats blank nodes in messages; compare messages
+        against the default ``'none'``.
+        """
+        if results is None:
+            results = self.results(data_graph)
+        _, report_graph, _ = self.validator.validate(data_graph, inference=inference)
+        expected = report_results(report_graph)
+        return _multiset_diff(expected, results), _multiset_diff(results, expected)
+
+
+def report_results(report_graph) -> List[ShapeResult]:
+    """The top-level results of a pyshacl report graph as ShapeResults."""
+    out = []
+    for r in report_graph.objects(None, SH.result):
+        messages = sorted(str(m) for m in report_graph.objects(r, SH.resultMessage))
+        out.append(ShapeResult(
+            report_graph.value(r, SH.focusNode), report_graph.value(r, SH.resultPath),
+            report_graph.value(r, SH.value), report_graph.value(r, SH.sourceShape),
+            report_graph.value(r, SH.sourceConstraintComponent),
+            report_graph.value(r, SH.resultSeverity), "\n".join(messages)))
+    return out
+
+
+def _term_json(node):
+    if node is None:
+        return None
+    if isinstance(node, BNode):
+        return node.n3()
+    return str(node)
+
+
+def result_json(result: ShapeResult) -> dict:
+    """A ShapeResult as a JSON-ready dict: IRIs and literal values as strings, blank nodes as ``_:id``."""
+    return {
+        "focus": _term_json(result.focus),
+        "path": _term_json(result.path),
+        "value": _term_json(result.value),
+        "shape": _term_json(result.source_shape),
+        "component": _term_json(result.component),
+        "severity": _term_json(result.severity),
+        "message": result.message,
+    }
+
+
+def write_jsonl(results: Iterable[ShapeResult], fp, **extra) -> int:
+    """Write one JSON object per result (plus ``extra`` keys) to ``fp`` as it arrives; returns the count."""
+    n = 0
+    for n, result in enumerate(results, 1):
+        fp.write(json.dumps({**extra, **result_json(result)}, ensure_ascii=False) + "\n")
+        fp.flush()
+    return n
+
+
+def _multiset_diff(a: List[ShapeResult], b: List[ShapeResult]) -> List[ShapeResult]:
+    remaining = list(b)
+    missing = []
+    for r in a:
+        if r in remaining:
+            remaining.remove(r)
+        else:
+            missing.append(r)
+    return missing
+
+
+NATIVE_SHAPES = ContextStore(maxsize=16)
+
+
+def native_shapes(base_url: Optional[str] = None) -> NativeShapes:
+    """The process-wide NativeShapes for the shapes_validator(base_url) shapes."""
+    return NATIVE_SHAPES.get(base_url or "", lambda _key: NativeShapes(shapes_validator(base_url)))
@@ -0,0 +1,178 @@
+"""
+Sidecar cache of pipeline output: expanded JSON-LD, N-Quads and graph triples.
+
+Entries are keyed by the sha256 of the crate bytes and grouped under a
+fingerprint of everything else the output depends on (every context document
+reached from the crate's @context, ROCRATE_ONLINE, the base override; see
+``context_fingerprint`` in tests/_jsonld_utils.py):
+
+    <root>/<fingerprint>/<crate sha256>.expanded.json
+    <root>/<fingerprint>/<crate sha256>.nq
+    <root>/<fingerprint>/<crate sha256>.triples.json
+
+A changed context yields a new fingerprint, so stale output is never served;
+``invalidate(keep=...)`` drops other fingerprints eagerly and the size budget
+evicts least-recently-used files. Writes are atomic (temp file + os.replace),
+and unreadable files count as misses.
+
+Everything is stored as plain text (JSON or N-Quads), never pickle, so a
+shared cache directory cannot run code. Triples are JSON term lists; blank
+node labels are scoped to one file and every read mints fresh BNodes, so two
+loads of the same crate into one graph keep their blank nodes apart.
+"""
+import json
+import os
+import pathlib
+import shutil
+import threading
+from typing import Callable, Iterable, Optional
+
+from rdflib import BNode, Literal, URIRef
+
+from tests._context_cache import _atomic_write
+
+# Opt-in: set LP_OUTPUT_CACHE_DIR to reuse conversion output across tools and runs.
+OUTPUT_CACHE_DIR = os.getenv("LP_OUTPUT_CACHE_DIR", "")
+OUTPUT_CACHE_MAX_BYTES = int(os.getenv("LP_OUTPUT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+def _encode_term(term) -> list:
+    if isinstance(term, Literal):
+        return ["l", str(term), term.datatype, term.language]
+    return ["b" if isinstance(term, BNode) else "u", str(term)]
+
+
+def _encode_triples(triples) -> bytes:
+    rows = [[_encode_term(t) for t in triple] for triple in triples]
+    return json.dumps(rows, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_triples(data: bytes) -> list:
+    """Triples from _encode_triples, with a fresh BNode for each blank node label."""
+    bnodes = {}
+
+    def term(t):
+        kind, value = t[0], t[1]
+        if kind == "u":
+            return URIRef(value)
+        if kind == "b":
+            node = bnodes.get(value)
+            if node is None:
+                node = bnodes[value] = BNode()
+            return node
+        if kind == "l":
+            return Literal(value, lang=t[3], datatype=t[2])
+        raise ValueError(f"unknown term kind {kind!r}")
+
+    return [tuple(term(t) for t in row) for row in json.loads(data)]
+
+
+# kind -> (file suffix, encode, decode)
+_KINDS = {
+    "expanded": (".expanded.json",
+                 lambda v: json.dumps(v, separators=(",", ":")).encode("utf-8"), json.loads),
+    "nquads": (".nq", lambda v: v.encode("utf-8"), lambda b: b.decode("utf-8")),
+    "triples": (".triples.json", _encode_triples, _decode_triples),
+}
+
+
+class OutputCache:
+    """Size-bounded on-disk cache of conversion output."""
+
+    def __init__(self, root, max_bytes: int = OUTPUT_CACHE_MAX_BYTES):
+        self.root = pathlib.Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total = None  # bytes on disk, scanned lazily
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, fingerprint: str, crate_hash: str, kind: str) -> pathlib.Path:
+        return self.root / fingerprint / f"{crate_hash}{_KINDS[kind][0]}"
+
+    def get(self, fingerprint: str, crate_hash: str, kind: str):
+        """Return the cached value or None."""
+        path = self._path(fingerprint, crate_hash, kind)
+        try:
+            value = _KINDS[kind][2](path.read_bytes())
+        except (OSError, ValueError, TypeError, IndexError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mtime tracks last use for eviction
+        except OSError:
+            pass  # read-only cache dirs still serve hits
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, fingerprint: str, crate_hash: str, kind: str, value) -> None:
+        data = _KINDS[kind][1](value)
+        _atomic_write(self._path(fingerprint, crate_hash, kind), data)
+        with self._lock:
+            if self._total is not None:
+                self._total += len(data)
+            over = self._total is None or self._total > self.max_bytes
+        if over:
+            self.evict()
+
+    def get_or_compute(self, fingerprint: str, crate_hash: str, kind: str, compute: Callable):
+        value = self.get(fingerprint, crate_hash, kind)
+        if value is None:
+            value = compute()
+            self.put(fingerprint, crate_hash, kind, value)
+        return value
+
+    def _files(self):
+        for path in self.root.glob("*/*"):
+            if not path.name.startswith(".tmp-"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    def evict(self) -> int:
+        """Drop least-recently-used files until the cache fits ``max_bytes``; return count removed."""
+        files = sorted(self._files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        while total > self.max_bytes and files:
+            path, size, _ = files.pop(0)
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        with self._lock:
+            self._total = total
+        return removed
+
+    def invalidate(self, keep: Iterable[str] = ()) -> int:
+        """Remove every fingerprint directory not in ``keep``; return count removed."""
+        keep = set(keep)
+        removed = 0
+        for path in self.root.iterdir():
+            if path.is_dir() and path.name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        with self._lock:
+            self._total = None
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+_DEFAULT_OUTPUT_CACHE = None
+
+
+def default_output_cache() -> Optional[OutputCache]:
+    """Return the cache configured via LP_OUTPUT_CACHE_DIR (one per process), or None if unset."""
+    global _DEFAULT_OUTPUT_CACHE
+    if not OUTPUT_CACHE_DIR:
+        return None
+    if _DEFAULT_OUTPUT_CACHE is None:
+        _DEFAULT_OUTPUT_CACHE = OutputCache(OUTPUT_CACHE_DIR)
+    return _DEFAULT_OUTPUT_CACHE
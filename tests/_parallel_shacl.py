@@ -0,0 +1,205 @@
+"""
+SHACL validation of many crates across a forked process pool.
+
+The parent compiles the shapes (shapes_validator) and warms the active-context
+cache before the pool forks, so every worker starts with both already in memory,
+shared copy-on-write, instead of re-parsing shapes and re-fetching contexts.
+Crates are handed out in chunks and each worker converts (cached_crate_graph)
+and validates (ShapesValidator.validate) a crate at a time, sending back only a
+small, picklable CrateValidation.
+
+    for r in validate_crates(paths, server_base, workers=64):
+        print(r.path, r.conforms, len(r.results))
+
+Results are those of the conformance tests: to_rdf_graph_from_jsonld followed by
+``shapes_validator(base).validate(data_graph)``.
+
+With ``batch=True`` each chunk is validated in one pyshacl pass instead
+(validate_union): the crates' nodes are renamed apart per crate into a single
+union graph, and every ``sh:result`` is attributed back to its crate by its
+focus node. Per-crate results and messages are the same as validating each
+crate alone; only the report text is not produced.
+"""
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from pyshacl.rdfutil import stringify_node
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import RDF, SH
+
+from tests._jsonld_utils import cached_crate_graph, warm_active_contexts
+from tests._native_shacl import ShapeResult, report_results
+from tests._shacl import ShapesValidator, shapes_validator
+
+# IRIs of crate i are renamed to BATCH_PREFIX + "<i>:" + IRI in the union graph
+BATCH_PREFIX = "urn:lp-batch:"
+_BATCH_IRI = re.compile(r"<urn:lp-batch:(\d+):([^>]*)>")
+
+
+class CrateValidation(NamedTuple):
+    """Outcome of validating one crate in a batch: results, or error when it could not be validated."""
+    path: str
+    conforms: bool
+    results: List[ShapeResult]
+    report: Optional[str]
+    error: Optional[str]
+
+
+def _isolated(graph: Graph, i: int, union: Graph, back: dict) -> bool:
+    """
+    Add ``graph`` to ``union`` with its nodes renamed for crate ``i``, recording
+    renamed -> (i, node) in ``back``. Predicates, classes (``rdf:type`` objects)
+    and literals are shared. False, adding nothing, when a class has triples of
+    its own (e.g. rdfs:subClassOf axioms), which sharing would leak across crates.
+    """
+    classes = set(graph.objects(None, RDF.type))
+    if any(True for c in classes if (c, None, None) in graph):
+        return False
+    prefix, suffix = f"{BATCH_PREFIX}{i}:", f"_{i}"
+    renamed = {}
+
+    def rename(node):
+        if isinstance(node, Literal):
+            return node
+        out = renamed.get(node)
+        if out is None:
+            out = renamed[node] = URIRef(prefix + node) if isinstance(node, URIRef) else BNode(node + suffix)
+            back[out] = (i, node)
+        return out
+
+    union.addN((rename(s), p, o if p == RDF.type else rename(o), union) for s, p, o in graph)
+    return True
+
+
+def validate_union(graphs: Sequence[Graph], validator: Optional[ShapesValidator] = None,
+                   **options) -> List[Tuple[bool, List[ShapeResult]]]:
+    """
+    Validate several data graphs in one pass over their union.
+
+    Returns ``(conforms, results)`` per graph, in order, as validating each
+    graph alone would: focus nodes, values and messages refer to the graph's
+    own nodes. Graphs that cannot be renamed apart (see _isolated), or a union
+    pyshacl fails on, are validated alone. ``options`` go to validator.validate.
+    """
+    validator = validator or shapes_validator()
+    union, back, alone = Graph(), {}, []
+    for i, g in enumerate(graphs):
+        if not _isolated(g, i, union, back):
+            alone.append(i)
+
+    out = [None] * len(graphs)
+    conforms, report_graph, _ = validator.validate(union, **options) if len(union) else (True, None, "")
+    if isinstance(report_graph, Exception):  # pyshacl ValidationFailure
+        alone = range(len(graphs))
+    else:
+        isolated = sorted(set(range(len(graphs))) - set(alone))
+        per_graph = {i: [] for i in isolated}
+        for r in report_results(report_graph) if report_graph is not None else ():
+            if r.focus not in back:
+                raise RuntimeError(f"Cannot attribute result on {r.focus} to a crate")
+            i, focus = back[r.focus]
+            value = back[r.value][1] if r.value in back else r.value
+            message = _BATCH_IRI.sub(lambda m: stringify_node(graphs[int(m.group(1))], URIRef(m.group(2))),
+                                     r.message)
+            per_graph[i].append(r._replace(focus=focus, value=value, message=message))
+        for i in isolated:
+            out[i] = (_conforms(per_graph[i], options), per_graph[i])
+    for i in alone:
+        conforms, report_graph, _ = validator.validate(graphs[i], **options)
+        results = [] if isinstance(report_graph, Exception) else report_results(report_graph)
+        out[i] = (bool(conforms), results)
+    return out
+
+
+def _conforms(results: List[ShapeResult], options: dict) -> bool:
+    """pyshacl's conforms for these results: none at all, or no violations with allow_warnings."""
+    if options.get("allow_warnings"):
+        return all(r.severity != SH.Violation for r in results)
+    return not results
+
+
+def _warm_worker(base_override: str, shapes_base: Optional[str]):
+    """Pool initializer; a no-op when the parent's shapes and contexts were inherited via fork."""
+    warm_active_contexts(base_override)
+    shapes_validator(shapes_base)
+
+
+def _validate_path(path, base_override: str, shapes_base: Optional[str]) -> CrateValidation:
+    """Worker: convert and validate one crate file, reporting errors instead of raising."""
+    try:
+        data_graph = cached_crate_graph(path, base_override)
+        conforms, report_graph, report_text = shapes_validator(shapes_base).validate(data_graph)
+    except Exception as e:
+        return CrateValidation(str(path), False, [], None, f"{type(e).__name__}: {e}")
+    if isinstance(report_graph, Exception):  # pyshacl ValidationFailure
+        return CrateValidation(str(path), False, [], None, report_text)
+    return CrateValidation(str(path), bool(conforms), report_results(report_graph), report_text, None)
+
+
+def _validate_chunk(paths, base_override: str, shapes_base: Optional[str],
+                    batch: bool = False) -> List[CrateValidation]:
+    """Worker: validate a chunk of crate files, one by one or (``batch``) as one union graph."""
+    if not batch:
+        return [_validate_path(p, base_override, shapes_base) for p in paths]
+    out, graphs = {}, {}
+    for path in map(str, paths):
+        try:
+            graphs[path] = cached_crate_graph(path, base_override)
+        except Exception as e:
+            out[path] = CrateValidation(path, False, [], None, f"{type(e).__name__}: {e}")
+    try:
+        validated = validate_union(list(graphs.values()), shapes_validator(shapes_base))
+    except Exception:
+        return [out.get(str(p)) or _validate_path(p, base_override, shapes_base) for p in paths]
+    for path, (conforms, results) in zip(graphs, validated):
+        out[path] = CrateValidation(path, conforms, results, None, None)
+    return [out[str(p)] for p in paths]
+
+
+def validate_crates(paths: Iterable, base_override: str, shapes_base: Optional[str] = "",
+                    workers: Optional[int] = None, ordered: bool = True,
+                    chunksize: int = 16, batch: bool = False) -> Iterator[CrateValidation]:
+    """
+    Validate many crate files across a process pool.
+
+    Yields one CrateValidation per path, in input order (``ordered=True``) or
+    chunk by chunk as workers finish. Shapes come from ``shapes_base``
+    (default: the shapes published under ``base_override``; None for the local
+    interface-schemas/). ``workers`` defaults to os.cpu_count(); ``workers=1``
+    validates inline. ``batch=True`` validates each chunk of ``chunksize``
+    crates as one union graph (validate_union), without report text.
+    """
+    paths = [str(p) for p in paths]
+    if not paths:
+        return
+    if shapes_base == "":
+        shapes_base = base_override
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(paths)))
+
+    # loaded here, before the fork, so workers inherit them
+    warm_active_contexts(base_override)
+    shapes_validator(shapes_base)
+
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    if workers == 1:
+        for chunk in chunks:
+            yield from _validate_chunk(chunk, base_override, shapes_base, batch)
+        return
+
+    methods = multiprocessing.get_all_start_methods()
+    mp_context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=_warm_worker, initargs=(base_override, shapes_base)) as pool:
+        if ordered and not batch:
+            n = len(paths)
+            yield from pool.map(_validate_path, paths, [base_override] * n, [shapes_base] * n,
+                                chunksize=chunksize)
+            return
+        futures = [pool.submit(_validate_chunk, chunk, base_override, shapes_base, batch) for chunk in chunks]
+        for fut in (futures if ordered else as_completed(futures)):
+            yield from fut.result()
@@ -0,0 +1,143 @@
+"""
+SPARQL ASK policies (tests/policy/queries/*.rq), parsed once per process.
+
+Each policy is an ASK query that is true when a crate violates it. PolicySet
+runs ``prepareQuery`` on every file once, so checking a graph only evaluates
+the already-parsed algebra:
+
+    failed = [name for name, ok in policy_set().check(graph).items() if not ok]
+
+crate_graph() converts each crate file once per process, so every policy
+(and every test) checks the same graph instead of re-converting the crate:
+
+    for name, result in policy_set().evaluate(crate_graph(path, base)).items():
+        print(name, result.passed, result.seconds)
+
+Policies that fit the pattern class of tests/_native_policy.py (BGPs, UNION,
+FILTER on DATATYPE / STRSTARTS / [NOT] EXISTS) are compiled to index lookups
+and evaluated natively; the rest go through rdflib's SPARQL engine.
+LP_POLICY_NATIVE=0 sends every policy through rdflib.
+
+``evaluate(graph, witnesses=k)`` also returns up to ``k`` solutions of each
+violated policy's pattern, from the same evaluation that decides it: the
+native plan stops after ``k`` solutions, and rdflib runs the ASK rewritten
+on its algebra as ``SELECT * ... LIMIT k`` (as_select). A failing policy
+therefore costs one bounded pass.
+"""
+import os
+import pathlib
+import time
+from itertools import islice
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from rdflib import BNode, Graph
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib.plugins.sparql.sparql import Query
+
+from tests._context_cache import ContextStore
+from tests._jsonld_utils import cached_crate_graph
+from tests._native_policy import UnsupportedQuery, compile_ask
+
+QUERIES_DIR = pathlib.Path(__file__).resolve().parent / "policy" / "queries"
+
+# Evaluate compilable policies with index lookups instead of rdflib's algebra
+POLICY_NATIVE = os.getenv("LP_POLICY_NATIVE", "1") != "0"
+
+
+class PolicyResult(NamedTuple):
+    passed: bool
+    seconds: float
+    native: bool = False
+    witnesses: Tuple[Dict[str, object], ...] = ()  # variable name -> term, per solution
+
+
+def as_select(query: Query, limit: Optional[int] = None) -> Query:
+    """
+    A prepared ASK query as ``SELECT * ... LIMIT limit``, rewritten on its
+    algebra (whatever the query text looks like). rdflib evaluates the
+    pattern lazily under the LIMIT, so it stops after ``limit`` solutions
+    wherever its operators allow (UNION branches are still collected whole).
+    """
+    ask = query.algebra
+    if ask.name != "AskQuery":
+        raise ValueError(f"not an ASK query: {ask.name}")
+    pattern = ask.p  # Project over every in-scope variable
+    if limit is not None:
+        pattern = CompValue("Slice", p=pattern, start=0, length=limit)
+    select = CompValue("SelectQuery", p=pattern, datasetClause=ask.get("datasetClause"), PV=ask.PV)
+    return Query(query.prologue, select)
+
+
+class PolicySet:
+    """Prepared ASK policies keyed by file stem."""
+
+    def __init__(self, paths: Iterable[pathlib.Path], native: Optional[bool] = None):
+        self.paths = {p.stem: p for p in sorted(map(pathlib.Path, paths))}
+        self.queries = {name: prepareQuery(p.read_text(encoding="utf-8")) for name, p in self.paths.items()}
+        self.compiled = {}  # name -> CompiledAsk
+        self._selects: Dict[Tuple[str, int], Query] = {}
+        self.unsupported = {}  # name -> why it stays on rdflib
+        if POLICY_NATIVE if native is None else native:
+            for name, q in self.queries.items():
+                try:
+                    self.compiled[name] = compile_ask(q)
+                except UnsupportedQuery as e:
+                    self.unsupported[name] = str(e)
+
+    @classmethod
+    def from_dir(cls, directory=QUERIES_DIR, native: Optional[bool] = None) -> "PolicySet":
+        return cls(pathlib.Path(directory).glob("*.rq"), native)
+
+    def evaluate(self, graph: Graph, witnesses: int = 0) -> Dict[str, PolicyResult]:
+        """
+        Every policy against ``graph`` in one pass: name -> (passed, seconds,
+        native, witnesses). With ``witnesses=k``, a violated policy carries up
+        to ``k`` of its solutions, found by the same evaluation.
+        """
+        out = {}
+        for name in self.queries:
+            plan = self.compiled.get(name)
+            start = time.perf_counter()
+            found = self._solutions(graph, name, witnesses) if witnesses > 0 else ()
+            violated = bool(found) if witnesses > 0 else (
+                plan.ask(graph) if plan is not None else bool(graph.query(self.queries[name])))
+            out[name] = PolicyResult(not violated, time.perf_counter() - start, plan is not None, found)
+        return out
+
+    def _solutions(self, graph: Graph, name: str, limit: int) -> tuple:
+        plan = self.compiled.get(name)
+        if plan is not None:
+            rows = islice(plan.solutions(graph), limit)
+        else:
+            select = self._selects.get((name, limit))
+            if select is None:
+                select = self._selects[name, limit] = as_select(self.queries[name], limit)
+            rows = (row.asdict() for row in graph.query(select))
+        # blank nodes in a pattern are non-distinguished variables: not part of the witness
+        return tuple({str(var): value for var, value in sorted(row.items())
+                      if not isinstance(var, BNode) and value is not None} for row in rows)
+
+    def check(self, graph: Graph) -> Dict[str, bool]:
+        """Policy name -> passed (its ASK is false) for ``graph``."""
+        return {name: r.passed for name, r in self.evaluate(graph).items()}
+
+
+POLICY_SETS = ContextStore(maxsize=4)
+
+
+def policy_set(directory=QUERIES_DIR) -> PolicySet:
+    """The process-wide PolicySet for ``directory``, prepared on first use."""
+    return POLICY_SETS.get(str(directory), PolicySet.from_dir)
+
+
+CRATE_GRAPHS = ContextStore(maxsize=256)
+
+
+def crate_graph(path, base_override: str) -> Graph:
+    """
+    The RDF graph of crate file ``path``, converted once per process and base.
+    Shared between callers: query it, do not modify it.
+    """
+    key = f"{base_override} {pathlib.Path(path).resolve()}"
+    return CRATE_GRAPHS.get(key, lambda _key: cached_crate_graph(path, base_override))
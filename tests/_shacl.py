@@ -0,0 +1,376 @@
+"""
+Compiled SHACL shapes shared across validate calls.
+
+ShapesValidator loads the DPC and DSC shapes once, merges them into one graph
+and harvests pyshacl's shapes (its ShapesGraph) up front. validate() then runs
+pyshacl's Validator against any number of data graphs without re-fetching,
+re-parsing or re-harvesting the shapes; results are those of
+``pyshacl.validate(data_graph, shacl_graph=<merged shapes>, ...)``.
+
+    validator = shapes_validator(server_base)     # once per process and base
+    conforms, report_graph, report_text = validator.validate(data_graph)
+
+``inference='closure'`` (the default) replaces pyshacl's full RDFS closure of
+every data graph: ClassClosure precomputes, once, which classes the DPC/DSC
+terms (``rdfs:subClassOf``, ``rdfs:subPropertyOf``, ``rdfs:domain``,
+``rdfs:range``) entail for each asserted type and predicate, restricted to the
+classes the shapes look at (``sh:targetClass``, ``sh:class``). Only those
+``rdf:type`` triples are added before validating with ``inference='none'``.
+
+With LP_SHAPES_CACHE_DIR set (or ``cache_dir=...``), the merged shapes graph
+(N-Triples) and the class closure are stored as JSON under the sha256 of the
+shapes sources, so later processes skip the Turtle parse and the closure:
+
+    <cache_dir>/<sha256 of the shapes files>.shapes.json
+
+Nothing in it can run code; the shapes are re-harvested from the stored graph
+on load, and a file whose recorded digest differs is rebuilt.
+
+Reusing the harvest relies on pyshacl internals (ShapesGraph, DataGraph,
+apply_patches, assign_baked_in and Validator.shacl_graph), checked against the
+pinned range in requirements-dev.txt. When a pyshacl release lacks them,
+PYSHACL_INTERNALS is False and validate() falls back to one
+``pyshacl.validate`` call per data graph (same results, no shared harvest).
+"""
+import hashlib
+import logging
+import json
+import os
+import pathlib
+from typing import Dict, Iterable, Optional
+
+import pyshacl
+from pyshacl import Validator
+from pyshacl.errors import ValidationFailure
+from rdflib import Graph, Literal
+from rdflib.util import from_n3
+from rdflib.namespace import OWL, RDF, RDFS, SH
+
+from tests._context_cache import ContextStore, _atomic_write, http_get
+from tests._shacl_profile import profiling
+
+SCHEMAS_ROOT = pathlib.Path(__file__).resolve().parents[1] / "interface-schemas"
+SHAPES_PATHS = ("dpc/shapes.ttl", "dsc/shapes.ttl")
+TERMS_PATHS = ("dpc/terms.ttl", "dsc/terms.ttl")
+SOURCE_PATHS = SHAPES_PATHS + TERMS_PATHS
+
+# Default inference for ShapesValidator.validate: closure, rdfs or none
+SHACL_INFERENCE = os.getenv("LP_SHACL_INFERENCE", "closure")
+
+# Opt-in: persist harvested shapes across processes
+SHAPES_CACHE_DIR = os.getenv("LP_SHAPES_CACHE_DIR", "")
+
+# Validate with only the shapes whose targets can match the crate (LP_SHAPES_SUBSET=0: all shapes)
+SHAPES_SUBSET = os.getenv("LP_SHAPES_SUBSET", "1") != "0"
+
+try:
+    from pyshacl.graph_abstraction import DataGraph
+    from pyshacl.monkey import apply_patches, rdflib_bool_patch, rdflib_bool_unpatch
+    from pyshacl.shapes_graph import ShapesGraph
+    from pyshacl.validator import assign_baked_in
+except ImportError:  # outside the pinned pyshacl range: see PYSHACL_INTERNALS
+    DataGraph = ShapesGraph = None
+
+# Whether this pyshacl exposes what the reused harvest needs (else plain pyshacl.validate)
+PYSHACL_INTERNALS = (ShapesGraph is not None and hasattr(ShapesGraph, "shapes")
+                     and hasattr(DataGraph, "from_rdflib") and hasattr(Validator, "run"))
+
+_OTHER_TARGETS = (SH.targetNode, SH.targetSubjectsOf, SH.targetObjectsOf, SH.target)
+
+_LOG = logging.getLogger(__name__)
+
+
+def shapes_digest(sources: Dict[str, bytes]) -> str:
+    """sha256 over the shapes and terms sources (path -> Turtle bytes), in path order."""
+    h = hashlib.sha256()
+    for name in sorted(sources):
+        h.update(name.encode("utf-8") + b"\0" + hashlib.sha256(sources[name]).digest())
+    return h.hexdigest()
+
+
+def _transitive(edges: Dict[object, set], start) -> set:
+    seen, stack = {start}, [start]
+    while stack:
+        for nxt in edges.get(stack.pop(), ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen
+
+
+class ClassClosure:
+    """
+    The ``rdf:type`` entailments of a terms graph that the shapes can observe.
+
+    ``by_type[T]``, ``by_subject[p]`` and ``by_object[p]`` hold the classes in
+    ``classes`` entailed for an instance of T, a subject of p and an IRI or
+    blank-node object of p. Axioms inside the crate itself are left to
+    pyshacl, which follows the data graph's rdfs:subClassOf for targets and
+    sh:class anyway.
+    """
+
+    def __init__(self, terms: Graph, classes: Iterable):
+        classes = frozenset(classes)
+        sub_class, sub_prop = {}, {}
+        for s, o in terms.subject_objects(RDFS.subClassOf):
+            sub_class.setdefault(s, set()).add(o)
+        for s, o in terms.subject_objects(RDFS.subPropertyOf):
+            sub_prop.setdefault(s, set()).add(o)
+
+        def entailed(cls):
+            return frozenset(_transitive(sub_class, cls) & classes)
+
+        self.by_type = {t: entailed(t) - {t} for t in sub_class}
+        self.by_subject, self.by_object = {}, {}
+        props = set(terms.subjects(RDFS.domain, None)) | set(terms.subjects(RDFS.range, None)) | set(sub_prop)
+        for p in props:
+            for q in _transitive(sub_prop, p):
+                for axiom, table in ((RDFS.domain, self.by_subject), (RDFS.range, self.by_object)):
+                    for cls in terms.objects(q, axiom):
+                        table[p] = table.get(p, frozenset()) | entailed(cls)
+        for table in (self.by_type, self.by_subject, self.by_object):
+            for key in [k for k, v in table.items() if not v]:
+                del table[key]
+
+    def to_json(self) -> dict:
+        """The three tables with every term in N3 form (see from_json)."""
+        return {name: {key.n3(): sorted(c.n3() for c in classes) for key, classes in getattr(self, name).items()}
+                for name in ("by_type", "by_subject", "by_object")}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ClassClosure":
+        closure = cls.__new__(cls)
+        for name in ("by_type", "by_subject", "by_object"):
+            setattr(closure, name, {from_n3(key): frozenset(from_n3(c) for c in classes)
+                                    for key, classes in data[name].items()})
+        return closure
+
+    def derived(self, data_graph: Graph) -> set:
+        """The entailed ``rdf:type`` triples missing from ``data_graph``."""
+        out = set()
+        for t, implied in self.by_type.items():
+            for node in data_graph.subjects(RDF.type, t):
+                out.update((node, RDF.type, c) for c in implied)
+        for p, implied in self.by_subject.items():
+            for node in set(data_graph.subjects(p, None)):
+                out.update((node, RDF.type, c) for c in implied)
+        for p, implied in self.by_object.items():
+            for node in set(data_graph.objects(None, p)):
+                if not isinstance(node, Literal):
+                    out.update((node, RDF.type, c) for c in implied)
+        return {t for t in out if t not in data_graph}
+
+
+def _shape_nodes(shapes_graph: Graph) -> set:
+    """Nodes declared as shapes or carrying targets (the harvest, without pyshacl internals)."""
+    nodes = set(shapes_graph.subjects(RDF.type, SH.NodeShape)) | set(shapes_graph.subjects(RDF.type, SH.PropertyShape))
+    for p in (SH.targetClass,) + _OTHER_TARGETS:
+        nodes.update(shapes_graph.subjects(p, None))
+    return nodes
+
+
+def _parse(sources: Dict[str, bytes], fmt: str):
+    """``(shapes graph, terms graph)`` from ``sources``, with pyshacl's boolean literal patch."""
+    g, terms = Graph(), Graph()
+    if PYSHACL_INTERNALS:
+        rdflib_bool_patch()
+    try:
+        for name in sorted(sources):
+            (terms if name in TERMS_PATHS else g).parse(data=sources[name], format=fmt)
+    finally:
+        if PYSHACL_INTERNALS:
+            rdflib_bool_unpatch()
+    return g, terms
+
+
+class ShapesValidator:
+    """
+    A merged shapes graph with pyshacl's shapes harvested once.
+
+    Shapes are read-only after harvesting, so one instance can validate from
+    several threads at once. ``shapes`` lists the shape nodes.
+    """
+
+    def __init__(self, shapes_graph: Graph, digest: Optional[str] = None,
+                 terms: Optional[Graph] = None, closure: Optional[ClassClosure] = None):
+        self.graph = shapes_graph
+        self.digest = digest
+        if PYSHACL_INTERNALS:
+            apply_patches()
+            assign_baked_in()
+            self._shapes = ShapesGraph(shapes_graph, logger=_LOG)
+            self.shapes = [shape.node for shape in self._shapes.shapes]  # triggers the harvest
+        else:
+            self._shapes = None
+            self.shapes = sorted(_shape_nodes(shapes_graph))
+        if closure is None:
+            classes = set(shapes_graph.objects(None, SH.targetClass)) | set(shapes_graph.objects(None, SH["class"]))
+            closure = ClassClosure(terms if terms is not None else Graph(), classes)
+        self.closure = closure
+        self.targets = self._shape_targets()
+        self._subsets = ContextStore(maxsize=64)
+
+    def _shape_targets(self) -> Dict[object, Optional[frozenset]]:
+        """Shape -> the classes whose instances it targets; None when it has other kinds of targets."""
+        g, targets = self.graph, {}
+        for node in self.shapes:
+            if any((node, p, None) in g for p in _OTHER_TARGETS):
+                targets[node] = None
+                continue
+            classes = set(g.objects(node, SH.targetClass))
+            if (node, RDF.type, RDFS.Class) in g or (node, RDF.type, OWL.Class) in g:
+                classes.add(node)  # implicit class target
+            if classes:
+                targets[node] = frozenset(classes)
+        return targets
+
+    def selected_shapes(self, data_graph: Graph) -> frozenset:
+        """
+        The targeted shapes that can have focus nodes in ``data_graph``: those
+        targeting a type present in it, directly or as a superclass (via the
+        data graph's rdfs:subClassOf, as pyshacl follows them).
+        """
+        types = set(data_graph.objects(None, RDF.type))
+        supers = {}
+        for s, o in data_graph.subject_objects(RDFS.subClassOf):
+            supers.setdefault(s, set()).add(o)
+        if supers:
+            types = set().union(*(_transitive(supers, t) for t in types))
+        return frozenset(node for node, classes in self.targets.items() if classes is None or classes & types)
+
+    def subset(self, selected: frozenset) -> "ShapesValidator":
+        """A ShapesValidator for just the ``selected`` shapes and everything they reference, compiled once."""
+        if len(selected) == len(self.targets):
+            return self
+        key = " ".join(sorted(node.n3() for node in selected))
+        return self._subsets.get(key, lambda _key: self._build_subset(selected))
+
+    def _build_subset(self, selected: frozenset) -> "ShapesValidator":
+        g = Graph()
+        for prefix, namespace in self.graph.namespaces():
+            g.bind(prefix, namespace, override=True, replace=True)
+        seen, stack = set(selected), list(selected)
+        while stack:  # each shape with its property shapes, lists and sh:node/sh:or/... shapes
+            node = stack.pop()
+            for p, o in self.graph.predicate_objects(node):
+                g.add((node, p, o))
+                if p != RDF.type and o not in seen and (o, None, None) in self.graph:
+                    seen.add(o)
+                    stack.append(o)
+        return ShapesValidator(g, self.digest, closure=self.closure)
+
+    @classmethod
+    def from_sources(cls, sources: Dict[str, bytes], cache_dir=None) -> "ShapesValidator":
+        """
+        Build from Turtle sources (path -> bytes; TERMS_PATHS entries feed the
+        class closure), reusing a persisted shapes graph and closure when available.
+        """
+        digest = shapes_digest(sources)
+        cache_dir = SHAPES_CACHE_DIR if cache_dir is None else cache_dir
+        cached = pathlib.Path(cache_dir) / f"{digest}.shapes.json" if cache_dir else None
+        if cached is not None:
+            try:
+                stored = json.loads(cached.read_bytes())
+                if stored.get("digest") != digest:
+                    raise ValueError(f"{cached} holds shapes {stored.get('digest')!r}")
+                g = _parse({"shapes.nt": stored["shapes"].encode("utf-8")}, "nt")[0]
+                closure = ClassClosure.from_json(stored["closure"])
+            except (OSError, ValueError, TypeError, KeyError, AttributeError):
+                pass  # missing, unreadable or for other shapes: rebuild below
+            else:
+                return cls(g, digest, closure=closure)
+
+        g, terms = _parse(sources, "turtle")
+        validator = cls(g, digest, terms=terms)
+        if cached is not None:
+            _atomic_write(cached, json.dumps({
+                "digest": digest,
+                "shapes": g.serialize(format="nt"),
+                "closure": validator.closure.to_json(),
+            }, sort_keys=True).encode("utf-8"))
+        return validator
+
+    @classmethod
+    def from_files(cls, root=SCHEMAS_ROOT, cache_dir=None) -> "ShapesValidator":
+        """Shapes and terms from a local interface-schemas/ checkout."""
+        root = pathlib.Path(root)
+        return cls.from_sources({p: (root / p).read_bytes() for p in SOURCE_PATHS}, cache_dir)
+
+    @classmethod
+    def from_base(cls, base_url: str, session=None, cache_dir=None) -> "ShapesValidator":
+        """Shapes and terms published under ``base_url`` (e.g. the dev server's /interface-schemas)."""
+        sources = {}
+        for p in SOURCE_PATHS:
+            r = http_get(f"{base_url.rstrip('/')}/{p}", session=session, timeout=10)
+            r.raise_for_status()
+            sources[p] = r.content
+        return cls.from_sources(sources, cache_dir)
+
+    def with_closure(self, data_graph: Graph) -> Graph:
+        """``data_graph`` plus its ClassClosure types: a copy, or ``data_graph`` itself when none are missing."""
+        derived = self.closure.derived(data_graph)
+        if not derived:
+            return data_graph
+        copy = Graph()
+        copy += data_graph
+        copy.addN((s, p, o, copy) for s, p, o in derived)
+        return copy
+
+    def validate(self, data_graph: Graph, inference: Optional[str] = None,
+                 serialize_report_graph=False, profile=None, subset: Optional[bool] = None, **options):
+        """
+        Validate ``data_graph`` against the compiled shapes.
+
+        Returns ``(conforms, report_graph, report_text)`` like pyshacl.validate;
+        ``inference`` is ``'closure'``, or any pyshacl inference option (default
+        SHACL_INFERENCE), and ``options`` are pyshacl Validator options
+        (abort_on_first, allow_warnings, ...). ``data_graph`` is not modified.
+        Pass a ShapeProfile (tests/_shacl_profile.py) as ``profile`` to record
+        per-shape and per-constraint timings and node counts into it.
+
+        Without inference (and with ``'closure'``) only the shapes whose targets
+        can match are evaluated (``subset``, default SHAPES_SUBSET); results are
+        the same, since no other shape has focus nodes.
+        """
+        inference = inference or SHACL_INFERENCE
+        if inference == "closure":
+            inference = "none"
+            data_graph = self.with_closure(data_graph)
+        shapes = self
+        if (SHAPES_SUBSET if subset is None else subset) and inference == "none":
+            shapes = self.subset(self.selected_shapes(data_graph))
+        if PYSHACL_INTERNALS:
+            options = dict(options, inference=inference, logger=_LOG)
+            # a throwaway shapes graph keeps pyshacl's setup writes off the shared one
+            validator = Validator(DataGraph.from_rdflib(data_graph), shacl_graph=Graph(), options=options)
+            validator.shacl_graph = shapes._shapes  # swap in the harvested shapes
+            run = validator.run
+        else:
+            # pyshacl.validate copies the data graph before inferring, so it is not modified either
+            def run():
+                return pyshacl.validate(data_graph, shacl_graph=shapes.graph, inference=inference, **options)
+        try:
+            if profile is None:
+                conforms, report_graph, report_text = run()
+            else:
+                with profiling(profile):
+                    conforms, report_graph, report_text = run()
+        except ValidationFailure as e:
+            return False, e, f"Validation Failure - {e.message}"
+        if serialize_report_graph:
+            fmt = serialize_report_graph if isinstance(serialize_report_graph, str) else "turtle"
+            report_graph = report_graph.serialize(None, encoding="utf-8", format=fmt)
+        return conforms, report_graph, report_text
+
+
+SHAPES_VALIDATORS = ContextStore(maxsize=16)
+
+
+def shapes_validator(base_url: Optional[str] = None) -> ShapesValidator:
+    """
+    The process-wide ShapesValidator for shapes under ``base_url`` (local
+    interface-schemas/ when None), built on first use.
+    """
+    if base_url is None:
+        return SHAPES_VALIDATORS.get("", lambda _key: ShapesValidator.from_files())
+    return SHAPES_VALIDATORS.get(base_url, ShapesValidator.from_base)
@@ -0,0 +1,246 @@
+"""
+Per-shape and per-constraint timing of pyshacl validation.
+
+    profile = ShapeProfile()
+    shapes_validator(base).validate(data_graph, profile=profile)   # any number of calls
+    json.dump(profile.report(validator.graph), fh)
+
+Each shape gets its wall time (including shapes it reaches via sh:property,
+sh:node, sh:or, ...), its self time (excluding them), the number of times
+it was evaluated, and its focus and value nodes. Each constraint component
+of a shape gets the same counts. Counts add up across calls.
+
+Recording hooks pyshacl's Shape.validate, Shape.value_nodes and every
+constraint component's evaluate. The hooks are installed while at least one
+``profiling`` block is open (in any thread) and the originals are restored
+when the last one exits, even on error. Meanwhile they are plain
+pass-throughs for threads not profiling, so one thread can profile while
+others validate. These are pyshacl internals (pinned in
+requirements-dev.txt); with a pyshacl that lacks them, ``profiling`` warns
+once and records nothing.
+"""
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict
+
+from pyshacl.rdfutil import stringify_node
+from rdflib import BNode, Graph
+from rdflib.namespace import RDF, SH
+
+try:
+    from pyshacl.constraints import CONSTRAINT_PARAMETERS_MAP
+    from pyshacl.shape import Shape
+except ImportError:  # outside the pinned pyshacl range
+    CONSTRAINT_PARAMETERS_MAP = Shape = None
+
+_LOCAL = threading.local()
+_INSTALL_LOCK = threading.Lock()
+_ACTIVE = 0  # open profiling blocks, across threads
+_ORIGINALS = []  # (owner, attribute, original function) while installed
+_WARNED = False
+
+
+def _counts() -> dict:
+    return {"seconds": 0.0, "calls": 0, "focus_nodes": 0, "value_nodes": 0}
+
+
+class ShapeProfile:
+    """Timings and node counts per shape and per (shape, constraint component)."""
+
+    def __init__(self):
+        self.shapes: Dict[object, dict] = {}
+        self.constraints: Dict[tuple, dict] = {}
+        self.validations = 0
+
+    def _shape(self, node) -> dict:
+        entry = self.shapes.get(node)
+        if entry is None:
+            entry = self.shapes[node] = dict(_counts(), self_seconds=0.0)
+        return entry
+
+    def _constraint(self, node, component) -> dict:
+        key = (node, component)
+        entry = self.constraints.get(key)
+        if entry is None:
+            entry = self.constraints[key] = _counts()
+        return entry
+
+    def report(self, shapes_graph: Graph) -> dict:
+        """JSON-ready report, slowest shapes first; blank-node shapes are named by their parent and path."""
+        labels = {node: shape_label(shapes_graph, node) for node in self.shapes}
+        by_shape: Dict[object, dict] = {}
+        for (node, component), stats in self.constraints.items():
+            by_shape.setdefault(node, {})[_qname(shapes_graph, component)] = _rounded(stats)
+        shapes = {}
+        for node, stats in sorted(self.shapes.items(), key=lambda kv: -kv[1]["seconds"]):
+            constraints = by_shape.get(node, {})
+            label, n = labels[node], 1
+            while label in shapes:
+                n += 1
+                label = f"{labels[node]} #{n}"
+            shapes[label] = dict(_rounded(stats), constraints=dict(
+                sorted(constraints.items(), key=lambda kv: -kv[1]["seconds"])))
+        return {
+            "shapes": shapes,
+            "_meta": {
+                "validations": self.validations,
+                "shapes_evaluated": len(self.shapes),
+                "seconds": round(sum(s["self_seconds"] for s in self.shapes.values()), 6),
+                "note": "seconds include nested shapes; self_seconds exclude them",
+            },
+        }
+
+
+def _rounded(stats: dict) -> dict:
+    return {k: round(v, 6) if isinstance(v, float) else v for k, v in stats.items()}
+
+
+def _qname(graph: Graph, node) -> str:
+    return node.n3(graph.namespace_manager) if not isinstance(node, BNode) else stringify_node(graph, node)
+
+
+def shape_label(shapes_graph: Graph, node) -> str:
+    """
+    A readable name for a shape: ``dpc:Shape`` when named. Blank shapes are
+    named by where they sit: ``<parent> -> schema:path`` for property shapes,
+    ``<parent> -> sh:or[1]`` for list members, ``[sh:targetClass X]`` for
+    targeted ones, and their Turtle otherwise.
+    """
+    if not isinstance(node, BNode):
+        return _qname(shapes_graph, node)
+    path = shapes_graph.value(node, SH.path)
+    parent = shapes_graph.value(None, SH.property, node)
+    if path is not None and parent is not None:
+        return f"{shape_label(shapes_graph, parent)} -> {_qname(shapes_graph, path)}"
+    target = shapes_graph.value(node, SH.targetClass)
+    if target is not None:
+        return f"[sh:targetClass {_qname(shapes_graph, target)}]"
+    cell, index = shapes_graph.value(None, RDF.first, node), 0
+    if cell is not None:
+        while True:
+            previous = shapes_graph.value(None, RDF.rest, cell)
+            if previous is None:
+                break
+            cell, index = previous, index + 1
+        for parent, p in shapes_graph.subject_predicates(cell):
+            return f"{shape_label(shapes_graph, parent)} -> {_qname(shapes_graph, p)}[{index}]"
+    for parent in shapes_graph.subjects(SH.node, node):
+        return f"{shape_label(shapes_graph, parent)} -> sh:node"
+    return stringify_node(shapes_graph, node)
+
+
+@contextmanager
+def profiling(profile: ShapeProfile):
+    """Record the pyshacl validation run by this thread inside the block into ``profile``."""
+    _acquire()
+    try:
+        previous = getattr(_LOCAL, "profile", None), getattr(_LOCAL, "stack", None)
+        _LOCAL.profile, _LOCAL.stack = profile, []
+        try:
+            yield profile
+        finally:
+            profile.validations += 1
+            _LOCAL.profile, _LOCAL.stack = previous
+    finally:
+        _release()
+
+
+def _hook_targets():
+    """(owner, attribute, wrapper factory) for every hook, or None when this pyshacl lacks them."""
+    if Shape is None or not all(hasattr(Shape, name) for name in ("validate", "value_nodes", "node")):
+        return None
+    targets = [(Shape, "validate", _timed_shape), (Shape, "value_nodes", _counted_values)]
+    owners = []
+    for component in set(CONSTRAINT_PARAMETERS_MAP.values()):
+        owner = next((k for k in component.__mro__ if "evaluate" in vars(k)), None)
+        if owner is None:
+            return None
+        if owner not in owners:
+            owners.append(owner)
+    return targets + [(owner, "evaluate", _timed_constraint) for owner in owners]
+
+
+def _acquire() -> None:
+    global _ACTIVE, _WARNED
+    with _INSTALL_LOCK:
+        _ACTIVE += 1
+        if _ACTIVE > 1:
+            return
+        targets = _hook_targets()
+        if targets is None:
+            if not _WARNED:
+                warnings.warn("SHACL profiling needs pyshacl internals this version lacks; recording nothing")
+                _WARNED = True
+            return
+        for owner, name, wrap in targets:
+            original = vars(owner)[name]
+            _ORIGINALS.append((owner, name, original))
+            setattr(owner, name, wrap(original))
+
+
+def _release() -> None:
+    global _ACTIVE
+    with _INSTALL_LOCK:
+        _ACTIVE -= 1
+        if _ACTIVE:
+            return
+        while _ORIGINALS:
+            owner, name, original = _ORIGINALS.pop()
+            setattr(owner, name, original)
+
+
+def _timed_shape(validate):
+    @wraps(validate)
+    def wrapper(shape, *args, **kwargs):
+        profile = getattr(_LOCAL, "profile", None)
+        if profile is None:
+            return validate(shape, *args, **kwargs)
+        stack = _LOCAL.stack
+        stack.append(0.0)  # time spent in nested shapes
+        start = time.perf_counter()
+        try:
+            return validate(shape, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            entry = profile._shape(shape.node)
+            entry["seconds"] += elapsed
+            entry["self_seconds"] += elapsed - nested
+            entry["calls"] += 1
+    return wrapper
+
+
+def _counted_values(value_nodes):
+    @wraps(value_nodes)
+    def wrapper(shape, *args, **kwargs):
+        out = value_nodes(shape, *args, **kwargs)
+        profile = getattr(_LOCAL, "profile", None)
+        if profile is not None:
+            entry = profile._shape(shape.node)
+            entry["focus_nodes"] += len(out)
+            entry["value_nodes"] += sum(len(v) for v in out.values())
+        return out
+    return wrapper
+
+
+def _timed_constraint(evaluate):
+    @wraps(evaluate)
+    def wrapper(component, executor, target_graph, focus_value_nodes, *args, **kwargs):
+        profile = getattr(_LOCAL, "profile", None)
+        if profile is None:
+            return evaluate(component, executor, target_graph, focus_value_nodes, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return evaluate(component, executor, target_graph, focus_value_nodes, *args, **kwargs)
+        finally:
+            entry = profile._constraint(component.shape.node, component.shacl_constraint_component)
+            entry["seconds"] += time.perf_counter() - start
+            entry["calls"] += 1
+            entry["focus_nodes"] += len(focus_value_nodes)
+            entry["value_nodes"] += sum(len(v) for v in focus_value_nodes.values())
+    return wrapper
@@ -0,0 +1,277 @@
+"""
+Long-running validation service: POST a crate, get SHACL and policy results.
+
+ValidationService warms everything a validation needs in the parent process
+(active contexts, the compiled native shapes, the prepared policy queries),
+then forks a process pool that inherits it. Requests beyond ``workers +
+queue_size`` in flight are refused with 429 instead of queueing without bound.
+A request stays in flight until its worker finishes, even after a 504, and
+bodies are size-checked from Content-Length before they are read.
+
+    POST /validate[?fail_fast=1&max_results=N&policies=0]   body: crate JSON
+        200 {"conforms", "shacl": {"conforms", "results": [...]}, "policies": {name: passed},
+             "timing_ms": {"convert", "shacl", "policies", "total"}}
+        400 body is not JSON or bad Content-Length; 413 body over max_body bytes;
+        422 crate could not be converted; 429 queue full; 504 timed out
+    GET /stats      request counters and latency percentiles (ms)
+    GET /healthz    "ok"
+
+SHACL results are those of tools/validate_jsonl.py (native engine with the
+class closure), one result_json object per result. serve_validate.py runs it.
+"""
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from tests._jsonld_utils import load_json_file, to_rdf_graph_from_jsonld, warm_active_contexts
+from tests._native_shacl import native_shapes, result_json
+from tests._policy import policy_set
+
+SERVICE_WORKERS = int(os.getenv("LP_SERVICE_WORKERS", str(min(4, os.cpu_count() or 1))))
+SERVICE_QUEUE_SIZE = int(os.getenv("LP_SERVICE_QUEUE_SIZE", "32"))
+SERVICE_TIMEOUT = float(os.getenv("LP_SERVICE_TIMEOUT", "30"))
+SERVICE_MAX_BODY = int(os.getenv("LP_SERVICE_MAX_BODY", str(16 * 1024 * 1024)))
+
+# worker-process state, set before the fork (or by _init_worker)
+_STATE: Dict[str, object] = {}
+
+
+class CrateError(Exception):
+    """The posted document could not be converted to RDF."""
+
+
+def _init_worker(base_override: str, shapes_base: Optional[str]):
+    """Pool initializer; only does work when the parent's state was not inherited via fork."""
+    warm_active_contexts(base_override)
+    _STATE.update(base=base_override, native=native_shapes(shapes_base), policies=policy_set())
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def check_crate(doc, fail_fast: bool = False, max_results: Optional[int] = None,
+                policies: bool = True) -> dict:
+    """Worker: convert ``doc`` and return its SHACL results and policy verdicts as JSON-ready data."""
+    start = time.perf_counter()
+    try:
+        graph = to_rdf_graph_from_jsonld(doc, _STATE["base"])
+    except Exception as e:
+        raise CrateError(f"{type(e).__name__}: {e}") from None
+    converted = time.perf_counter()
+    results = [result_json(r) for r in _STATE["native"].stream(graph, fail_fast, max_results)]
+    validated = time.perf_counter()
+    verdicts = _STATE["policies"].check(graph) if policies else {}
+    done = time.perf_counter()
+    return {
+        "conforms": not results and all(verdicts.values()),
+        "shacl": {"conforms": not results, "results": results},
+        "policies": verdicts,
+        "timing_ms": {"convert": _ms(converted - start), "shacl": _ms(validated - converted),
+                      "policies": _ms(done - validated)},
+    }
+
+
+class LatencyStats:
+    """Count, mean, max and recent-window percentiles of one latency, in milliseconds."""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=window)
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self._recent.append(ms)
+
+    def summary(self) -> dict:
+        recent = sorted(self._recent)
+
+        def pct(q):
+            return round(recent[min(len(recent) - 1, int(q * len(recent)))], 3) if recent else None
+
+        return {"count": self.count, "mean": round(self.total / self.count, 3) if self.count else None,
+                "p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "max": round(self.max, 3)}
+
+
+class ValidationService:
+    """A warm worker pool with bounded admission and request/latency counters."""
+
+    def __init__(self, base_override: str, shapes_base: Optional[str] = None,
+                 workers: int = SERVICE_WORKERS, queue_size: int = SERVICE_QUEUE_SIZE,
+                 timeout: float = SERVICE_TIMEOUT, max_body: int = SERVICE_MAX_BODY, warmup: Iterable = ()):
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_size)
+        self.timeout = timeout
+        self.max_body = max_body
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "ok": 0, "rejected": 0, "bad_request": 0, "too_large": 0,
+                         "unprocessable": 0, "errors": 0, "in_flight": 0}
+        self.latency = {k: LatencyStats() for k in ("total", "convert", "shacl", "policies")}
+
+        # warm in this process, then fork: workers share it copy-on-write. Checking
+        # a few crates (``warmup`` paths) also loads the contexts they reference.
+        _init_worker(base_override, shapes_base)
+        for path in warmup:
+            check_crate(load_json_file(path))
+        methods = multiprocessing.get_all_start_methods()
+        mp_context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp_context,
+                                         initializer=_init_worker, initargs=(base_override, shapes_base))
+        # start every worker now, before any server threads exist
+        for fut in [self._pool.submit(time.sleep, 0.05) for _ in range(self.workers)]:
+            fut.result()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _count(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self.counters[key] += delta
+
+    def _releaser(self):
+        """A callable that ends one in-flight request (counter and slot) the first time it is called."""
+        released = []
+
+        def release(_future=None):
+            with self._lock:
+                if released:
+                    return
+                released.append(True)
+                self.counters["in_flight"] -= 1
+            self._slots.release()
+        return release
+
+    def submit(self, doc, **options):
+        """
+        Check ``doc`` in the pool: ``(status, body)``. Returns 429 at once when
+        ``workers + queue_size`` requests are already in flight. A request
+        counts as in flight, and holds its slot, until its worker is done: a
+        timed-out check that is still running keeps occupying the pool.
+        """
+        self._count("requests")
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            return 429, {"error": "validation queue is full", "capacity": self.capacity}
+        self._count("in_flight")
+        release = self._releaser()
+        start = time.perf_counter()
+        future = None
+        try:
+            future = self._pool.submit(check_crate, doc, **options)
+            future.add_done_callback(release)
+            body = future.result(timeout=self.timeout)
+        except CrateError as e:
+            self._count("unprocessable")
+            return 422, {"error": str(e)}
+        except FutureTimeout:
+            future.cancel()  # only succeeds while still queued; a running check releases when it ends
+            self._count("errors")
+            return 504, {"error": f"validation took longer than {self.timeout}s"}
+        except Exception as e:
+            self._count("errors")
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            if future is None or future.done():
+                release()  # done callbacks may run just after result() returns
+        total = _ms(time.perf_counter() - start)
+        body["timing_ms"]["total"] = total
+        with self._lock:
+            self.counters["ok"] += 1
+            self.latency["total"].add(total)
+            for phase in ("convert", "shacl", "policies"):
+                self.latency[phase].add(body["timing_ms"][phase])
+        return 200, body
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counters, "workers": self.workers, "capacity": self.capacity,
+                    "latency_ms": {k: v.summary() for k, v in self.latency.items()}}
+
+
+def _flag(query: dict, name: str, default: bool) -> bool:
+    value = query.get(name, [None])[-1]
+    return default if value is None else value.lower() not in ("0", "false", "no", "")
+
+
+def make_handler(service: ValidationService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body, content_type="application/json", close=False):
+            data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            if close:  # the request body was left unread
+                self.send_header("Connection", "close")
+                self.close_connection = True
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            if path == "/stats":
+                self._send(200, service.stats())
+            elif path == "/healthz":
+                self._send(200, "ok", "text/plain")
+            else:
+                self._send(404, {"error": f"no such endpoint: {path}"})
+
+        def _reject(self, counter: str, status: int, error: str):
+            service._count("requests")
+            service._count(counter)
+            self._send(status, {"error": error}, close=True)
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            length = (self.headers.get("Content-Length") or "0").strip()
+            if not (length.isascii() and length.isdigit()):
+                self._reject("bad_request", 400, f"invalid Content-Length: {length!r}")
+                return
+            if int(length) > service.max_body:
+                self._reject("too_large", 413, f"body of {int(length)} bytes exceeds {service.max_body}")
+                return
+            raw = self.rfile.read(int(length))
+            if url.path != "/validate":
+                self._send(404, {"error": f"no such endpoint: {url.path}"})
+                return
+            query = parse_qs(url.query)
+            try:
+                doc = json.loads(raw)
+                max_results = query.get("max_results", [None])[-1]
+                options = {"fail_fast": _flag(query, "fail_fast", False),
+                           "max_results": int(max_results) if max_results else None,
+                           "policies": _flag(query, "policies", True)}
+            except ValueError as e:
+                service._count("requests")
+                service._count("bad_request")
+                self._send(400, {"error": f"{type(e).__name__}: {e}"})
+                return
+            self._send(*service.submit(doc, **options))
+
+        def log_message(self, fmt, *args):
+            pass  # per-request logs would dominate at tens of requests per second
+
+    return Handler
+
+
+def make_server(service: ValidationService, host: str = "127.0.0.1", port: int = 8090) -> ThreadingHTTPServer:
+    """An HTTP server for ``service``; call serve_forever() (or run it in a thread)."""
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    return server
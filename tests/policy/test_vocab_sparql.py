@@ -2,74 +2,51 @@
 SPARQL policy checks for valid crates.
 
 Runs ASK queries from tests/policy/queries/ against each valid crate graph.
-Tests are parametrized NxM (each query × each valid file).
+Tests are parametrized NxM (each query × each valid file), but each crate is
+converted once and all prepared policies are evaluated against it in one pass
+(tests/_policy.py); every test then reads its policy's verdict.
 Provides clear failure messages with offending triples.
 """
 
+import json
 import pathlib
-from typing import List
+from typing import Dict, List
 
 import pytest
-import rdflib as rdf
-import json
-
-from tests._jsonld_utils import to_rdf_graph_from_jsonld
 
+from tests._context_cache import ContextStore
+from tests._example_loader import list_valid_examples
+from tests._policy import PolicyResult, crate_graph, policy_set
 
-QUERIES_DIR = pathlib.Path(__file__).parent / "queries"
+ARTIFACT_DIR = pathlib.Path(".artifacts")
+TIMING_PATH = ARTIFACT_DIR / "policy_timing.json"
 
+# Solutions shown per failing policy
+EVIDENCE_LIMIT = 3
 
-def _load_graph(path: pathlib.Path, base_override: str) -> rdf.Graph:
-    """Load a JSON-LD crate and convert to rdflib Graph."""
-    with open(path, "r", encoding="utf-8") as fh:
-        doc = json.load(fh)
-    return to_rdf_graph_from_jsonld(doc, base_override)
+# crate -> policy verdicts (with evidence), one evaluation pass per crate and base
+_EVALUATIONS = ContextStore(maxsize=256)
 
 
-def _load_query(query_path: pathlib.Path) -> str:
-    """Load SPARQL query from file."""
-    return query_path.read_text(encoding="utf-8")
+def _evaluate(path: pathlib.Path, base_override: str) -> Dict[str, PolicyResult]:
+    """All policies against the crate at ``path``, evaluated on first use."""
+    key = f"{base_override} {pathlib.Path(path).resolve()}"
+    return _EVALUATIONS.get(key, lambda _key: policy_set().evaluate(crate_graph(path, base_override),
+                                                                      witnesses=EVIDENCE_LIMIT))
 
 
-def _find_evidence(g: rdf.Graph, query_path: pathlib.Path, limit: int = 3) -> List[str]:
+def _format_evidence(result: PolicyResult) -> List[str]:
     """
-    Find evidence triples for a failing ASK query.
-    
-    Converts ASK to SELECT by extracting WHERE clause and limiting results.
+    One ``var=value ...`` line per witness of a failing policy. The witnesses
+    come from the evaluation that found the violation (PolicySet.evaluate).
     """
-    query_text = _load_query(query_path)
-    
-    # Simple heuristic: convert ASK to SELECT by replacing ASK with SELECT *
-    if "ASK WHERE" in query_text:
-        select_query = query_text.replace("ASK WHERE", "SELECT * WHERE", 1)
-        select_query = select_query.replace("ASK", "SELECT *", 1)
-    else:
-        # Fallback: just return generic message
-        return ["(evidence extraction not available for this query pattern)"]
-    
-    try:
-        results = g.query(select_query)
-        evidence = []
-        for i, row in enumerate(results):
-            if i >= limit:
-                break
-            # Format the binding
-            parts = []
-            for var in results.vars:
-                val = row[var]
-                if val:
-                    parts.append(f"{var}={val}")
-            evidence.append(" ".join(parts))
-        return evidence or ["(no specific evidence captured)"]
-    except Exception as e:
-        return [f"(evidence extraction failed: {e})"]
+    return [" ".join(f"{var}={value}" for var, value in row.items()) for row in result.witnesses] \
+        or ["(no specific evidence captured)"]
 
 
 def _discover_queries() -> List[pathlib.Path]:
     """Discover all .rq files in queries directory."""
-    if not QUERIES_DIR.exists():
-        return []
-    return sorted(QUERIES_DIR.glob("*.rq"))
+    return sorted(policy_set().paths.values())
 
 
 # Discover all queries
@@ -79,27 +56,21 @@ QUERY_PATHS = _discover_queries()
 @pytest.mark.parametrize("query_path", QUERY_PATHS, ids=lambda p: p.stem)
 def test_sparql_policy_per_file(server_base, valid_crate_path, query_path):
     """
-    Run a SPARQL ASK policy query against a valid crate.
+    Check one SPARQL ASK policy against a valid crate.
     
     Parametrized NxM over all queries × all valid crates.
     Fails if ASK returns true (indicating policy violation).
     Shows offending triples in the error message.
     """
-    query_text = _load_query(query_path)
-    
     try:
-        g = _load_graph(valid_crate_path, server_base)
+        results = _evaluate(valid_crate_path, server_base)
     except Exception as e:
         pytest.skip(f"Could not load {valid_crate_path}: {e}")
         return
     
-    # Run ASK query
-    result = g.query(query_text)
-    
-    # ASK queries return a boolean result
-    if bool(result):
+    if not results[query_path.stem].passed:
         # Policy violation detected
-        evidence = _find_evidence(g, query_path)
+        evidence = _format_evidence(results[query_path.stem])
         cwd = pathlib.Path.cwd()
         try:
             rel_path = str(valid_crate_path.relative_to(cwd))
@@ -107,7 +78,26 @@ def test_sparql_policy_per_file(server_base, valid_crate_path, query_path):
             rel_path = str(valid_crate_path)
         
         msg_parts = [f"\n[SPARQL POLICY] {query_path.stem} failed for {rel_path}:"]
-        for ev in evidence[:3]:  # Show first 3 evidence items
+        for ev in evidence:
             msg_parts.append(f"\n  {ev}")
         
         pytest.fail("".join(msg_parts))
+
+
+def test_policy_timing_report(server_base):
+    """Write per-crate, per-policy pass/fail and timing to .artifacts/policy_timing.json (non-failing)."""
+    report = {}
+    for path in map(pathlib.Path, list_valid_examples()):
+        results = _evaluate(path, server_base)
+        report[path.name] = {name: {"passed": r.passed, "ms": round(r.seconds * 1000, 3),
+                                    "engine": "native" if r.native else "rdflib"}
+                             for name, r in results.items()}
+    ARTIFACT_DIR.mkdir(exist_ok=True)
+    with open(TIMING_PATH, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+
+    print("\n=== SPARQL Policy Timing ===")
+    for name in policy_set().queries:
+        total = sum(crate[name]["ms"] for crate in report.values())
+        print(f"[POLICY] {total:8.2f} ms  {name}")
+    print(f"\n[POLICY] Artifact written to: {TIMING_PATH.absolute()}")
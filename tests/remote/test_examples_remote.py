@@ -3,9 +3,8 @@ import json
 import os
 import pytest
 import sys
-from rdflib import Graph
-from pyshacl import validate
 from _jsonld_utils import expand_with_override, to_rdf_graph_from_jsonld
+from _shacl import shapes_validator
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from _example_loader import list_valid_examples
@@ -33,10 +32,17 @@ def test_remote_examples_conform_to_shacl(path):
         doc = json.load(f)
     g = to_rdf_graph_from_jsonld(doc, base_override=BASE_URL)
 
-    # Load shapes from remote
-    dpc_shapes = Graph().parse(f"{BASE_URL}/dpc/shapes.ttl", format="turtle")
-    dsc_shapes = Graph().parse(f"{BASE_URL}/dsc/shapes.ttl", format="turtle")
+    # Remote DPC + DSC shapes and terms, fetched and compiled once per session
+    conforms, _, report = shapes_validator(BASE_URL).validate(g)
+    assert conforms, f"SHACL failed for {path}\n{report}"
 
-    conforms1, _, rep1 = validate(g, shacl_graph=dpc_shapes, inference='rdfs', debug=False)
-    conforms2, _, rep2 = validate(g, shacl_graph=dsc_shapes, inference='rdfs', debug=False)
-    assert conforms1 and conforms2, f"SHACL failed for {path}\nDPC:\n{rep1}\nDSC:\n{rep2}"
+
+def test_remote_examples_validate_async():
+    """The asyncio sweep validates every example against remote contexts and shapes."""
+    import asyncio
+    from _async_pipeline import validate_crates_async
+
+    paths = [str(p) for p in list_valid_examples()]
+    results = asyncio.run(validate_crates_async(paths, BASE_URL))
+    failures = [r for r in results if r.error or not r.conforms]
+    assert not failures, "\n".join(f"{r.source}: {r.error or r.report}" for r in failures)
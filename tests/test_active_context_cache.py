@@ -0,0 +1,64 @@
+"""Processed (active) context cache used by expand_with_override / to_rdf_graph_from_jsonld."""
+import json
+
+import pytest
+from pyld import jsonld
+
+from tests._example_loader import list_all_examples
+from tests._jsonld_utils import (
+    ACTIVE_CONTEXTS,
+    CRATE_CONTEXT,
+    expand_with_override,
+    get_active_context,
+    make_requests_loader,
+    warm_active_contexts,
+)
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_cached_expansion_matches_pyld(server_base, path):
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    reference = jsonld.expand(doc, options={"documentLoader": make_requests_loader(server_base)})
+    assert expand_with_override(doc, server_base) == reference
+
+
+def test_active_context_processed_once(server_base):
+    warm_active_contexts(server_base)
+    before = ACTIVE_CONTEXTS.stats()
+    ctx1 = get_active_context(CRATE_CONTEXT, server_base)
+    ctx2 = get_active_context(list(CRATE_CONTEXT), server_base, "")
+    after = ACTIVE_CONTEXTS.stats()
+    assert ctx1 is ctx2
+    assert after["fetches"] == before["fetches"]
+    assert after["hits"] == before["hits"] + 2
+
+
+def test_active_context_keyed_by_base(server_base):
+    get_active_context(CRATE_CONTEXT, server_base, "")
+    before = ACTIVE_CONTEXTS.stats()["fetches"]
+    get_active_context(CRATE_CONTEXT, server_base, "https://example.org/other-base/")
+    assert ACTIVE_CONTEXTS.stats()["fetches"] == before + 1
+
+
+def test_active_context_keyed_by_loader(server_base):
+    """A caller's loader never gets an active context built from another loader's documents."""
+    warm_active_contexts(server_base)
+    real = make_requests_loader(server_base)
+
+    def edited(url, options=None):
+        remote = real(url, options)
+        if url.endswith("lp-dscdpc/v1.jsonld"):
+            remote = dict(remote, document={"@context": dict(remote["document"]["@context"],
+                                                             extraTerm="https://example.org/extraTerm")})
+        return remote
+
+    default = get_active_context(CRATE_CONTEXT, server_base)
+    own = get_active_context(CRATE_CONTEXT, server_base, loader=edited)
+    assert "extraTerm" in own["mappings"] and "extraTerm" not in default["mappings"]
+    assert get_active_context(CRATE_CONTEXT, server_base, loader=edited) is own  # cached per loader
+    assert get_active_context(CRATE_CONTEXT, server_base) is default
+
+    doc = {"@context": CRATE_CONTEXT, "@id": "https://example.org/x", "extraTerm": "y"}
+    assert "https://example.org/extraTerm" in json.dumps(expand_with_override(doc, server_base, loader=edited))
+    assert "https://example.org/extraTerm" not in json.dumps(expand_with_override(doc, server_base))
@@ -0,0 +1,63 @@
+"""Asyncio loader and validation pipeline (tests/_async_pipeline.py)."""
+import asyncio
+
+import pytest
+from rdflib.compare import isomorphic
+
+from tests._async_pipeline import AsyncDocumentLoader, to_rdf_graph_async, validate_crates_async
+from tests._example_loader import list_valid_examples
+from tests._jsonld_utils import CRATE_CONTEXT, load_json_file, to_rdf_graph_from_jsonld
+
+
+def test_loader_fetches_each_url_once(server_base):
+    async def run():
+        async with AsyncDocumentLoader(server_base, concurrency=2) as loader:
+            urls = [f"{server_base}/dpc/contexts/v1.jsonld"] * 5 + [f"{server_base}/dsc/contexts/v1.jsonld"]
+            docs = await asyncio.gather(*(loader.load(u) for u in urls))
+            return docs, loader.documents
+
+    docs, fetched = asyncio.run(run())
+    assert all("@context" in d["document"] for d in docs)
+    assert len(fetched) == 2
+
+
+def test_loader_blocks_external_urls(server_base):
+    async def run():
+        async with AsyncDocumentLoader(server_base) as loader:
+            await loader.load("https://not-allowed.example/context.jsonld")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+
+
+def test_prefetch_follows_crate_context(server_base):
+    async def run():
+        async with AsyncDocumentLoader(server_base) as loader:
+            return await loader.prefetch(CRATE_CONTEXT), loader
+
+    seen, loader = asyncio.run(run())
+    assert set(CRATE_CONTEXT) <= set(seen)
+    # the sync interface now answers without the event loop
+    assert "@context" in loader(CRATE_CONTEXT[-1])["document"]
+
+
+def test_async_graph_matches_sync(server_base):
+    path = list_valid_examples()[0]
+
+    async def run():
+        async with AsyncDocumentLoader(server_base) as loader:
+            return await to_rdf_graph_async(load_json_file(path), server_base, loader)
+
+    g = asyncio.run(run())
+    assert isomorphic(g, to_rdf_graph_from_jsonld(load_json_file(path), server_base))
+
+
+def test_validate_crates_async(server_base):
+    paths = [str(p) for p in list_valid_examples()]
+    missing = f"{server_base}/no-such-crate.json"
+    results = asyncio.run(validate_crates_async(paths + [missing], server_base, concurrency=4))
+
+    assert [r.source for r in results] == paths + [missing]
+    for r in results[:-1]:
+        assert r.error is None and r.conforms, r.report or r.error
+    assert results[-1].error and "404" in results[-1].error
@@ -0,0 +1,35 @@
+"""Batch conversion of many crates across a process pool (to_rdf_graphs)."""
+import json
+
+from rdflib.compare import isomorphic
+
+from tests._example_loader import list_all_examples
+from tests._jsonld_utils import to_rdf_graph_from_jsonld, to_rdf_graphs
+
+
+def test_batch_matches_sequential_in_input_order(server_base):
+    paths = list_all_examples()
+    results = list(to_rdf_graphs(paths, server_base, workers=2))
+    assert [r.path for r in results] == paths
+    for r in results:
+        assert r.error is None, r.error
+        with open(r.path, "r", encoding="utf-8") as f:
+            expected = to_rdf_graph_from_jsonld(json.load(f), server_base)
+        assert isomorphic(r.graph, expected), f"Batch graph differs for {r.path}"
+
+
+def test_batch_reports_errors_per_file(server_base, tmp_path):
+    bad = tmp_path / "broken.json"
+    bad.write_text("{not json")
+    paths = [bad] + list_all_examples()
+    results = list(to_rdf_graphs(paths, server_base, workers=2, ordered=False))
+    assert sorted(r.path for r in results) == sorted(str(p) for p in paths)
+    errors = {r.path: r.error for r in results if r.error}
+    assert list(errors) == [str(bad)]
+    assert errors[str(bad)].startswith("JSONDecodeError")
+
+
+def test_inline_mode(server_base):
+    paths = list_all_examples()[:1]
+    (result,) = to_rdf_graphs(paths, server_base, workers=1)
+    assert result.error is None and len(result.graph) > 0
@@ -0,0 +1,81 @@
+"""URDNA2015 canonicalization and crate content hashing (tests/_canonical.py)."""
+import json
+import random
+
+import pytest
+from pyld import jsonld
+from rdflib import BNode, Graph, Literal, URIRef
+
+from tests._canonical import CRATE_HASHES, canonical_nquads, crate_hash, graph_hash, to_pyld_quads
+from tests._example_loader import list_all_examples
+from tests._jsonld_utils import load_json_file, to_rdf_graph_from_jsonld
+
+
+def _pyld_urdna2015(g) -> str:
+    return jsonld.URDNA2015().main({"@default": to_pyld_quads(g)}, {"format": "application/n-quads"})
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_matches_pyld_urdna2015(server_base, path):
+    g = to_rdf_graph_from_jsonld(load_json_file(path), server_base)
+    assert canonical_nquads(g) == _pyld_urdna2015(g)
+
+
+def _shuffled(doc, seed):
+    """Same crate with reordered keys and entities."""
+    rng = random.Random(seed)
+
+    def walk(v):
+        if isinstance(v, dict):
+            items = list(v.items())
+            rng.shuffle(items)
+            return {k: walk(x) for k, x in items}
+        if isinstance(v, list):
+            return [walk(x) for x in v]
+        return v
+
+    out = walk(doc)
+    rng.shuffle(out["@graph"])
+    return out
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_hash_ignores_key_order_and_blank_node_labels(server_base, path):
+    doc = load_json_file(path)
+    h1 = graph_hash(to_rdf_graph_from_jsonld(doc, server_base))
+    h2 = graph_hash(to_rdf_graph_from_jsonld(_shuffled(doc, 1), server_base, fast=False))
+    assert h1 == h2
+
+
+def test_hash_detects_changes(server_base):
+    doc = load_json_file(list_all_examples()[0])
+    changed = json.loads(json.dumps(doc))
+    changed["@graph"][0]["name"] = "something else"
+    assert graph_hash(to_rdf_graph_from_jsonld(doc, server_base)) != \
+        graph_hash(to_rdf_graph_from_jsonld(changed, server_base))
+
+
+def test_symmetric_blank_nodes():
+    ex = "http://example.org/"
+    p, name = URIRef(ex + "p"), URIRef(ex + "name")
+    g = Graph()
+    # identical leaves under one parent (shortcut) ...
+    for _ in range(3):
+        b = BNode()
+        g.add((URIRef(ex + "s"), p, b))
+        g.add((b, name, Literal("cores")))
+    # ... and a blank node cycle that needs N-degree hashing
+    a, b = BNode(), BNode()
+    g.add((a, p, b))
+    g.add((b, p, a))
+    assert canonical_nquads(g) == _pyld_urdna2015(g)
+
+
+def test_crate_hash_is_memoized(server_base):
+    path = list_all_examples()[0]
+    CRATE_HASHES.clear()
+    h = crate_hash(path, server_base)
+    assert crate_hash(path, server_base) == h
+    assert crate_hash(load_json_file(path), server_base) == h
+    stats = CRATE_HASHES.stats()
+    assert stats["misses"] == 2 and stats["hits"] == 1
@@ -5,18 +5,8 @@ Tests are automatically parametrized over all files in tests/crates/valid/.
 Adding or removing files changes the test set automatically.
 """
 
-import json
-from pyshacl import validate
-from rdflib import Graph
-from tests._jsonld_utils import to_rdf_graph_from_jsonld
-
-
-def _load_shapes_graph(server_base: str) -> Graph:
-    """Load both DPC and DSC SHACL shapes into a single graph."""
-    g = Graph()
-    g.parse(f"{server_base}/dpc/shapes.ttl", format="turtle")
-    g.parse(f"{server_base}/dsc/shapes.ttl", format="turtle")
-    return g
+from tests._jsonld_utils import cached_crate_graph
+from tests._shacl import shapes_validator
 
 
 def test_valid_crate_conforms(server_base, valid_crate_path):
@@ -25,16 +15,11 @@ def test_valid_crate_conforms(server_base, valid_crate_path):
     
     Parametrized over all files in tests/crates/valid/ via conftest.py.
     """
-    with open(valid_crate_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    data_graph = to_rdf_graph_from_jsonld(data, base_override=server_base)
-    shapes_graph = _load_shapes_graph(server_base)
+    data_graph = cached_crate_graph(valid_crate_path, base_override=server_base)
     
-    conforms, report_graph, report_text = validate(
+    conforms, report_graph, report_text = shapes_validator(server_base).validate(
         data_graph,
-        shacl_graph=shapes_graph,
-        inference='rdfs',
+        inference='closure',
         serialize_report_graph=True
     )
     
@@ -0,0 +1,78 @@
+"""Offline context bundle (tools/build_context_bundle.py, tests/_context_bundle.py)."""
+import json
+
+import pytest
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+import tests._context_cache as context_cache
+from tests._context_bundle import ContextBundle, build_bundle
+from tests._context_cache import ContextStore
+from tests._example_loader import list_valid_examples
+from tests._jsonld_utils import LIVE_BASE, load_json_file, make_requests_loader, to_rdf_graph_from_jsonld
+from tools.build_context_bundle import BUNDLE_CONTEXTS, SCHEMAS_DEFAULT, bundle_aliases
+
+# Nothing listens here: every context must come from the bundle.
+UNREACHABLE_BASE = "http://127.0.0.1:9/interface-schemas"
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    path = tmp_path / "contexts.lpcb"
+    path.write_bytes(build_bundle(SCHEMAS_DEFAULT, bundle_aliases()))
+    b = ContextBundle(path)
+    yield b
+    b.close()
+
+
+def test_bundle_is_deterministic_and_versioned(bundle):
+    assert bundle.path.read_bytes() == build_bundle(SCHEMAS_DEFAULT, bundle_aliases())
+    assert set(bundle.entries) == set(BUNDLE_CONTEXTS)
+    assert len(bundle.version) == 16
+
+
+def test_aliases_resolve_to_same_document(bundle):
+    doc = bundle.lookup(f"{LIVE_BASE}/dpc/contexts/v1.jsonld")
+    assert "@context" in doc
+    assert bundle.lookup("https://w3id.org/livepublication/interface-schemas/dpc/contexts/v1.jsonld") == doc
+    assert bundle.lookup(f"{UNREACHABLE_BASE}/dpc/contexts/v1.jsonld", UNREACHABLE_BASE) == doc
+    assert bundle.lookup("https://w3id.org/ro/crate/1.1/context") == \
+        bundle.lookup(f"{UNREACHABLE_BASE}/vendor/ro-crate/1.1/context.jsonld", UNREACHABLE_BASE)
+    assert bundle.lookup("https://example.org/other.jsonld") is None
+
+
+def test_entries_are_stored_as_json(bundle):
+    data = bundle.path.read_bytes()
+    for rel, (offset, length, _) in bundle.entries.items():
+        start = bundle._data_start + offset
+        assert json.loads(data[start:start + length]) == bundle.document(rel)
+
+
+def test_corrupt_entry_is_rejected(tmp_path):
+    data = bytearray(build_bundle(SCHEMAS_DEFAULT, bundle_aliases()))
+    data[-2] ^= 0xFF
+    path = tmp_path / "corrupt.lpcb"
+    path.write_bytes(bytes(data))
+    b = ContextBundle(path)
+    last = max(b.entries, key=lambda rel: b.entries[rel][0])
+    with pytest.raises(ValueError):
+        b.document(last)
+    b.close()
+
+
+def test_loader_serves_bundle_without_server(bundle, server_base, monkeypatch):
+    def fail(url, session=None, **kwargs):
+        raise AssertionError(f"unexpected network fetch: {url}")
+    monkeypatch.setattr(context_cache, "http_get", fail)
+    monkeypatch.setattr("tests._jsonld_utils.http_get", fail)
+
+    path = list_valid_examples()[0]
+    loader = make_requests_loader(UNREACHABLE_BASE, store=ContextStore(), bundle=bundle)
+    g = to_rdf_graph_from_jsonld(load_json_file(path), UNREACHABLE_BASE, loader=loader)
+    monkeypatch.undo()
+
+    # Same crate via the dev server; relative @ids resolve against each base.
+    served = to_rdf_graph_from_jsonld(load_json_file(path), server_base).serialize(format="nt")
+    origin = server_base.rsplit("/interface-schemas", 1)[0]
+    expected = Graph().parse(data=served.replace(origin, "http://127.0.0.1:9"), format="nt")
+    assert isomorphic(g, expected)
@@ -0,0 +1,109 @@
+"""Persistent on-disk context cache (tests/_context_cache.py)."""
+import pytest
+
+import tests._context_cache as context_cache
+from tests._context_cache import ContextStore, DiskContextCache, parse_cache_control
+from tests._jsonld_utils import make_requests_loader
+
+
+def _count_requests(monkeypatch):
+    """Wrap http_get in the cache module and record response status codes."""
+    seen = []
+    real_get = context_cache.http_get
+
+    def counting_get(url, session=None, **kwargs):
+        r = real_get(url, session, **kwargs)
+        seen.append(r.status_code)
+        return r
+
+    monkeypatch.setattr(context_cache, "http_get", counting_get)
+    return seen
+
+
+def _no_network(monkeypatch):
+    def fail(url, session=None, **kwargs):
+        raise AssertionError(f"unexpected network fetch: {url}")
+    monkeypatch.setattr(context_cache, "http_get", fail)
+
+
+def test_parse_cache_control():
+    cc = parse_cache_control("public, max-age=31536000, immutable")
+    assert cc == {"public": True, "max-age": 31536000, "immutable": True}
+    assert parse_cache_control("") == {}
+
+
+def test_immutable_context_served_without_network(server_base, tmp_path, monkeypatch):
+    url = f"{server_base}/dpc/contexts/v1.jsonld"
+    doc, _ = DiskContextCache(tmp_path).fetch(url)
+    assert "@context" in doc
+
+    # A new cache instance (another process or run) must not hit the network.
+    _no_network(monkeypatch)
+    doc2, final_url = DiskContextCache(tmp_path).fetch(url)
+    assert doc2 == doc
+    assert final_url == url
+
+
+def test_non_immutable_entry_is_revalidated(server_base, tmp_path, monkeypatch):
+    url = f"{server_base}/vendor/ro-terms/workflow-run/context.jsonld"
+    seen = _count_requests(monkeypatch)
+    cache = DiskContextCache(tmp_path)
+    doc, _ = cache.fetch(url)
+    doc2, _ = cache.fetch(url)
+    assert doc == doc2
+    # First fetch is a full 200; the second is a conditional request answered with 304.
+    assert seen == [200, 304]
+
+
+def test_corrupt_object_is_refetched(server_base, tmp_path, monkeypatch):
+    url = f"{server_base}/dsc/contexts/v1.jsonld"
+    cache = DiskContextCache(tmp_path)
+    doc, _ = cache.fetch(url)
+    for obj in (tmp_path / "objects").iterdir():
+        obj.write_bytes(b"{}")
+
+    seen = _count_requests(monkeypatch)
+    assert cache.fetch(url)[0] == doc
+    assert seen == [200]
+
+    # the refetch repaired the object: later lookups are served from disk
+    _no_network(monkeypatch)
+    assert cache.fetch(url)[0] == doc
+    assert DiskContextCache(tmp_path).fetch(url)[0] == doc
+
+
+def test_orphaned_objects_dropped_before_entries(server_base, tmp_path):
+    url = f"{server_base}/dpc/contexts/v1.jsonld"
+    cache = DiskContextCache(tmp_path)
+    cache.fetch(url)
+    (live,) = list((tmp_path / "objects").iterdir())
+    for i in range(3):
+        (tmp_path / "objects" / f"{i:064x}").write_bytes(b"x" * live.stat().st_size)
+
+    cache.max_bytes = live.stat().st_size  # room for the live object only
+    assert cache.evict() == 0
+    assert list((tmp_path / "objects").iterdir()) == [live]
+    assert len(list((tmp_path / "entries").glob("*.json"))) == 1
+
+
+def test_eviction_keeps_cache_under_budget(server_base, tmp_path):
+    cache = DiskContextCache(tmp_path, max_bytes=1)
+    cache.fetch(f"{server_base}/dpc/contexts/v1.jsonld")
+    cache.fetch(f"{server_base}/dsc/contexts/v1.jsonld")
+    assert list((tmp_path / "entries").glob("*.json")) == []
+    assert list((tmp_path / "objects").iterdir()) == []
+
+
+def test_loader_uses_disk_cache(server_base, tmp_path, monkeypatch):
+    url = f"{server_base}/contexts/lp-dscdpc/v1.jsonld"
+    make_requests_loader(server_base, disk_cache=DiskContextCache(tmp_path), store=ContextStore())(url)
+
+    # Fresh in-memory store, so the hit must come from disk.
+    _no_network(monkeypatch)
+    loader = make_requests_loader(server_base, disk_cache=DiskContextCache(tmp_path), store=ContextStore())
+    remote = loader(url)
+    assert remote["documentUrl"] == url
+    assert "@context" in remote["document"]
+
+    with pytest.raises(RuntimeError):
+        loader("https://not-allowed.example/context.jsonld")
@@ -0,0 +1,65 @@
+"""Process-wide single-flight context store (tests/_context_cache.ContextStore)."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tests._context_cache import CONTEXT_STORE, ContextStore
+from tests._jsonld_utils import make_requests_loader
+
+
+def test_concurrent_misses_share_one_fetch():
+    store = ContextStore()
+    calls = []
+    start = threading.Barrier(8)
+
+    def slow_fetch(url):
+        calls.append(url)
+        time.sleep(0.05)
+        return {"url": url}
+
+    def worker(_):
+        start.wait()
+        return store.get("https://example.org/ctx", slow_fetch)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(worker, range(8)))
+
+    assert calls == ["https://example.org/ctx"]
+    assert all(r is results[0] for r in results)
+    stats = store.stats()
+    assert stats["fetches"] == 1
+    assert stats["hits"] + stats["misses"] == 8
+
+
+def test_failed_fetch_propagates_and_is_not_cached():
+    store = ContextStore()
+
+    def boom(url):
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        store.get("u", boom)
+    assert "u" not in store
+    assert store.get("u", lambda url: 1) == 1
+
+
+def test_lru_eviction():
+    store = ContextStore(maxsize=2)
+    for key in ("a", "b"):
+        store.get(key, str.upper)
+    store.get("a", str.upper)  # refresh a; b is now least recently used
+    store.get("c", str.upper)
+    assert "a" in store and "c" in store and "b" not in store
+    assert store.stats()["evictions"] == 1
+
+
+def test_loaders_share_process_wide_store(server_base):
+    url = f"{server_base}/dpc/contexts/v1.jsonld"
+    fetches_before = CONTEXT_STORE.stats()["fetches"]
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        docs = list(pool.map(lambda _: make_requests_loader(server_base)(url)["document"], range(6)))
+    assert all(d is docs[0] for d in docs)
+    assert CONTEXT_STORE.stats()["fetches"] - fetches_before <= 1
+    assert url in CONTEXT_STORE
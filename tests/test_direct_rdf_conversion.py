@@ -0,0 +1,84 @@
+"""Single-pass JSON-LD → rdflib conversion must match the N-Quads round-trip."""
+import json
+
+import pytest
+from pyld import jsonld
+from rdflib import Graph, Literal, XSD
+from rdflib.compare import isomorphic
+
+from tests._example_loader import list_all_examples
+from tests._jsonld_utils import make_requests_loader, rewrite_context, to_rdf_graph_from_jsonld
+
+
+def _nquads_graph(doc: dict, base: str) -> Graph:
+    """The previous pipeline: to_rdf → N-Quads text → Graph.parse."""
+    doc = dict(doc, **{"@context": rewrite_context(doc["@context"], base)})
+    nquads = jsonld.to_rdf(doc, options={
+        "documentLoader": make_requests_loader(base),
+        "format": "application/n-quads",
+        "useNativeTypes": True,
+        "produceGeneralizedRdf": False,
+        "base": base,
+    })
+    g = Graph()
+    g.parse(data=nquads, format="nquads")
+    return g
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_direct_graph_isomorphic_to_nquads_path(server_base, path):
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    expected = _nquads_graph(doc, server_base)
+    actual = to_rdf_graph_from_jsonld(doc, server_base)
+    assert len(actual) == len(expected)
+    assert isomorphic(actual, expected), f"Graphs differ for {path}"
+
+
+def test_native_types_and_strings(server_base):
+    doc = {
+        "@context": [f"{server_base}/contexts/lp-dscdpc/v1.jsonld"],
+        "@id": "http://example.org/x",
+        "@type": "Observation",
+        "name": "line\nbreak \"quoted\"",
+        "value": 1.5,
+        "position": 3,
+        "requiresSubscription": False,
+    }
+    g = to_rdf_graph_from_jsonld(doc, server_base)
+    objects = set(g.objects())
+    assert Literal("line\nbreak \"quoted\"") in objects
+    assert Literal("1.5E0", datatype=XSD.double) in objects
+    assert Literal("3", datatype=XSD.integer) in objects
+    assert Literal("false", datatype=XSD.boolean) in objects
+    assert isomorphic(g, _nquads_graph(doc, server_base))
+
+
+def test_adds_into_given_graph(server_base):
+    g = Graph()
+    doc = {"@context": [f"{server_base}/contexts/lp-dscdpc/v1.jsonld"],
+           "@id": "http://example.org/y", "name": "y"}
+    assert to_rdf_graph_from_jsonld(doc, server_base, rdflib_graph=g) is g
+    assert len(g) == 1
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_input_document_is_not_mutated(server_base, path):
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    snapshot = json.dumps(doc, sort_keys=True)
+    context = doc["@context"]
+
+    to_rdf_graph_from_jsonld(doc, server_base)
+    assert doc["@context"] is context
+    assert json.dumps(doc, sort_keys=True) == snapshot
+
+
+def test_shared_document_across_threads(server_base):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with open(list_all_examples()[0], "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        graphs = list(pool.map(lambda _: to_rdf_graph_from_jsonld(doc, server_base), range(8)))
+    assert all(isomorphic(g, graphs[0]) for g in graphs[1:])
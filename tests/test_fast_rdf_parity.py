@@ -0,0 +1,63 @@
+"""Parity harness: the profile-native emitter must match the pyld path on every crate."""
+import json
+
+import pytest
+from rdflib import Graph, Literal, URIRef, XSD
+from rdflib.compare import isomorphic
+
+from tests._example_loader import list_all_examples
+from tests._fast_rdf import FastPathUnsupported
+from tests._jsonld_utils import fast_to_rdf_graph, load_json_file, to_rdf_graph_from_jsonld
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_fast_path_isomorphic_to_pyld(server_base, path):
+    doc = load_json_file(path)
+    fast = fast_to_rdf_graph(doc, server_base)  # must not fall back on our own crates
+    slow = to_rdf_graph_from_jsonld(doc, server_base, fast=False)
+    assert len(fast) == len(slow)
+    assert isomorphic(fast, slow), f"fast path differs from pyld for {path}"
+
+
+def _profile_doc(server_base, **node):
+    return {
+        "@context": [f"{server_base}/contexts/lp-dscdpc/v1.jsonld"],
+        "@graph": [dict({"@id": "http://example.org/x"}, **node)],
+    }
+
+
+def test_native_types_match_pyld(server_base):
+    doc = _profile_doc(server_base, value=[3, 2.5, 1e21, True, "text"], name=None,
+                       additionalProperty={"@type": "PropertyValue", "value": 7},
+                       startTime="2024-01-01T00:00:00Z", about="_:b0")
+    fast = fast_to_rdf_graph(doc, server_base)
+    assert isomorphic(fast, to_rdf_graph_from_jsonld(doc, server_base, fast=False))
+    x = URIRef("http://example.org/x")
+    assert (x, URIRef("https://schema.org/value"), Literal("text")) in fast
+    assert (x, URIRef("https://schema.org/value"), Literal("3", datatype=XSD.integer)) in fast
+
+
+@pytest.mark.parametrize("node", [
+    {"name": {"@value": "x", "@language": "en"}},
+    {"hasPart": {"@list": [{"@id": "http://example.org/a"}]}},
+    {"@context": {"ex": "http://example.org/"}, "ex:p": "v"},
+    {"@reverse": {"hasPart": {"@id": "http://example.org/a"}}},
+])
+def test_unsupported_constructs_fall_back(server_base, node):
+    doc = _profile_doc(server_base, **node)
+    original = json.dumps(doc, sort_keys=True)
+    with pytest.raises(FastPathUnsupported):
+        fast_to_rdf_graph(doc, server_base)
+    # the default entry point falls back to pyld and still converts
+    g = to_rdf_graph_from_jsonld(doc, server_base)
+    assert isomorphic(g, to_rdf_graph_from_jsonld(doc, server_base, fast=False))
+    assert len(g) > 0
+    assert json.dumps(doc, sort_keys=True) == original
+
+
+def test_fallback_leaves_target_graph_untouched(server_base):
+    g = Graph()
+    doc = _profile_doc(server_base, name="ok", description={"@value": "x", "@language": "en"})
+    with pytest.raises(FastPathUnsupported):
+        fast_to_rdf_graph(doc, server_base, g)
+    assert len(g) == 0
@@ -0,0 +1,54 @@
+"""Pooled HTTP session and concurrent @context prefetch."""
+import os
+
+import tests._context_cache as context_cache
+from tests._context_cache import ContextStore, make_session
+from tests._jsonld_utils import CRATE_CONTEXT, make_requests_loader, prefetch_contexts
+
+
+def test_make_session_configures_pool_and_retries():
+    session = make_session(pool_size=4, retries=2)
+    adapter = session.get_adapter("https://w3id.org/")
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 2
+
+
+def test_loader_reuses_session(server_base, monkeypatch):
+    monkeypatch.setattr("tests._jsonld_utils.default_bundle", lambda: None)
+    calls = []
+    session = make_session()
+    real_get = session.get
+
+    def tracking_get(url, **kwargs):
+        calls.append(url)
+        return real_get(url, **kwargs)
+
+    session.get = tracking_get
+    loader = make_requests_loader(server_base, store=ContextStore(), session=session)
+    loader(f"{server_base}/dpc/contexts/v1.jsonld")
+    loader(f"{server_base}/dsc/contexts/v1.jsonld")
+    assert calls == [f"{server_base}/dpc/contexts/v1.jsonld", f"{server_base}/dsc/contexts/v1.jsonld"]
+
+
+def test_prefetch_loads_every_context_url(server_base):
+    store = ContextStore()
+    loader = make_requests_loader(server_base, store=store)
+    ctx = CRATE_CONTEXT + [{"@vocab": "https://schema.org/"}, "https://not-allowed.example/ctx"]
+    fetched = prefetch_contexts(ctx, server_base, loader=loader)
+    assert set(fetched) == set(CRATE_CONTEXT) | {"https://not-allowed.example/ctx"}
+    # Every allowed context is now served from the store.
+    assert store.stats()["entries"] == len(CRATE_CONTEXT)
+
+
+def test_forked_child_gets_fresh_session():
+    parent_session = context_cache.HTTP_SESSION
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        os.close(read_fd)
+        os.write(write_fd, b"1" if context_cache.HTTP_SESSION is not parent_session else b"0")
+        os._exit(0)
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    assert os.read(read_fd, 1) == b"1"
+    os.close(read_fd)
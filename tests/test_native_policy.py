@@ -0,0 +1,123 @@
+"""Native ASK policy evaluation (tests/_native_policy.py) against rdflib's SPARQL engine."""
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace
+from rdflib.namespace import RDF, XSD
+from rdflib.plugins.sparql import prepareQuery
+
+from tests._example_loader import list_all_examples
+from tests._native_policy import UnsupportedQuery, _predicates, compile_ask
+from tests._policy import PolicySet, crate_graph, policy_set
+
+SCHEMA = Namespace("https://schema.org/")
+HTTP_SCHEMA = Namespace("http://schema.org/")
+DSC = Namespace("https://livepublication.org/interface-schemas/dsc#")
+EX = Namespace("https://example.org/")
+PREFIXES = "PREFIX schema: <https://schema.org/>\nPREFIX xsd: <http://www.w3.org/2001/XMLSchema#>\n" \
+           "PREFIX dsc: <https://livepublication.org/interface-schemas/dsc#>\nPREFIX ex: <https://example.org/>\n" \
+           "PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>\n"
+
+QUERIES = [
+    "ASK { ?s schema:contentSize ?v FILTER(DATATYPE(?v) != xsd:integer) }",
+    "ASK { ?s schema:contentSize ?v FILTER(DATATYPE(?v) = xsd:string) }",
+    "ASK { ?s schema:name ?v FILTER(rdf:langString = DATATYPE(?v)) }",
+    "ASK { ?s ?p ?o FILTER(STRSTARTS(STR(?p), \"http://schema.org/\")) }",
+    "ASK { ?s ?p ?o FILTER(STRSTARTS(STR(?o), \"https://example.org/\") && isIRI(?o)) }",
+    "ASK { ?s ?p ?o FILTER(CONTAINS(STR(?s), \"step\") || isBLANK(?o)) }",
+    "ASK { ?s ?p ?o FILTER(STRENDS(STR(?o), \"x\") && isLITERAL(?o)) }",
+    "ASK { ?step a dsc:DistributedStep FILTER NOT EXISTS { ?step schema:object ?x }"
+    " FILTER NOT EXISTS { ?step schema:result ?y } }",
+    "ASK { ?a a schema:ControlAction ; schema:object ?o FILTER NOT EXISTS { ?o a dsc:DistributedStep } }",
+    "ASK { ?a a schema:ControlAction FILTER EXISTS { ?a schema:object [ a dsc:DistributedStep ] } }",
+    "ASK { ?s ex:knows ?s }",
+    "ASK { ?s ex:knows ?o . ?o ex:knows ?s }",
+    "ASK { { ?s schema:startTime ?v } UNION { ?s schema:endTime ?v } FILTER(DATATYPE(?v) != xsd:dateTime) }",
+    "ASK { ?s schema:contentSize ?v FILTER(DATATYPE(?nope) = xsd:integer) }",
+    "ASK { ?s a schema:File }",
+    "ASK { ex:step1 a dsc:DistributedStep }",
+]
+
+
+def _graph() -> Graph:
+    g = Graph()
+    step, action, blank = EX.step1, EX.action1, BNode()
+    g.add((step, RDF.type, DSC.DistributedStep))
+    g.add((EX.step2, RDF.type, DSC.DistributedStep))
+    g.add((EX.step2, SCHEMA.result, EX.out))
+    g.add((action, RDF.type, SCHEMA.ControlAction))
+    g.add((action, SCHEMA.object, EX.step2))
+    g.add((EX.file, SCHEMA.contentSize, Literal(12, datatype=XSD.integer)))
+    g.add((EX.file2, SCHEMA.contentSize, Literal("12")))
+    g.add((EX.file2, SCHEMA.name, Literal("Datei", lang="de")))
+    g.add((EX.file2, SCHEMA.about, EX.other))
+    g.add((EX.run, SCHEMA.startTime, Literal("2024-01-01", datatype=XSD.date)))
+    g.add((EX.run, SCHEMA.endTime, Literal("2024-01-01T00:00:00", datatype=XSD.dateTime)))
+    g.add((EX.alice, EX.knows, EX.bob))
+    g.add((EX.bob, EX.knows, EX.alice))
+    g.add((blank, SCHEMA.description, Literal("box")))
+    g.add((EX.file, SCHEMA.about, blank))
+    g.add((EX.file, HTTP_SCHEMA.name, Literal("x")))
+    return g
+
+
+def _variants(g: Graph):
+    yield g
+    for triple in list(g):
+        h = Graph()
+        h += g
+        h.remove(triple)
+        yield h
+
+
+@pytest.mark.parametrize("text", QUERIES)
+def test_matches_rdflib(text):
+    query = prepareQuery(PREFIXES + text)
+    plan = compile_ask(query)
+    for g in _variants(_graph()):  # the graph, and the graph without each one of its triples
+        assert plan.ask(g) is bool(g.query(query)), g.serialize(format="turtle")
+
+
+@pytest.mark.parametrize("store", ["Memory", "SimpleMemory"])
+def test_distinct_predicates_on_any_store(store):
+    g = Graph(store=store)
+    g += _graph()
+    assert sorted(_predicates(g)) == sorted(set(_graph().predicates()))
+    plan = compile_ask(prepareQuery(PREFIXES + QUERIES[3]))
+    assert plan.ask(g) is bool(g.query(prepareQuery(PREFIXES + QUERIES[3])))
+
+
+@pytest.mark.parametrize("text", [
+    "SELECT * { ?s ?p ?o }",
+    "ASK { ?s schema:object ?o OPTIONAL { ?o a dsc:DistributedStep } }",
+    "ASK { ?s schema:object/schema:result ?o }",
+    "ASK { ?s schema:object ?o MINUS { ?o a dsc:DistributedStep } }",
+    "ASK { ?s schema:contentSize ?v FILTER(!isLITERAL(?v)) }",
+    "ASK { ?s schema:contentSize ?v FILTER(?v > 3) }",
+    "ASK { ?s schema:contentSize ?v BIND(STR(?v) AS ?x) }",
+    "ASK { ?s ?p ?o FILTER(STRSTARTS(?o, \"x\")) }",
+])
+def test_unsupported(text):
+    with pytest.raises(UnsupportedQuery):
+        compile_ask(prepareQuery(PREFIXES + text))
+
+
+def test_policy_set_falls_back_to_rdflib(tmp_path):
+    (tmp_path / "optional.rq").write_text(PREFIXES + "ASK { ?s schema:object ?o OPTIONAL { ?o schema:name ?n } }")
+    (tmp_path / "simple.rq").write_text(PREFIXES + "ASK { ?s a schema:File }")
+    policies = PolicySet.from_dir(tmp_path)
+    assert set(policies.compiled) == {"simple"} and set(policies.unsupported) == {"optional"}
+    results = policies.evaluate(_graph())
+    assert not results["optional"].passed and not results["optional"].native
+    assert results["simple"].passed and results["simple"].native
+    assert not PolicySet.from_dir(tmp_path, native=False).compiled
+
+
+def test_every_policy_compiles():
+    assert set(policy_set().compiled) == set(policy_set().queries) and not policy_set().unsupported
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_policies_match_rdflib_on_crates(server_base, path):
+    graph = crate_graph(path, server_base)
+    native = policy_set().evaluate(graph)
+    assert all(r.native for r in native.values())
+    assert {n: r.passed for n, r in native.items()} == PolicySet.from_dir(native=False).check(graph)
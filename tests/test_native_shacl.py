@@ -0,0 +1,197 @@
+"""Native DPC/DSC constraint engine (tests/_native_shacl.py) against pyshacl."""
+import io
+import json
+import os
+import pathlib
+import time
+
+import pytest
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.namespace import RDF, RDFS, SH
+
+from tests._example_loader import list_all_examples
+from tests._jsonld_utils import cached_crate_graph
+from tests._native_shacl import (NativeShapes, ShaclParityError, UnsupportedShape, native_shapes, report_results,
+                                 result_json, write_jsonl)
+from tests._shacl import ShapesValidator, shapes_validator
+
+SCHEMA = Namespace("https://schema.org/")
+DPC = Namespace("https://livepublication.org/interface-schemas/dpc#")
+DSC = Namespace("https://livepublication.org/interface-schemas/dsc#")
+
+ARTIFACT_DIR = pathlib.Path(".artifacts")
+SPEEDUP_PATH = ARTIFACT_DIR / "native_shacl_speedup.json"
+
+
+def _copy(g: Graph) -> Graph:
+    out = Graph()
+    out += g
+    return out
+
+
+def _without_names(g):
+    out = _copy(g)
+    out.remove((None, SCHEMA.name, None))
+    return out
+
+
+def _literal_links(g):
+    out = _copy(g)
+    for p in (SCHEMA.position, SCHEMA.object, SCHEMA.hasPart, DPC.component):
+        for s, o in list(out.subject_objects(p)):
+            out.remove((s, p, o))
+            out.add((s, p, Literal("x")))
+    return out
+
+
+def _untyped_components(g):
+    out = _copy(g)
+    for cls in (DPC.HardwareComponent, SCHEMA.Observation):
+        out.remove((None, RDF.type, cls))
+    return out
+
+
+MUTATIONS = {"as-is": lambda g: g, "no-names": _without_names,
+             "literal-links": _literal_links, "untyped-components": _untyped_components}
+
+
+@pytest.mark.parametrize("mutation", MUTATIONS)
+@pytest.mark.parametrize("path", list_all_examples())
+def test_matches_pyshacl(server_base, path, mutation):
+    g = MUTATIONS[mutation](cached_crate_graph(path, base_override=server_base))
+    native = native_shapes(server_base)
+    missing, extra = native.parity_diff(g)
+    assert not missing and not extra, (missing, extra)
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_matches_pyshacl_rdfs_inference(server_base, path):
+    """Same results as the conformance tests' inference='rdfs' (messages aside)."""
+    g = _without_names(cached_crate_graph(path, base_override=server_base))
+    native = native_shapes(server_base)
+    missing, extra = native.parity_diff(g, inference="rdfs")
+    assert sorted(r[:6] for r in missing) == sorted(r[:6] for r in extra)
+    assert native.validate(g)[0] == shapes_validator(server_base).validate(g)[0]
+
+
+def test_subclass_targets_and_class():
+    ex = Namespace("http://example.org/")
+    g = Graph()
+    g.add((ex.GPU, RDFS.subClassOf, DPC.HardwareComponent))
+    g.add((ex.gpu, RDF.type, ex.GPU))  # no schema:name
+    g.add((ex.runtime, RDF.type, DPC.HardwareRuntime))
+    g.add((ex.runtime, DPC.component, ex.gpu))
+    native = native_shapes()
+    conforms, results = native.validate(g, parity=True)
+    assert not conforms
+    assert [(r.focus, r.path) for r in results] == [(ex.gpu, SCHEMA.name)]
+
+
+def test_parity_mode_reports_differences():
+    native = NativeShapes(ShapesValidator.from_files())
+    step = native._shapes[DSC.DistributedStepShape]
+    step.checks = [c for c in step.checks if c[0] != SH["or"]]
+    g = Graph()
+    g.add((URIRef("http://example.org/step"), RDF.type, DSC.DistributedStep))
+    assert native.validate(g, parity=False)[1]
+    with pytest.raises(ShaclParityError, match="only pyshacl"):
+        native.validate(g, parity=True)
+
+
+def test_unsupported_shapes_rejected():
+    sg = ShapesValidator.from_files().graph
+    extra = _copy(sg)
+    extra.add((DPC.HardwareComponentShape, SH.closed, Literal(True)))
+    with pytest.raises(UnsupportedShape, match="closed"):
+        NativeShapes(ShapesValidator(extra))
+
+
+def _key(results):
+    return sorted(tuple(str(x) for x in r) for r in results)
+
+
+@pytest.mark.parametrize("mutation", ["as-is", "no-names", "untyped-components"])
+def test_stream_matches_validate(server_base, mutation):
+    native = native_shapes(server_base)
+    validator = shapes_validator(server_base)
+    for path in list_all_examples():
+        g = MUTATIONS[mutation](cached_crate_graph(path, base_override=server_base))
+        streamed = list(native.stream(g))
+        _, report_graph, _ = validator.validate(g)  # closure, like stream()
+        assert _key(streamed) == _key(report_results(report_graph))
+        if streamed:
+            assert list(native.stream(g, fail_fast=True)) == streamed[:1]
+            assert list(native.stream(g, max_results=2)) == streamed[:2]
+        assert list(native.stream(g, max_results=0)) == []
+
+
+@pytest.mark.parametrize("closure", [True, False])
+@pytest.mark.parametrize("mutation", ["as-is", "untyped-components"])
+def test_validate_and_stream_agree(server_base, mutation, closure):
+    native = native_shapes(server_base)
+    for path in list_all_examples():
+        g = MUTATIONS[mutation](cached_crate_graph(path, base_override=server_base))
+        conforms, results = native.validate(g, closure=closure)
+        assert _key(results) == _key(native.stream(g, closure=closure))
+        assert conforms == (not results)
+    assert native.validate(g) == native.validate(g, closure=True)
+
+
+def test_fail_fast_stops_early(monkeypatch):
+    ex = Namespace("http://example.org/")
+    g = Graph()
+    for i in range(500):
+        g.add((ex[f"gpu{i}"], RDF.type, DPC.HardwareComponent))  # no schema:name
+    native = native_shapes()
+    assert len(native.results(g)) == 500
+    calls = []
+    original = NativeShapes._check
+    monkeypatch.setattr(NativeShapes, "_check", lambda self, *a, **k: calls.append(1) or original(self, *a, **k))
+    (first,) = native.stream(g, fail_fast=True)
+    assert first.path == SCHEMA.name and len(calls) < 5
+
+
+def test_jsonl_lines(server_base):
+    native = native_shapes(server_base)
+    path = sorted(list_all_examples())[0]
+    g = _without_names(cached_crate_graph(path, base_override=server_base))
+    out = io.StringIO()
+    n = write_jsonl(native.stream(g), out, crate=path)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert n == len(lines) > 0
+    assert lines == [{"crate": path, **result_json(r)} for r in native.stream(g)]
+    assert set(lines[0]) == {"crate", "focus", "path", "value", "shape", "component", "severity", "message"}
+    assert lines[0]["severity"] == str(SH.Violation)
+
+
+@pytest.mark.slow
+def test_speedup_report(server_base):
+    """
+    Time native vs pyshacl validation on one crate and write
+    .artifacts/native_shacl_speedup.json (report-only: wall-clock ratios are
+    too noisy on shared CI machines to assert). Skip via SKIP_SLOW=1.
+    """
+    if os.environ.get("SKIP_SLOW") == "1":
+        pytest.skip("SKIP_SLOW=1 set, skipping slow tests")
+    path = sorted(list_all_examples(), key=lambda p: "dpc" not in p)[0]
+    g = cached_crate_graph(path, base_override=server_base)
+    native, validator = native_shapes(server_base), shapes_validator(server_base)
+
+    def best(fn, runs=5):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    # same inference on both sides: pyshacl's engine cost alone
+    native_s = best(lambda: native.validate(g, closure=False))
+    pyshacl_s = best(lambda: validator.validate(g, inference="none"))
+    report = {"crate": path, "native_ms": round(native_s * 1000, 3), "pyshacl_ms": round(pyshacl_s * 1000, 3),
+              "speedup": round(pyshacl_s / native_s, 1) if native_s else None}
+    ARTIFACT_DIR.mkdir(exist_ok=True)
+    with open(SPEEDUP_PATH, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n[NATIVE SHACL] {report['native_ms']} ms vs pyshacl {report['pyshacl_ms']} ms "
+          f"({report['speedup']}x) -> {SPEEDUP_PATH.absolute()}")
@@ -0,0 +1,115 @@
+"""Sidecar output cache (tests/_output_cache.py) keyed by crate bytes and context fingerprint."""
+import json
+import shutil
+
+from rdflib import BNode, Graph
+from rdflib.compare import isomorphic
+
+import tests._jsonld_utils as jsonld_utils
+from tests._example_loader import list_valid_examples
+from tests._jsonld_utils import (
+    cached_crate_graph, cached_expand, cached_nquads, context_fingerprint,
+    expand_with_override, load_json_file, to_rdf_graph_from_jsonld,
+)
+from tests._output_cache import OutputCache
+
+
+def _crate(tmp_path):
+    path = tmp_path / "crate.json"
+    shutil.copy(list_valid_examples()[0], path)
+    return path
+
+
+def test_second_pass_is_served_from_cache(server_base, tmp_path, monkeypatch):
+    cache = OutputCache(tmp_path / "cache")
+    path = _crate(tmp_path)
+    g1 = cached_crate_graph(path, server_base, cache=cache)
+    expanded = cached_expand(path, server_base, cache=cache)
+    nq = cached_nquads(path, server_base, cache=cache)
+    assert cache.stats() == {"hits": 0, "misses": 3}
+
+    def fail(*args, **kwargs):
+        raise AssertionError("converted again on a cache hit")
+    monkeypatch.setattr(jsonld_utils, "to_rdf_graph_from_jsonld", fail)
+    monkeypatch.setattr(jsonld_utils, "expand_with_override", fail)
+
+    assert isomorphic(cached_crate_graph(path, server_base, cache=cache), g1)
+    assert cached_expand(path, server_base, cache=cache) == expanded
+    assert cached_nquads(path, server_base, cache=cache) == nq
+    assert cache.stats()["hits"] == 3
+
+
+def test_cached_output_matches_direct_conversion(server_base, tmp_path):
+    cache = OutputCache(tmp_path / "cache")
+    path = _crate(tmp_path)
+    doc = load_json_file(path)
+    for _ in range(2):  # miss, then hit
+        assert isomorphic(cached_crate_graph(path, server_base, cache=cache),
+                          to_rdf_graph_from_jsonld(doc, server_base))
+        assert cached_expand(path, server_base, cache=cache) == \
+            json.loads(json.dumps(expand_with_override(doc, server_base)))
+
+
+def _bnodes(g):
+    return {t for triple in g for t in triple if isinstance(t, BNode)}
+
+
+def test_cache_hits_mint_fresh_blank_nodes(server_base, tmp_path):
+    cache = OutputCache(tmp_path / "cache")
+    path = _crate(tmp_path)
+    first = cached_crate_graph(path, server_base, cache=cache)
+    assert _bnodes(first)
+    union = Graph()
+    cached_crate_graph(path, server_base, cache=cache, rdflib_graph=union)
+    cached_crate_graph(path, server_base, cache=cache, rdflib_graph=union)
+    assert cache.stats() == {"hits": 2, "misses": 1}
+    assert len(_bnodes(union)) == 2 * len(_bnodes(first))
+    assert not _bnodes(union) & _bnodes(first)
+    assert not list((tmp_path / "cache").glob("*/*.pickle"))
+
+
+def test_changed_crate_bytes_miss(server_base, tmp_path):
+    cache = OutputCache(tmp_path / "cache")
+    path = _crate(tmp_path)
+    cached_crate_graph(path, server_base, cache=cache)
+    doc = load_json_file(path)
+    doc["@graph"][0]["name"] = "renamed"
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    g = cached_crate_graph(path, server_base, cache=cache)
+    assert cache.stats() == {"hits": 0, "misses": 2}
+    assert isomorphic(g, to_rdf_graph_from_jsonld(doc, server_base))
+
+
+def test_fingerprint_tracks_context_documents(server_base, monkeypatch):
+    ctx = load_json_file(list_valid_examples()[0])["@context"]
+    fp = context_fingerprint(ctx, server_base)
+    assert context_fingerprint(ctx, server_base) == fp
+    assert context_fingerprint(ctx, server_base + "/") != fp
+
+    # a changed context document (served by a different loader) changes the fingerprint
+    real = jsonld_utils.make_requests_loader(server_base)
+
+    def edited(url, options=None):
+        remote = real(url, options)
+        if url.endswith("lp-dscdpc/v1.jsonld"):
+            remote = dict(remote, document={"@context": dict(remote["document"]["@context"], extra="x:y")})
+        return remote
+
+    jsonld_utils.FINGERPRINTS.clear()
+    try:
+        assert context_fingerprint(ctx, server_base, loader=edited) != fp
+    finally:
+        jsonld_utils.FINGERPRINTS.clear()
+
+
+def test_invalidate_and_evict(server_base, tmp_path):
+    cache = OutputCache(tmp_path / "cache")
+    path = _crate(tmp_path)
+    cached_crate_graph(path, server_base, cache=cache)
+    cache.put("stale-fingerprint", "abc", "nquads", "<a> <b> <c> .\n")
+    assert cache.invalidate(keep=[context_fingerprint(load_json_file(path)["@context"], server_base)]) == 1
+    assert cache.get("stale-fingerprint", "abc", "nquads") is None
+
+    cache.max_bytes = 1
+    assert cache.evict() == 1
+    assert list((tmp_path / "cache").glob("*/*")) == []
@@ -0,0 +1,99 @@
+"""Parallel and union-graph SHACL validation of many crates (validate_crates, validate_union)."""
+import pytest
+from rdflib import Graph, Namespace
+from rdflib.namespace import RDF, RDFS
+
+from tests._example_loader import list_all_examples, list_invalid_examples, list_valid_examples
+from tests._jsonld_utils import cached_crate_graph
+from tests._native_shacl import report_results
+from tests._parallel_shacl import validate_crates, validate_union
+from tests._shacl import shapes_validator
+
+SCHEMA = Namespace("https://schema.org/")
+DPC = Namespace("https://livepublication.org/interface-schemas/dpc#")
+
+
+def _key(results):
+    return sorted(tuple(str(x) for x in r) for r in results)
+
+
+def _without_names(g):
+    out = Graph()
+    out += g
+    out.remove((None, SCHEMA.name, None))
+    return out
+
+
+def test_matches_sequential_in_input_order(server_base):
+    paths = list_all_examples() * 3
+    results = list(validate_crates(paths, server_base, workers=2, chunksize=2))
+    assert [r.path for r in results] == paths
+    for r in results:
+        assert r.error is None, r.error
+        conforms, report_graph, report_text = shapes_validator(server_base).validate(
+            cached_crate_graph(r.path, server_base))
+        assert r.conforms == conforms
+        assert _key(r.results) == _key(report_results(report_graph))
+        assert r.report == report_text
+
+
+def test_valid_and_invalid_crates(server_base):
+    results = {r.path: r for r in validate_crates(list_all_examples(), server_base, workers=2, ordered=False)}
+    assert sorted(results) == list_all_examples()
+    assert all(results[p].conforms and not results[p].results for p in list_valid_examples())
+    assert all(not results[p].conforms and results[p].results for p in list_invalid_examples())
+
+
+def test_errors_reported_per_crate(server_base, tmp_path):
+    bad = tmp_path / "broken.json"
+    bad.write_text("{not json")
+    paths = list_valid_examples() + [bad]
+    results = list(validate_crates(paths, server_base, workers=2, ordered=False, chunksize=1))
+    errors = {r.path: r.error for r in results if r.error}
+    assert list(errors) == [str(bad)]
+    assert errors[str(bad)].startswith("JSONDecodeError")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_local_shapes(server_base, workers):
+    paths = list_valid_examples()
+    results = list(validate_crates(paths, server_base, shapes_base=None, workers=workers))
+    assert [r.conforms for r in results] == [True] * len(paths)
+
+
+def test_union_matches_each_crate_alone(server_base):
+    # the same crates twice (same IRIs and blank node ids), and copies with violations on IRIs
+    graphs = [cached_crate_graph(p, server_base) for p in list_all_examples()] * 2
+    graphs += [_without_names(g) for g in graphs[:len(list_all_examples())]]
+    validator = shapes_validator(server_base)
+    for g, (conforms, results) in zip(graphs, validate_union(graphs, validator)):
+        expected = validator.validate(g)
+        assert conforms == expected[0]
+        assert _key(results) == _key(report_results(expected[1]))  # incl. messages
+
+
+def test_union_validates_crates_with_class_axioms_alone(server_base):
+    ex = Namespace("http://example.org/")
+    axioms = Graph()
+    axioms.add((ex.GPU, RDFS.subClassOf, DPC.HardwareComponent))
+    axioms.add((ex.gpu, RDF.type, ex.GPU))  # a HardwareComponent here only
+    other = Graph()
+    other.add((ex.gpu, RDF.type, ex.GPU))  # not one here
+    validator = shapes_validator(server_base)
+    (c1, r1), (c2, r2) = validate_union([axioms, other], validator)
+    assert (c1, c2) == (False, True)
+    assert [(r.focus, r.path) for r in r1] == [(ex.gpu, SCHEMA.name)] and not r2
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_batch_mode(server_base, ordered):
+    paths = list_all_examples() * 2
+    expected = {r.path: r for r in validate_crates(paths, server_base, workers=1)}
+    results = list(validate_crates(paths, server_base, workers=2, chunksize=4, batch=True, ordered=ordered))
+    assert sorted(r.path for r in results) == sorted(paths)
+    if ordered:
+        assert [r.path for r in results] == paths
+    for r in results:
+        assert r.error is None and r.report is None
+        assert r.conforms == expected[r.path].conforms
+        assert _key(r.results) == _key(expected[r.path].results)
@@ -0,0 +1,110 @@
+"""Prepared SPARQL policies, witnesses and the per-process crate graph cache (tests/_policy.py)."""
+import pytest
+from rdflib import Graph, Literal, Namespace
+from rdflib.namespace import RDF, XSD
+from rdflib.plugins.sparql import prepareQuery
+
+from tests._example_loader import list_all_examples
+from tests._policy import CRATE_GRAPHS, PolicySet, as_select, crate_graph, policy_set
+
+SCHEMA = Namespace("https://schema.org/")
+EX = Namespace("https://example.org/")
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_evaluate_matches_rdflib(server_base, path):
+    policies = policy_set()
+    graph = crate_graph(path, server_base)
+    results = policies.evaluate(graph)
+    assert list(results) == sorted(p.stem for p in policies.paths.values())
+    for name, query_path in policies.paths.items():
+        assert results[name].passed is not bool(graph.query(query_path.read_text(encoding="utf-8")))
+        assert results[name].seconds >= 0
+    assert policies.check(graph) == {name: r.passed for name, r in results.items()}
+
+
+def test_crate_converted_once(server_base, monkeypatch):
+    path = list_all_examples()[0]
+    CRATE_GRAPHS.clear()
+    first = crate_graph(path, server_base)
+    monkeypatch.setattr("tests._policy.cached_crate_graph", lambda *a: pytest.fail("crate was re-converted"))
+    assert crate_graph(path, server_base) is first
+    assert crate_graph(f"./{path}", server_base) is first
+
+
+def test_queries_prepared_once(monkeypatch):
+    policies = policy_set()
+    assert policy_set() is policies
+    monkeypatch.setattr("rdflib.plugins.sparql.processor.parseQuery",
+                        lambda *a, **k: pytest.fail("policy query was re-parsed"))
+    g = Graph()
+    g.add((EX.file, SCHEMA.contentSize, Literal("12")))
+    results = policies.evaluate(g)
+    assert not results["content_size_integer"].passed
+    assert all(r.passed for name, r in results.items() if name != "content_size_integer")
+
+
+def test_policy_set_from_dir(tmp_path):
+    (tmp_path / "has_size.rq").write_text("PREFIX schema: <https://schema.org/>\nASK { ?s schema:contentSize ?v }")
+    policies = PolicySet.from_dir(tmp_path)
+    g = Graph()
+    assert policies.check(g) == {"has_size": True}
+    g.add((EX.file, SCHEMA.contentSize, Literal(12, datatype=XSD.integer)))
+    assert policies.check(g) == {"has_size": False}
+
+
+class _CountingGraph(Graph):
+    """Counts the triples handed out to query evaluation."""
+
+    served = 0
+
+    def triples(self, pattern):
+        for t in super().triples(pattern):
+            self.served += 1
+            yield t
+
+
+@pytest.mark.parametrize("native", [True, False])
+def test_witnesses_from_one_bounded_pass(tmp_path, native):
+    # no "ASK WHERE" in the text: the rewrite works on the algebra, not the string
+    (tmp_path / "size.rq").write_text("PREFIX schema: <https://schema.org/>\n"
+                                      "ask{?s schema:contentSize ?v FILTER(datatype(?v)!=<http://www.w3.org/2001/XMLSchema#integer>)}")
+    policies = PolicySet.from_dir(tmp_path, native=native)
+    g = _CountingGraph()
+    for i in range(1000):
+        g.add((EX[f"file{i}"], SCHEMA.contentSize, Literal(str(i))))
+    g.served = 0
+    result = policies.evaluate(g, witnesses=3)["size"]
+    assert not result.passed and result.native is native
+    assert len(result.witnesses) == 3 and g.served <= 10
+    for row in result.witnesses:
+        assert set(row) == {"s", "v"} and (row["s"], SCHEMA.contentSize, row["v"]) in g
+
+    g.remove((None, SCHEMA.contentSize, None))
+    result = policies.evaluate(g, witnesses=3)["size"]
+    assert result.passed and result.witnesses == ()
+
+
+def test_as_select_matches_select_text():
+    text = "PREFIX schema: <https://schema.org/>\nASK { ?a a schema:ControlAction ; schema:object ?o " \
+           "FILTER NOT EXISTS { ?o a <https://example.org/Step> } }"
+    g = Graph()
+    for i in range(5):
+        g.add((EX[f"a{i}"], RDF.type, SCHEMA.ControlAction))
+        g.add((EX[f"a{i}"], SCHEMA.object, EX[f"o{i}"]))
+    expected = {tuple(sorted(r.asdict().items())) for r in g.query(text.replace("ASK", "SELECT *"))}
+    rows = [tuple(sorted(r.asdict().items())) for r in g.query(as_select(prepareQuery(text)))]
+    assert set(rows) == expected and len(rows) == 5
+    assert len(list(g.query(as_select(prepareQuery(text), 2)))) == 2
+    with pytest.raises(ValueError):
+        as_select(prepareQuery("SELECT * { ?s ?p ?o }"))
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_witnesses_match_rdflib(server_base, path):
+    graph = crate_graph(path, server_base)
+    native = policy_set().evaluate(graph, witnesses=2)
+    fallback = PolicySet.from_dir(native=False).evaluate(graph, witnesses=2)
+    for name, result in native.items():
+        assert result.passed == fallback[name].passed == (not result.witnesses)
+        assert len(result.witnesses) == len(fallback[name].witnesses)
@@ -0,0 +1,218 @@
+"""Compiled, reusable shapes validator (tests/_shacl.py)."""
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pyshacl import validate
+from rdflib import BNode, Graph, Namespace
+from rdflib.compare import isomorphic
+from rdflib.namespace import RDF, RDFS, SH
+
+import tests._shacl as shacl
+from tests._example_loader import list_all_examples
+from tests._jsonld_utils import cached_crate_graph
+from tests._native_shacl import report_results
+from tests._shacl import SHAPES_PATHS, SHAPES_VALIDATORS, TERMS_PATHS, ShapesValidator, shapes_validator
+
+CRATES = list_all_examples()
+SCHEMA = Namespace("https://schema.org/")
+DPC = Namespace("https://livepublication.org/interface-schemas/dpc#")
+DSC = Namespace("https://livepublication.org/interface-schemas/dsc#")
+EX = Namespace("https://example.org/")
+
+
+def _results(report_graph: Graph):
+    return sorted(
+        (str(report_graph.value(r, SH.focusNode)), str(report_graph.value(r, SH.resultPath)),
+         str(report_graph.value(r, SH.sourceConstraintComponent)))
+        for r in report_graph.subjects(SH.resultSeverity, None)
+    )
+
+
+def _merged_shapes(server_base) -> Graph:
+    g = Graph()
+    for p in SHAPES_PATHS:
+        g.parse(f"{server_base}/{p}", format="turtle")
+    return g
+
+
+@pytest.mark.parametrize("path", CRATES)
+def test_matches_pyshacl_validate(server_base, path):
+    data_graph = cached_crate_graph(path, base_override=server_base)
+    expected = validate(data_graph, shacl_graph=_merged_shapes(server_base), inference="rdfs")
+    conforms, report_graph, _ = shapes_validator(server_base).validate(data_graph)
+    assert conforms == expected[0]
+    assert _results(report_graph) == _results(expected[1])
+
+
+def test_shapes_loaded_once_per_base(server_base):
+    SHAPES_VALIDATORS.clear()
+    v = shapes_validator(server_base)
+    assert shapes_validator(server_base) is v
+    assert SHAPES_VALIDATORS.stats()["entries"] == 1
+    assert shapes_validator() is not v and shapes_validator().digest == v.digest
+
+
+def test_persisted_shapes_reused(tmp_path, monkeypatch):
+    first = ShapesValidator.from_files(cache_dir=tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == [f"{first.digest}.shapes.json"]
+
+    parse = Graph.parse
+
+    def no_turtle(self, *args, **kwargs):
+        assert kwargs.get("format") != "turtle", "shapes were re-parsed"
+        return parse(self, *args, **kwargs)
+    monkeypatch.setattr(Graph, "parse", no_turtle)
+    second = ShapesValidator.from_files(cache_dir=tmp_path)
+    assert second.digest == first.digest
+    assert len(second.shapes) == len(first.shapes)
+    assert isomorphic(second.graph, first.graph)
+    assert second.closure.to_json() == first.closure.to_json()
+
+
+def test_corrupt_persisted_shapes_rebuilt(tmp_path):
+    digest = ShapesValidator.from_files(cache_dir=tmp_path).digest
+    path = tmp_path / f"{digest}.shapes.json"
+    path.write_bytes(b"not json")
+    assert len(ShapesValidator.from_files(cache_dir=tmp_path).shapes) > 0
+
+    # a file recording other shapes is not trusted, and is replaced
+    path.write_text(json.dumps({"digest": "0" * 64, "shapes": "", "closure": {}}))
+    rebuilt = ShapesValidator.from_files(cache_dir=tmp_path)
+    assert len(rebuilt.shapes) > 0 and json.loads(path.read_text())["digest"] == digest
+
+
+def test_shared_across_threads(server_base):
+    validator = shapes_validator(server_base)
+    graphs = [cached_crate_graph(p, base_override=server_base) for p in CRATES] * 4
+    sizes = [len(g) for g in graphs]
+    expected = [validator.validate(g)[0] for g in graphs]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        got = list(pool.map(lambda g: validator.validate(g)[0], graphs))
+    assert got == expected
+    assert [len(g) for g in graphs] == sizes  # data graphs are not modified
+
+
+def test_closure_derives_only_shape_classes():
+    closure = ShapesValidator.from_files().closure
+    classes = {c for table in (closure.by_type, closure.by_subject, closure.by_object) for cs in table.values()
+               for c in cs}
+    assert classes == {DPC.HardwareRuntime, DPC.HardwareComponent, SCHEMA.Observation}
+    assert SCHEMA.CreativeWork not in classes  # entailed by terms.ttl, but no shape looks at it
+
+
+@pytest.mark.parametrize("path", CRATES)
+def test_closure_matches_rdfs_inference(server_base, path):
+    data_graph = cached_crate_graph(path, base_override=server_base)
+    validator = shapes_validator(server_base)
+    rdfs = validator.validate(data_graph, inference="rdfs")
+    closure = validator.validate(data_graph, inference="closure")
+    assert closure[0] == rdfs[0]
+    assert _results(closure[1]) == _results(rdfs[1])
+
+
+def _baseline_key(report_graph):
+    """
+    Results without messages (with rdfs pyshacl formats blank nodes with their
+    inferred types) and with blank source shapes unnamed (each side parses the shapes itself).
+    """
+    return sorted((r.focus, r.path, r.value, None if isinstance(r.source_shape, BNode) else r.source_shape, r.component,
+                   r.severity) for r in report_results(report_graph))
+
+
+@pytest.mark.parametrize("path", CRATES)
+def test_closure_matches_baseline_rdfs(server_base, path):
+    """
+    The conformance suite's closure gives the baseline's results on every
+    example crate: pyshacl.validate with inference='rdfs' and no ont_graph.
+    """
+    data_graph = cached_crate_graph(path, base_override=server_base)
+    baseline = validate(data_graph, shacl_graph=_merged_shapes(server_base), inference="rdfs")
+    conforms, report_graph, _ = shapes_validator(server_base).validate(data_graph, inference="closure")
+    assert conforms == baseline[0]
+    assert _baseline_key(report_graph) == _baseline_key(baseline[1])
+
+
+def test_closure_checks_terms_entailments_baseline_missed(server_base):
+    """The intended difference: untyped components get their terms.ttl types, so their shapes apply."""
+    path = next(p for p in CRATES if "dpc" in str(p).lower() and "/valid/" in str(p))
+    data_graph = Graph()
+    data_graph += cached_crate_graph(path, base_override=server_base)
+    data_graph.remove((None, RDF.type, DPC.HardwareComponent))
+    data_graph.remove((None, RDF.type, SCHEMA.Observation))
+    baseline = validate(data_graph, shacl_graph=_merged_shapes(server_base), inference="rdfs")
+    closure = shapes_validator(server_base).validate(data_graph, inference="closure")
+    assert {r.component for r in report_results(baseline[1])} - {r.component for r in report_results(closure[1])}
+
+
+@pytest.mark.parametrize("path", CRATES)
+def test_closure_matches_rdfs_with_terms(server_base, path):
+    """Untyped components: domain/range typing from terms.ttl, as full RDFS over crate + terms would."""
+    data_graph = Graph()
+    data_graph += cached_crate_graph(path, base_override=server_base)
+    data_graph.remove((None, RDF.type, DPC.HardwareComponent))
+    data_graph.remove((None, RDF.type, SCHEMA.Observation))
+    terms = Graph()
+    for p in TERMS_PATHS:
+        terms.parse(f"{server_base}/{p}", format="turtle")
+    expected = validate(data_graph, shacl_graph=_merged_shapes(server_base), ont_graph=terms, inference="rdfs")
+    size = len(data_graph)
+    conforms, report_graph, _ = shapes_validator(server_base).validate(data_graph, inference="closure")
+    assert conforms == expected[0]
+    assert _results(report_graph) == _results(expected[1])
+    assert len(data_graph) == size
+
+
+@pytest.mark.parametrize("path", CRATES)
+def test_shape_subset_matches_all_shapes(server_base, path):
+    data_graph = cached_crate_graph(path, base_override=server_base)
+    validator = shapes_validator(server_base)
+    full = validator.validate(data_graph, subset=False)
+    subset = validator.validate(data_graph, subset=True)
+    assert subset[0] == full[0]
+    assert _results(subset[1]) == _results(full[1])
+
+
+def test_shape_subset_selection():
+    validator = ShapesValidator.from_files()
+    dsc_only = Graph()
+    dsc_only.add((EX.step, RDF.type, DSC.DistributedStep))
+    selected = validator.selected_shapes(dsc_only)
+    assert DSC.DistributedStepShape in selected
+    assert not {DPC.HardwareRuntimeShape, DPC.HardwareComponentShape, DPC.ObservationShape} & selected
+    subset = validator.subset(selected)
+    assert len(subset.shapes) < len(validator.shapes)
+    assert validator.subset(validator.selected_shapes(dsc_only)) is subset  # compiled once per type set
+
+    # pyshacl follows the data graph's rdfs:subClassOf when matching sh:targetClass
+    gpu = Graph()
+    gpu.add((EX.gpu, RDF.type, EX.GPU))
+    gpu.add((EX.GPU, RDFS.subClassOf, DPC.HardwareComponent))
+    assert DPC.HardwareComponentShape in validator.selected_shapes(gpu)
+    assert validator.subset(validator.selected_shapes(Graph())).shapes == []
+
+
+def test_shape_subset_with_untyped_components(server_base):
+    """Types entailed by the class closure still select their shapes."""
+    path = next(p for p in CRATES if "dpc" in str(p).lower())
+    data_graph = Graph()
+    data_graph += cached_crate_graph(path, base_override=server_base)
+    data_graph.remove((None, RDF.type, DPC.HardwareComponent))
+    validator = shapes_validator(server_base)
+    full = validator.validate(data_graph, subset=False)
+    subset = validator.validate(data_graph, subset=True)
+    assert subset[0] == full[0]
+    assert _results(subset[1]) == _results(full[1])
+
+
+@pytest.mark.parametrize("path", CRATES)
+def test_fallback_without_pyshacl_internals(server_base, path, monkeypatch):
+    data_graph = cached_crate_graph(path, base_override=server_base)
+    expected = shapes_validator(server_base).validate(data_graph)
+    monkeypatch.setattr(shacl, "PYSHACL_INTERNALS", False)
+    validator = ShapesValidator.from_files()
+    assert validator._shapes is None
+    assert len(validator.targets) == len(shapes_validator(server_base).targets)  # separate parses: own BNodes
+    conforms, report_graph, _ = validator.validate(data_graph)
+    assert conforms == expected[0]
+    assert _results(report_graph) == _results(expected[1])
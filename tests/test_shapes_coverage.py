@@ -14,7 +14,7 @@ import rdflib as rdf
 from pyshacl import validate
 
 from tests._example_loader import list_valid_examples
-from tests._jsonld_utils import to_rdf_graph_from_jsonld
+from tests._jsonld_utils import to_rdf_graphs
 
 
 ARTIFACT_DIR = pathlib.Path(".artifacts")
@@ -26,13 +26,6 @@ DPC_SHAPES = REPO_ROOT / "interface-schemas" / "dpc" / "shapes.ttl"
 DSC_SHAPES = REPO_ROOT / "interface-schemas" / "dsc" / "shapes.ttl"
 
 
-def _load_graph(path: pathlib.Path, base_override: str) -> rdf.Graph:
-    """Load a JSON-LD crate and convert to rdflib Graph."""
-    with open(path, "r", encoding="utf-8") as fh:
-        doc = json.load(fh)
-    return to_rdf_graph_from_jsonld(doc, base_override)
-
-
 def _load_shapes() -> rdf.Graph:
     """Load combined DPC + DSC shapes."""
     shapes_graph = rdf.Graph()
@@ -97,18 +90,17 @@ def test_shapes_coverage_report(server_base):
     all_shapes_seen: Dict[str, Dict[str, Any]] = {}
     cwd = pathlib.Path.cwd()
     
-    for crate_path_str in list_valid_examples():
-        crate_path = pathlib.Path(crate_path_str)
+    for result in to_rdf_graphs(list_valid_examples(), server_base):
+        crate_path = pathlib.Path(result.path)
         try:
             rel_path = str(crate_path.relative_to(cwd))
         except ValueError:
             rel_path = str(crate_path)
         
-        try:
-            data_graph = _load_graph(crate_path, server_base)
-        except Exception as e:
-            print(f"[SHAPES COVERAGE] Warning: could not load {rel_path}: {e}")
+        if result.error:
+            print(f"[SHAPES COVERAGE] Warning: could not load {rel_path}: {result.error}")
             continue
+        data_graph = result.graph
         
         # Run SHACL validation
         try:
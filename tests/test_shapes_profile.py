@@ -0,0 +1,88 @@
+"""
+Per-shape and per-constraint SHACL timing (diagnostic; non-failing report).
+
+Validates every example crate with a ShapeProfile and writes
+.artifacts/shapes_profile.json next to shapes_coverage.json.
+"""
+import json
+import pathlib
+
+import pytest
+from pyshacl.constraints.core.cardinality_constraints import MinCountConstraintComponent
+from pyshacl.shape import Shape
+from rdflib import Namespace
+from rdflib.namespace import RDF
+
+from tests._example_loader import list_all_examples
+from tests._jsonld_utils import cached_crate_graph
+from tests._native_shacl import report_results
+from tests._shacl import shapes_validator
+from tests._shacl_profile import ShapeProfile, profiling
+
+ARTIFACT_DIR = pathlib.Path(".artifacts")
+PROFILE_PATH = ARTIFACT_DIR / "shapes_profile.json"
+
+DPC = Namespace("https://livepublication.org/interface-schemas/dpc#")
+
+
+def _key(report_graph):
+    return sorted(tuple(map(str, r)) for r in report_results(report_graph))
+
+
+def test_profile_counts_and_results(server_base):
+    validator = shapes_validator(server_base)
+    profile = ShapeProfile()
+    components = 0
+    for path in list_all_examples():
+        g = cached_crate_graph(path, server_base)
+        profiled = validator.validate(g, profile=profile)
+        plain = validator.validate(g)
+        assert profiled[0] == plain[0] and _key(profiled[1]) == _key(plain[1])
+        components += len(set(g.subjects(RDF.type, DPC.HardwareComponent)))
+
+    shape = profile.shapes[DPC.HardwareComponentShape]
+    assert shape["calls"] == len(list_all_examples()) and shape["focus_nodes"] == components
+    assert 0 < shape["self_seconds"] <= shape["seconds"]
+    report = profile.report(validator.graph)
+    assert report["_meta"]["validations"] == len(list_all_examples())
+    nested = report["shapes"]["dpc:HardwareComponentShape -> schema:additionalProperty"]
+    assert nested["constraints"]["sh:NodeConstraintComponent"]["value_nodes"] == nested["value_nodes"]
+    assert "dsc:DistributedStepShape -> sh:or[0]" in report["shapes"]
+
+    before = json.dumps(report)
+    validator.validate(cached_crate_graph(list_all_examples()[0], server_base))  # not profiled
+    assert json.dumps(profile.report(validator.graph)) == before
+
+
+def test_hooks_restored_after_profiling(server_base):
+    originals = Shape.validate, Shape.value_nodes, MinCountConstraintComponent.evaluate
+    with profiling(ShapeProfile()):
+        assert Shape.validate is not originals[0]
+        with profiling(ShapeProfile()):  # nested blocks keep the hooks until the outer one exits
+            pass
+        assert Shape.validate is not originals[0]
+    assert (Shape.validate, Shape.value_nodes, MinCountConstraintComponent.evaluate) == originals
+
+    with pytest.raises(RuntimeError):
+        with profiling(ShapeProfile()):
+            raise RuntimeError("validation failed")
+    assert (Shape.validate, Shape.value_nodes, MinCountConstraintComponent.evaluate) == originals
+
+
+def test_shapes_profile_report(server_base):
+    """Write .artifacts/shapes_profile.json for all example crates (non-failing)."""
+    validator = shapes_validator(server_base)
+    profile = ShapeProfile()
+    for path in list_all_examples():
+        validator.validate(cached_crate_graph(path, server_base), profile=profile)
+    report = profile.report(validator.graph)
+
+    ARTIFACT_DIR.mkdir(exist_ok=True)
+    with open(PROFILE_PATH, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+
+    print("\n=== SHACL Shape Timing ===")
+    for label, stats in list(report["shapes"].items())[:10]:
+        print(f"[PROFILE] {stats['seconds'] * 1000:8.2f} ms  self {stats['self_seconds'] * 1000:7.2f} ms  "
+              f"focus {stats['focus_nodes']:5d}  values {stats['value_nodes']:5d}  {label}")
+    print(f"\n[PROFILE] Artifact written to: {PROFILE_PATH.absolute()}")
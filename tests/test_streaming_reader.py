@@ -0,0 +1,50 @@
+"""Streaming @graph ingestion (tests/_json_stream.py + stream_to_rdf_graph)."""
+import json
+
+import pytest
+from rdflib.compare import isomorphic
+
+from tests._example_loader import list_all_examples
+from tests._json_stream import iter_graph, read_context
+from tests._jsonld_utils import stream_to_rdf_graph, to_rdf_graph_from_jsonld
+
+
+@pytest.mark.parametrize("path", list_all_examples())
+def test_stream_matches_full_load(server_base, path):
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    expected = to_rdf_graph_from_jsonld(doc, server_base)
+    # A tiny chunk size forces values to span many buffer refills.
+    actual = stream_to_rdf_graph(path, server_base, chunk_size=64)
+    assert isomorphic(actual, expected), f"Streamed graph differs for {path}"
+
+
+def test_iter_graph_yields_entities_in_order(tmp_path):
+    path = tmp_path / "crate.json"
+    graph = [{"@id": f"#e{i}", "value": i * 1.5, "name": "x" * i} for i in range(50)]
+    # @graph before @context: the context is still found first
+    path.write_text(json.dumps({"@graph": graph, "@context": {"@vocab": "https://schema.org/"}}))
+    assert read_context(path, chunk_size=16) == {"@vocab": "https://schema.org/"}
+    assert list(iter_graph(path, chunk_size=16)) == graph
+
+
+def test_blank_node_labels_shared_across_entities(server_base, tmp_path):
+    path = tmp_path / "crate.json"
+    doc = {
+        "@context": [f"{server_base}/contexts/lp-dscdpc/v1.jsonld"],
+        "@graph": [
+            {"@id": "http://example.org/a", "hasPart": {"@id": "_:shared"}},
+            {"@id": "_:shared", "name": "shared"},
+        ],
+    }
+    path.write_text(json.dumps(doc))
+    g = stream_to_rdf_graph(path, server_base)
+    assert isomorphic(g, to_rdf_graph_from_jsonld(doc, server_base))
+    assert len(set(g.subjects())) == 2
+
+
+def test_rejects_extra_top_level_keys(tmp_path):
+    path = tmp_path / "crate.json"
+    path.write_text(json.dumps({"@context": {}, "@id": "x", "@graph": []}))
+    with pytest.raises(ValueError):
+        list(iter_graph(path))
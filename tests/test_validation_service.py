@@ -0,0 +1,133 @@
+"""Local validation service (tests/_validation_service.py) over HTTP."""
+import http.client
+import json
+import threading
+from concurrent.futures import Future
+
+import pytest
+import requests
+
+from tests._example_loader import list_invalid_examples, list_valid_examples
+from tests._jsonld_utils import cached_crate_graph
+from tests._native_shacl import native_shapes, result_json
+from tests._policy import policy_set
+from tests._validation_service import ValidationService, make_server
+
+
+@pytest.fixture(scope="module")
+def service(server_base):
+    svc = ValidationService(server_base, workers=2, queue_size=1, warmup=list_valid_examples()[:1])
+    httpd = make_server(svc, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    svc.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield svc
+    httpd.shutdown()
+    httpd.server_close()
+    svc.close()
+
+
+def _post(service, path, query=""):
+    with open(path, "rb") as f:
+        return requests.post(f"{service.url}/validate{query}", data=f.read(), timeout=30)
+
+
+def test_valid_crates(service):
+    for path in list_valid_examples():
+        r = _post(service, path)
+        assert r.status_code == 200
+        body = r.json()
+        assert body["conforms"] and body["shacl"] == {"conforms": True, "results": []}
+        assert body["policies"] == dict.fromkeys(policy_set().queries, True)
+        assert set(body["timing_ms"]) == {"convert", "shacl", "policies", "total"}
+
+
+def test_invalid_crates_report_results(service, server_base):
+    for path in list_invalid_examples():
+        body = _post(service, path).json()
+        expected = [result_json(r) for r in native_shapes().stream(cached_crate_graph(path, server_base))]
+        assert not body["conforms"] and not body["shacl"]["conforms"]
+        assert body["shacl"]["results"] == json.loads(json.dumps(expected))
+
+
+def test_fail_fast_and_policy_toggle(service):
+    path = list_invalid_examples()[0]
+    body = _post(service, path, "?fail_fast=1&policies=0").json()
+    assert len(body["shacl"]["results"]) == 1 and body["policies"] == {}
+    assert len(_post(service, path, "?max_results=2").json()["shacl"]["results"]) <= 2
+
+
+def test_client_errors(service):
+    assert requests.post(f"{service.url}/validate", data=b"{not json", timeout=10).status_code == 400
+    assert requests.post(f"{service.url}/validate?max_results=x", data=b"{}", timeout=10).status_code == 400
+    blocked = {"@context": "https://evil.example.org/context.jsonld", "@id": "x", "name": "y"}
+    r = requests.post(f"{service.url}/validate", json=blocked, timeout=10)
+    assert r.status_code == 422 and "Blocked" in r.json()["error"]
+    assert requests.get(f"{service.url}/nope", timeout=10).status_code == 404
+
+
+def test_body_limits(service, monkeypatch):
+    host, port = service.url.rsplit("/", 1)[-1].split(":")
+    conn = http.client.HTTPConnection(host, int(port), timeout=10)
+    conn.putrequest("POST", "/validate")
+    conn.putheader("Content-Length", "12abc")
+    conn.endheaders()
+    r = conn.getresponse()
+    assert r.status == 400 and "Content-Length" in json.loads(r.read())["error"]
+    conn.close()
+
+    before = service.stats()["too_large"]
+    monkeypatch.setattr(service, "max_body", 16)
+    r = requests.post(f"{service.url}/validate", data=b"{}" * 9, timeout=10)
+    assert r.status_code == 413 and service.stats()["too_large"] == before + 1
+    assert requests.post(f"{service.url}/validate", data=b"{not json", timeout=10).status_code == 400
+
+
+def _free_slots(service) -> int:
+    held = 0
+    while service._slots.acquire(blocking=False):
+        held += 1
+    for _ in range(held):
+        service._slots.release()
+    return held
+
+
+def test_timed_out_check_holds_its_slot(service, monkeypatch):
+    running = Future()
+    running.set_running_or_notify_cancel()  # already with a worker: cannot be cancelled
+
+    class Pool:
+        def submit(self, fn, *args, **kwargs):
+            return running
+
+    monkeypatch.setattr(service, "_pool", Pool())
+    monkeypatch.setattr(service, "timeout", 0.01)
+    assert service.submit({})[0] == 504
+    assert service.stats()["in_flight"] == 1 and _free_slots(service) == service.capacity - 1
+    running.set_result(None)  # the worker finishes
+    assert service.stats()["in_flight"] == 0 and _free_slots(service) == service.capacity
+
+
+def test_backpressure_when_full(service):
+    held = 0
+    while service._slots.acquire(blocking=False):  # occupy every worker and queue slot
+        held += 1
+    try:
+        assert held == service.capacity == 3
+        r = _post(service, list_valid_examples()[0])
+        assert r.status_code == 429 and r.headers["Retry-After"] == "1"
+    finally:
+        for _ in range(held):
+            service._slots.release()
+    assert _post(service, list_valid_examples()[0]).status_code == 200
+
+
+def test_stats(service):
+    before = requests.get(f"{service.url}/stats", timeout=10).json()
+    _post(service, list_valid_examples()[0])
+    stats = requests.get(f"{service.url}/stats", timeout=10).json()
+    assert stats["requests"] == before["requests"] + 1 and stats["ok"] == before["ok"] + 1
+    assert stats["in_flight"] == 0 and stats["workers"] == 2
+    total = stats["latency_ms"]["total"]
+    assert total["count"] == stats["ok"] and 0 < total["p50"] <= total["max"]
+    assert requests.get(f"{service.url}/healthz", timeout=10).text == "ok"
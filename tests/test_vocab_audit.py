@@ -21,7 +21,7 @@ from typing import Iterator, Dict, Set, Any
 
 import rdflib as rdf
 
-from tests._jsonld_utils import to_rdf_graph_from_jsonld
+from tests._jsonld_utils import CrateResult, to_rdf_graphs
 
 # --- Configuration ---
 
@@ -100,16 +100,9 @@ def _iter_crate_files(dirs: list[str]) -> Iterator[pathlib.Path]:
                 yield f
 
 
-def _load_graph(path: pathlib.Path, base_override: str) -> rdf.Graph:
-    """Load a JSON-LD crate and convert to rdflib Graph."""
-    with open(path, "r", encoding="utf-8") as fh:
-        doc = json.load(fh)
-    return to_rdf_graph_from_jsonld(doc, base_override)
-
-
-def _inventory_single_file(path: pathlib.Path, base_override: str) -> Dict[str, Any]:
+def _inventory_single_file(result: CrateResult) -> Dict[str, Any]:
     """
-    Produce vocabulary inventory for a single crate file.
+    Produce vocabulary inventory for a single converted crate file.
     
     Returns dict with same structure as _inventory but for one file.
     """
@@ -120,11 +113,9 @@ def _inventory_single_file(path: pathlib.Path, base_override: str) -> Dict[str,
     unknown_ns: Set[str] = set()
     literal_types = Counter()
 
-    try:
-        g = _load_graph(path, base_override)
-    except Exception as e:
+    if result.error:
         return {
-            "error": str(e),
+            "error": result.error,
             "predicates_by_namespace": [],
             "terms": [],
             "classes_by_namespace": [],
@@ -132,6 +123,7 @@ def _inventory_single_file(path: pathlib.Path, base_override: str) -> Dict[str,
             "http_schema_terms": [],
             "unknown_namespaces": [],
         }
+    g = result.graph
 
     # Walk all triples
     for s, p, o in g.triples((None, None, None)):
@@ -169,9 +161,9 @@ def _inventory_single_file(path: pathlib.Path, base_override: str) -> Dict[str,
     }
 
 
-def _inventory(paths: list[pathlib.Path], base_override: str) -> Dict[str, Any]:
+def _inventory(results: list[CrateResult]) -> Dict[str, Any]:
     """
-    Produce vocabulary inventory across all given crate paths.
+    Produce vocabulary inventory across all given conversion results.
     
     Returns dict with:
     - by_namespace: [(namespace, count), ...]
@@ -188,12 +180,11 @@ def _inventory(paths: list[pathlib.Path], base_override: str) -> Dict[str, Any]:
     unknown_ns: Set[str] = set()
     literal_types = Counter()
 
-    for path in paths:
-        try:
-            g = _load_graph(path, base_override)
-        except Exception as e:
-            print(f"[VOCAB AUDIT] Warning: could not load {path}: {e}")
+    for result in results:
+        if result.error:
+            print(f"[VOCAB AUDIT] Warning: could not load {result.path}: {result.error}")
             continue
+        g = result.graph
 
         # Walk all triples
         for s, p, o in g.triples((None, None, None)):
@@ -245,7 +236,8 @@ def test_vocab_inventory_report(server_base):
     Prints brief summary to stdout.
     """
     paths = list(_iter_crate_files(CRATES_DIRS))
-    inv = _inventory(paths, server_base)
+    results = list(to_rdf_graphs(paths, server_base))
+    inv = _inventory(results)
     
     # Global inventory
     with open(ARTIFACT_PATH, "w", encoding="utf-8") as fh:
@@ -254,13 +246,14 @@ def test_vocab_inventory_report(server_base):
     # Per-file inventory
     by_file = {}
     cwd = pathlib.Path.cwd()
-    for path in paths:
+    for result in results:
+        path = pathlib.Path(result.path)
         try:
             rel_path = str(path.relative_to(cwd))
         except ValueError:
             # Path not relative to cwd, use absolute
             rel_path = str(path)
-        by_file[rel_path] = _inventory_single_file(path, server_base)
+        by_file[rel_path] = _inventory_single_file(result)
     
     with open(ARTIFACT_BY_FILE_PATH, "w", encoding="utf-8") as fh:
         json.dump(by_file, fh, indent=2, ensure_ascii=False)
@@ -306,7 +299,8 @@ def test_valid_crate_vocab_contract(server_base, valid_crate_path):
     This test is parametrized over all files in tests/crates/valid/
     via the valid_crate_path fixture from conftest.py.
     """
-    inv = _inventory_single_file(valid_crate_path, server_base)
+    (result,) = to_rdf_graphs([valid_crate_path], server_base, workers=1)
+    inv = _inventory_single_file(result)
     
     # Handle loading errors
     if "error" in inv:
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Pack every allowlisted JSON-LD context into one versioned bundle file for
+offline / air-gapped validation (see tests/_context_bundle.py).
+
+    python tools/build_context_bundle.py               # writes build/context-bundle.lpcb
+    LP_CONTEXT_BUNDLE=build/context-bundle.lpcb ROCRATE_ONLINE=0 make test
+"""
+import argparse, pathlib, sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from tests._context_bundle import ContextBundle, build_bundle
+from tests._jsonld_utils import LIVE_BASE, W3ID_BASE
+
+SCHEMAS_DEFAULT = ROOT / "interface-schemas"
+OUT_DEFAULT = ROOT / "build" / "context-bundle.lpcb"
+
+# path under interface-schemas/ -> upstream URLs it stands in for
+BUNDLE_CONTEXTS = {
+    "vendor/ro-crate/1.1/context.jsonld": ["https://w3id.org/ro/crate/1.1/context"],
+    "vendor/ro-terms/workflow-run/context.jsonld": ["https://w3id.org/ro/terms/workflow-run/context"],
+    "contexts/lp-dscdpc/v1.jsonld": [],
+    "dpc/contexts/v1.jsonld": [],
+    "dsc/contexts/v1.jsonld": [],
+}
+
+
+def bundle_aliases(contexts=BUNDLE_CONTEXTS):
+    """Every URL (livepublication.org, w3id, upstream) that resolves to each bundled path."""
+    return {
+        rel: [f"{LIVE_BASE}/{rel}", f"{W3ID_BASE}/{rel}", *extra]
+        for rel, extra in contexts.items()
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the offline JSON-LD context bundle.")
+    ap.add_argument("--schemas", type=pathlib.Path, default=SCHEMAS_DEFAULT)
+    ap.add_argument("--out", type=pathlib.Path, default=OUT_DEFAULT)
+    ap.add_argument("--check", action="store_true", help="Exit nonzero if OUT is out-of-sync.")
+    args = ap.parse_args()
+
+    data = build_bundle(args.schemas, bundle_aliases())
+
+    if args.check:
+        if not args.out.exists() or args.out.read_bytes() != data:
+            print("Context bundle is missing or out of sync:", args.out, file=sys.stderr)
+            sys.exit(1)
+        print("Context bundle is up-to-date.")
+        return
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = args.out.with_suffix(args.out.suffix + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(args.out)
+    bundle = ContextBundle(args.out)
+    print(f"Wrote {args.out} (version {bundle.version}, {len(bundle.entries)} contexts, "
+          f"{len(bundle.aliases)} URLs)")
+    bundle.close()
+
+
+if __name__ == "__main__":
+    main()
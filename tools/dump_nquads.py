@@ -2,17 +2,24 @@
 import json, os, sys
 from pathlib import Path
 from pyld import jsonld
-from tests._jsonld_utils import make_requests_loader
+from tests._jsonld_utils import cached_nquads, make_requests_loader
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: dump_nquads.py FILE", file=sys.stderr)
+    args = sys.argv[1:]
+    canonical = "--canonical" in args
+    args = [a for a in args if a != "--canonical"]
+    if len(args) != 1:
+        print("Usage: dump_nquads.py [--canonical] FILE", file=sys.stderr)
         sys.exit(2)
-    path = Path(sys.argv[1])
+    path = Path(args[0])
     if not path.exists():
         print(f"File not found: {path}", file=sys.stderr)
         sys.exit(2)
     server_base = os.environ.get("BASE_URL", "http://localhost:8000/interface-schemas")
+    if canonical:
+        # canonical (URDNA2015) N-Quads; reused from LP_OUTPUT_CACHE_DIR when set
+        print(cached_nquads(path, server_base))
+        return
     doc = json.loads(path.read_text(encoding="utf-8"))
     nq = jsonld.to_rdf(doc, options={
         "documentLoader": make_requests_loader(server_base),
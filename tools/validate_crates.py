@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+SHACL-validate a corpus of crates in parallel (see tests/_parallel_shacl.py).
+
+    python tools/validate_crates.py tests/crates/valid tests/crates/invalid
+    BASE_URL=http://localhost:8000/interface-schemas python tools/validate_crates.py -j 64 corpus/
+
+Prints one line per crate (OK / FAIL with its result count / ERROR) and exits
+nonzero if any crate did not conform.
+"""
+import argparse, os, pathlib, sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from tests._parallel_shacl import validate_crates
+
+
+def crate_paths(args):
+    for arg in args:
+        p = pathlib.Path(arg)
+        yield from sorted(p.rglob("*.json")) if p.is_dir() else [p]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Validate crates against the DPC/DSC shapes across a process pool.")
+    ap.add_argument("paths", nargs="+", help="Crate files or directories (searched for *.json).")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    ap.add_argument("--chunksize", type=int, default=16)
+    ap.add_argument("--batch", action="store_true",
+                    help="Validate each chunk as one union graph (many small crates).")
+    ap.add_argument("--local-shapes", action="store_true",
+                    help="Use interface-schemas/ shapes instead of those under BASE_URL.")
+    args = ap.parse_args()
+
+    base = os.environ.get("BASE_URL", "http://localhost:8000/interface-schemas")
+    shapes_base = None if args.local_shapes else base
+    failed = 0
+    for r in validate_crates(crate_paths(args.paths), base, shapes_base, workers=args.workers,
+                             ordered=False, chunksize=args.chunksize, batch=args.batch):
+        if r.error:
+            print(f"ERROR\t{r.path}\t{r.error}")
+        elif r.conforms:
+            print(f"OK\t{r.path}")
+        else:
+            print(f"FAIL\t{r.path}\t{len(r.results)} results")
+        failed += not r.conforms
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Stream SHACL results for crates as JSON lines (see tests/_native_shacl.py).
+
+    python tools/validate_jsonl.py crate.json                    # every result
+    python tools/validate_jsonl.py --fail-fast crate.json        # ingest gate: first violation only
+    python tools/validate_jsonl.py --max-results 100 corpus/*.json
+
+Each line is one sh:result as soon as it is found:
+{"crate", "focus", "path", "value", "shape", "component", "severity", "message"}.
+Exits nonzero if any crate did not conform.
+"""
+import argparse, os, pathlib, sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from tests._jsonld_utils import cached_crate_graph
+from tests._native_shacl import native_shapes, write_jsonl
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Validate crates and print one JSON object per SHACL result.")
+    ap.add_argument("files", nargs="+", type=pathlib.Path)
+    ap.add_argument("--fail-fast", action="store_true", help="Stop at the first result.")
+    ap.add_argument("--max-results", type=int, default=None, help="Stop after N results in total.")
+    ap.add_argument("--local-shapes", action="store_true",
+                    help="Use interface-schemas/ shapes instead of those under BASE_URL.")
+    args = ap.parse_args()
+
+    base = os.environ.get("BASE_URL", "http://localhost:8000/interface-schemas")
+    native = native_shapes(None if args.local_shapes else base)
+    remaining = 1 if args.fail_fast else args.max_results
+    failed = False
+    for path in args.files:
+        if remaining is not None and remaining <= 0:
+            break
+        results = native.stream(cached_crate_graph(path, base), max_results=remaining)
+        n = write_jsonl(results, sys.stdout, crate=str(path))
+        failed = failed or n > 0
+        if remaining is not None:
+            remaining -= n
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()